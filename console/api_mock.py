@@ -3,12 +3,24 @@ from __future__ import annotations
 
 import json
 import argparse
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 from typing import Dict, Any, List
 
+try:
+    from osctl.run_index import query_runs
+except ImportError:  # mock started without osctl on sys.path; fall back to directory scans
+    query_runs = None
+
 
 def load_runs(run_root: Path, limit: int = 10) -> List[Dict[str, Any]]:
+    if query_runs is not None:
+        indexed = query_runs(run_root, limit=limit)
+        if indexed is not None:
+            return [
+                {k: r.get(k) for k in ("run_id", "status", "created_at", "tag", "cohort_id", "artifacts")}
+                for r in indexed
+            ]
     items = []
     for run_dir in sorted(run_root.iterdir(), reverse=True):
         if not run_dir.is_dir():
@@ -120,7 +132,7 @@ def serve(run_root: Path, ce_ledger: Path, port: int) -> None:
     def handler(*args, **kwargs):
         return Handler(*args, run_root=run_root, ce_ledger=ce_ledger, **kwargs)
 
-    server = HTTPServer(("0.0.0.0", port), handler)
+    server = ThreadingHTTPServer(("0.0.0.0", port), handler)
     print(f"Serving mock API on 0.0.0.0:{port}")
     server.serve_forever()
 
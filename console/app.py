@@ -2,16 +2,97 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import signal
+import socket
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory, stream_with_context
+from werkzeug.serving import BaseWSGIServer
+
+try:
+    from osctl.line_index import read_page
+    from osctl.merkle import MerkleError, prove_rows, verify_rows
+    from osctl.run_index import query_runs
+    from osctl.sketch import DEFAULT_QUANTILES, SKETCH_FILENAME, merge_sketch_docs
+except ImportError:  # console started without osctl on sys.path; fall back to directory scans
+    read_page = None
+    prove_rows = None
+    query_runs = None
+    merge_sketch_docs = None
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_SCAN_ROWS = 50000  # rows a filtered decisions page may read before returning a cursor
+STREAM_CHUNK_SIZE = 64 * 1024
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+MAX_SKETCH_RUNS = 10000
 
 
 def load_json(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+class ArtifactCache:
+    """Bounded LRU of parsed JSON artifacts keyed by (path, mtime_ns, size).
+
+    A rewritten file (e.g. verify_report.json after ``osctl verify``) changes its stat key and
+    is re-read on the next access. Eviction is by the on-disk size of cached files.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load_json(self, path: Path) -> Dict[str, Any]:
+        st = path.stat()
+        key = str(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = load_json(path)
+        if st.st_size > self.max_bytes:
+            return value
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self.bytes -= old[2]
+            self._entries[key] = (stamp, value, st.st_size)
+            self.bytes += st.st_size
+            while self.bytes > self.max_bytes and self._entries:
+                _, (_, _, size) = self._entries.popitem(last=False)
+                self.bytes -= size
+                self.evictions += 1
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
 def load_jsonl(path: Path) -> List[Dict[str, Any]]:
     rows: List[Dict[str, Any]] = []
     with path.open("r", encoding="utf-8") as fh:
@@ -26,7 +107,17 @@ def load_jsonl(path: Path) -> List[Dict[str, Any]]:
     return rows
 
 
-def list_runs(run_root: Path, limit: int = 50) -> List[Dict[str, Any]]:
+def list_runs(
+    run_root: Path,
+    limit: int = 50,
+    status: Optional[str] = None,
+    tag: Optional[str] = None,
+    cohort_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    if query_runs is not None:
+        indexed = query_runs(run_root, limit=limit, status=status, tag=tag, cohort_id=cohort_id)
+        if indexed is not None:
+            return indexed
     items = []
     for run_dir in sorted(run_root.iterdir(), reverse=True):
         if not run_dir.is_dir():
@@ -36,12 +127,12 @@ def list_runs(run_root: Path, limit: int = 50) -> List[Dict[str, Any]]:
         if not manifest.exists():
             continue
         man = load_json(manifest)
-        status = "UNKNOWN"
+        run_status = "UNKNOWN"
         if verify.exists():
             try:
-                status = load_json(verify).get("overall_status", "UNKNOWN")
+                run_status = load_json(verify).get("overall_status", "UNKNOWN")
             except Exception:
-                status = "UNKNOWN"
+                run_status = "UNKNOWN"
         # attach optional metrics if present
         metrics_root = run_root.parent / "metrics"
         metrics = {}
@@ -52,10 +143,12 @@ def list_runs(run_root: Path, limit: int = 50) -> List[Dict[str, Any]]:
             except Exception:
                 metrics = {}
 
+        if (status and run_status != status) or (tag and man.get("tag") != tag) or (cohort_id and man.get("cohort_id") != cohort_id):
+            continue
         items.append(
             {
                 "run_id": man.get("run_id"),
-                "status": status,
+                "status": run_status,
                 "created_at": man.get("created_at"),
                 "tag": man.get("tag"),
                 "cohort_id": man.get("cohort_id"),
@@ -71,24 +164,199 @@ def list_runs(run_root: Path, limit: int = 50) -> List[Dict[str, Any]]:
     return items
 
 
-def create_app(run_root: Path, ce_ledger: Path, metrics_root: Path | None = None) -> Flask:
+def cohort_quantiles(
+    run_root: Path,
+    loader: Callable[[Path], Dict[str, Any]],
+    runs: List[Dict[str, Any]],
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    quantiles=None,
+) -> Dict[str, Any]:
+    """Merge the per-run SLI sketches of ``runs`` created in [since, until) into cohort quantiles."""
+    docs = []
+    for run in runs:
+        created_at = run.get("created_at")
+        if created_at and ((since and created_at < since) or (until and created_at >= until)):
+            continue
+        path = run_root / str(run.get("run_id")) / SKETCH_FILENAME
+        if path.exists():
+            docs.append(loader(path))
+    result = merge_sketch_docs(docs, quantiles or DEFAULT_QUANTILES)
+    result["window"] = {"since": since, "until": until}
+    return result
+
+
+def decision_filter(decision: Optional[str], event_id: Optional[str], failed_axis: Optional[str]):
+    if decision is None and event_id is None and failed_axis is None:
+        return None
+
+    def predicate(row: Dict[str, Any]) -> bool:
+        if decision is not None and row.get("decision") != decision:
+            return False
+        if event_id is not None and row.get("event_id") != event_id:
+            return False
+        if failed_axis is not None:
+            wp = row.get("witness_path") or {}
+            axis = wp.get("failed_axis") if isinstance(wp, dict) else None
+            if (axis is None and failed_axis != "null") or (axis is not None and axis != failed_axis):
+                return False
+        return True
+
+    return predicate
+
+
+def page_decisions(
+    dec_path: Path,
+    cursor: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+    decision: Optional[str] = None,
+    event_id: Optional[str] = None,
+    failed_axis: Optional[str] = None,
+) -> Dict[str, Any]:
+    predicate = decision_filter(decision, event_id, failed_axis)
+    if read_page is not None:
+        return read_page(dec_path, cursor=cursor, limit=limit, predicate=predicate, scan_limit=MAX_SCAN_ROWS)
+    rows = load_jsonl(dec_path) if dec_path.exists() else []
+    items: List[Dict[str, Any]] = []
+    next_cursor = None
+    for row_no in range(cursor, len(rows)):
+        if len(items) >= limit or row_no - cursor >= MAX_SCAN_ROWS:
+            next_cursor = row_no
+            break
+        if predicate is None or predicate(rows[row_no]):
+            items.append(rows[row_no])
+    return {"items": items, "total": len(rows), "cursor": cursor, "next_cursor": next_cursor}
+
+
+def proof_digest(
+    run_dir: Path, artifact: Path, loader: Callable[[Path], Dict[str, Any]] = load_json
+) -> Optional[str]:
+    """sha256 recorded for ``artifact`` in proof_manifest.json, if it is still current."""
+    proof_path = run_dir / "proof_manifest.json"
+    if not proof_path.exists() or not artifact.exists():
+        return None
+    try:
+        proof = loader(proof_path)
+    except Exception:
+        return None
+    # an artifact touched after the proof manifest was written no longer matches its digest
+    if artifact.stat().st_mtime_ns > proof_path.stat().st_mtime_ns:
+        return None
+    rel = artifact.name
+    for ref in proof.get("artifacts", []):
+        if ref.get("path") == rel and str(ref.get("sha256", "")).startswith("sha256:"):
+            return ref["sha256"].split(":", 1)[1]
+    return None
+
+
+def prove_decisions(
+    run_dir: Path, cursor: int, limit: int, loader: Callable[[Path], Dict[str, Any]] = load_json
+) -> Tuple[Dict[str, Any], int]:
+    """decision_log rows ``[cursor, cursor + limit)`` with their Merkle inclusion proof.
+
+    The rows, proof and recorded root are returned as well as the server-side result so
+    a reviewer's client can recheck them without fetching the whole log.
+    """
+    proof_path = run_dir / "proof_manifest.json"
+    if not proof_path.exists():
+        return {"error": "not found"}, 404
+    ref = next((a for a in loader(proof_path).get("artifacts", []) if a.get("path") == "decision_log.jsonl"), None)
+    merkle = (ref or {}).get("merkle")
+    if not merkle:
+        return {"error": "run has no Merkle root for decision_log.jsonl (osctl run --merkle)"}, 404
+    hi = min(cursor + limit, merkle["leaves"])
+    try:
+        proved = prove_rows(run_dir / "decision_log.jsonl", cursor, hi)
+    except MerkleError as exc:
+        return {"error": str(exc)}, 400
+    ok = proved["leaves"] == merkle["leaves"] and verify_rows(proved["rows"], cursor, proved["leaves"], proved["proof"], merkle["root"])
+    return (
+        {
+            "status": "PASS" if ok else "FAIL",
+            "rows": [cursor, hi],
+            "items": [row.decode("utf-8").rstrip("\n") for row in proved["rows"]],
+            "leaves": merkle["leaves"],
+            "root": merkle["root"],
+            "algorithm": merkle.get("algorithm"),
+            "proof": [node.hex() for node in proved["proof"]],
+        },
+        200,
+    )
+
+
+def _iter_file(path: Path, compressor=None) -> Iterator[bytes]:
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(STREAM_CHUNK_SIZE), b""):
+            if compressor is None:
+                yield chunk
+                continue
+            out = compressor.compress(chunk)
+            if out:
+                yield out
+    if compressor is not None:
+        yield compressor.flush()
+
+
+def stream_jsonl(path: Path, digest: Optional[str] = None) -> Response:
+    """Stream a JSONL artifact as chunked NDJSON with gzip/deflate negotiation and conditional GET."""
+    if not path.exists():
+        return jsonify({"error": "not found"}), 404
+    st = path.stat()
+    last_modified = datetime.fromtimestamp(int(st.st_mtime), tz=timezone.utc)
+    encoding = request.accept_encodings.best_match(["gzip", "deflate"])
+    base_tag = digest or f"{st.st_size:x}-{st.st_mtime_ns:x}"
+    etag = f"{base_tag}-{encoding}" if encoding else base_tag
+    weak = digest is None
+
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if request.if_none_match.contains_weak(etag) or (
+        not request.if_none_match and request.if_modified_since and request.if_modified_since >= last_modified
+    ):
+        resp = Response(status=304, headers=headers)
+    else:
+        compressor = None
+        if encoding == "gzip":
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS)
+        resp = Response(stream_with_context(_iter_file(path, compressor)), mimetype="application/x-ndjson", headers=headers)
+        if encoding:
+            resp.headers["Content-Encoding"] = encoding
+        else:
+            resp.headers["Content-Length"] = str(st.st_size)
+    resp.set_etag(etag, weak=weak)
+    resp.last_modified = last_modified
+    return resp
+
+
+def create_app(
+    run_root: Path, ce_ledger: Path, metrics_root: Path | None = None, cache_bytes: int = DEFAULT_CACHE_BYTES
+) -> Flask:
     app = Flask(__name__, static_folder="static", static_url_path="")
     metrics_root = metrics_root or (run_root.parent / "metrics")
+    cache = ArtifactCache(cache_bytes)
+    app.config["ARTIFACT_CACHE"] = cache
 
     @app.get("/api/v1/runs")
     def get_runs():
-        items = list_runs(run_root)
+        items = list_runs(
+            run_root,
+            limit=request.args.get("limit", 50, type=int),
+            status=request.args.get("status"),
+            tag=request.args.get("tag"),
+            cohort_id=request.args.get("cohort_id"),
+        )
         return jsonify({"items": items, "total": len(items)})
 
     @app.get("/api/v1/runs/<run_id>")
     def get_run(run_id: str):
         run_dir = run_root / run_id
-        manifest = load_json(run_dir / "run_manifest.json")
-        govdec = load_json(run_dir / "govdec.json")
-        proof = load_json(run_dir / "proof_manifest.json")
-        verify = load_json(run_dir / "verify_report.json") if (run_dir / "verify_report.json").exists() else {}
+        manifest = cache.load_json(run_dir / "run_manifest.json")
+        govdec = cache.load_json(run_dir / "govdec.json")
+        proof = cache.load_json(run_dir / "proof_manifest.json")
+        verify = cache.load_json(run_dir / "verify_report.json") if (run_dir / "verify_report.json").exists() else {}
         metrics_path = metrics_root / f"runtime_sli_{run_id}.json"
-        metrics = load_json(metrics_path) if metrics_path.exists() else {}
+        metrics = cache.load_json(metrics_path) if metrics_path.exists() else {}
         return jsonify(
             {
                 "run_id": run_id,
@@ -104,16 +372,46 @@ def create_app(run_root: Path, ce_ledger: Path, metrics_root: Path | None = None
 
     @app.get("/api/v1/runs/<run_id>/decisions")
     def get_decisions(run_id: str):
+        # query: cursor (row number), limit, decision, event_id, failed_axis ("null" matches no axis)
         dec_path = run_root / run_id / "decision_log.jsonl"
-        items = load_jsonl(dec_path) if dec_path.exists() else []
-        return jsonify({"items": items, "total": len(items)})
+        limit = max(1, min(request.args.get("limit", DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+        page = page_decisions(
+            dec_path,
+            cursor=max(0, request.args.get("cursor", 0, type=int)),
+            limit=limit,
+            decision=request.args.get("decision"),
+            event_id=request.args.get("event_id"),
+            failed_axis=request.args.get("failed_axis"),
+        )
+        return jsonify(page)
+
+    @app.get("/api/v1/runs/<run_id>/decisions/proof")
+    def get_decision_proof(run_id: str):
+        # query: cursor (first row), limit; rows are returned raw so their leaf hashes can be recomputed
+        if prove_rows is None:
+            return jsonify({"error": "osctl is not importable; Merkle proofs unavailable"}), 501
+        limit = max(1, min(request.args.get("limit", DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+        body, status = prove_decisions(run_root / run_id, max(0, request.args.get("cursor", 0, type=int)), limit, cache.load_json)
+        return jsonify(body), status
+
+    @app.get("/api/v1/runs/<run_id>/decisions/stream")
+    def stream_decisions(run_id: str):
+        run_dir = run_root / run_id
+        path = run_dir / "decision_log.jsonl"
+        return stream_jsonl(path, proof_digest(run_dir, path, cache.load_json))
+
+    @app.get("/api/v1/runs/<run_id>/triggers/stream")
+    def stream_triggers(run_id: str):
+        run_dir = run_root / run_id
+        path = run_dir / "trigger_events.jsonl"
+        return stream_jsonl(path, proof_digest(run_dir, path, cache.load_json))
 
     @app.get("/api/v1/runs/<run_id>/verify")
     def get_verify(run_id: str):
         ver_path = run_root / run_id / "verify_report.json"
-        verify = load_json(ver_path) if ver_path.exists() else {}
+        verify = cache.load_json(ver_path) if ver_path.exists() else {}
         metrics_path = metrics_root / f"runtime_sli_{run_id}.json"
-        metrics = load_json(metrics_path) if metrics_path.exists() else {}
+        metrics = cache.load_json(metrics_path) if metrics_path.exists() else {}
         return jsonify({"items": [verify] if verify else [], "metrics": metrics})
 
     @app.get("/api/v1/ce-ledger")
@@ -121,6 +419,41 @@ def create_app(run_root: Path, ce_ledger: Path, metrics_root: Path | None = None
         items = load_jsonl(ce_ledger) if ce_ledger.exists() else []
         return jsonify({"items": items, "total": len(items)})
 
+    @app.get("/api/v1/ce-ledger/stream")
+    def stream_ce():
+        return stream_jsonl(ce_ledger)
+
+    @app.get("/api/v1/sli/quantiles")
+    def get_sli_quantiles():
+        # query: cohort_id, tag, status, since/until (created_at, ISO-8601), run_id (repeatable), q ("0.5,0.95,0.99")
+        if merge_sketch_docs is None:
+            return jsonify({"error": "osctl is not importable; SLI sketches unavailable"}), 501
+        run_ids = request.args.getlist("run_id")
+        if run_ids:
+            runs = [{"run_id": r, "created_at": None} for r in run_ids]
+        else:
+            runs = list_runs(
+                run_root,
+                limit=max(1, min(request.args.get("limit", MAX_SKETCH_RUNS, type=int), MAX_SKETCH_RUNS)),
+                status=request.args.get("status"),
+                tag=request.args.get("tag"),
+                cohort_id=request.args.get("cohort_id"),
+            )
+        try:
+            quantiles = [float(q) for q in request.args.get("q", "").split(",") if q.strip()] or None
+            if quantiles and not all(0 <= q <= 1 for q in quantiles):
+                raise ValueError("q values must be in [0, 1]")
+            result = cohort_quantiles(
+                run_root, cache.load_json, runs, request.args.get("since"), request.args.get("until"), quantiles
+            )
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        return jsonify(result)
+
+    @app.get("/api/v1/cache/stats")
+    def get_cache_stats():
+        return jsonify(cache.stats())
+
     @app.get("/")
     def index():
         return send_from_directory(app.static_folder, "index.html")
@@ -128,6 +461,103 @@ def create_app(run_root: Path, ce_ledger: Path, metrics_root: Path | None = None
     return app
 
 
+class PooledWSGIServer(BaseWSGIServer):
+    """WSGI server handling requests on a bounded thread pool (blocking file I/O stays off the accept loop).
+
+    ``server_close`` waits for in-flight requests, so shutdown is graceful.
+    """
+
+    multithread = True
+
+    def __init__(self, host: str, port: int, app, threads: int = 16, fd: Optional[int] = None, multiprocess: bool = False):
+        self.multiprocess = multiprocess
+        super().__init__(host, port, app, fd=fd)
+        if fd is not None:
+            # a shared listener wakes every worker; losers of the accept race must not block in accept()
+            self.socket.setblocking(False)
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="console")
+
+    def get_request(self):
+        conn, addr = super().get_request()
+        conn.setblocking(True)
+        return conn, addr
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        pool = getattr(self, "_pool", None)
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+def _stop_on_signals(server: PooledWSGIServer) -> None:
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever returns, so it must not run on the serving thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+
+def serve(app: Flask, host: str, port: int, workers: int = 1, threads: int = 16) -> None:
+    """Serve ``app`` with ``workers`` pre-forked processes x ``threads`` request threads."""
+    if workers <= 1:
+        server = PooledWSGIServer(host, port, app, threads=threads)
+        _stop_on_signals(server)
+        print(f"Serving console on {host}:{server.port} (threads={threads})")
+        server.serve_forever()
+        return
+
+    # pre-fork: the parent binds once and every worker accepts on the shared socket
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.create_server((host, port), family=family, backlog=1024)
+    sock.set_inheritable(True)
+    children: List[int] = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            server = PooledWSGIServer(host, port, app, threads=threads, fd=sock.fileno(), multiprocess=True)
+            _stop_on_signals(server)
+            server.serve_forever()
+            os._exit(0)
+        children.append(pid)
+    sock.close()
+    print(f"Serving console on {host}:{port} (workers={workers}, threads={threads})")
+
+    def stop(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for pid in children:
+        os.waitpid(pid, 0)
+
+
+def create_app_from_env() -> Flask:
+    """App factory for external WSGI servers, e.g. ``gunicorn 'console.app:create_app_from_env()'``."""
+    metrics_root = os.environ.get("WL_CONSOLE_METRICS_ROOT")
+    return create_app(
+        Path(os.environ.get("WL_CONSOLE_RUN_ROOT", "out/osctl_runs")),
+        Path(os.environ.get("WL_CONSOLE_CE_LEDGER", "ledger/pilots/TeamA/CE_Ledger_v1.jsonl")),
+        Path(metrics_root) if metrics_root else None,
+        cache_bytes=int(os.environ.get("WL_CONSOLE_CACHE_BYTES", DEFAULT_CACHE_BYTES)),
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(description="WarmLogic console backend (minimal)")
     parser.add_argument("--run-root", default="out/osctl_runs", help="Path to osctl runs")
@@ -135,10 +565,17 @@ def main():
     parser.add_argument("--metrics-root", default=None, help="Optional path to metrics JSON files (runtime_sli_*.json)")
     parser.add_argument("--host", default="0.0.0.0")
     parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cache-bytes", type=int, default=DEFAULT_CACHE_BYTES, help="Artifact cache budget in bytes (0 disables caching)")
+    parser.add_argument("--server", default="pooled", choices=["pooled", "dev"], help="pooled: thread-pool/pre-fork server; dev: Flask dev server")
+    parser.add_argument("--workers", type=int, default=1, help="Pre-forked worker processes (pooled server, POSIX only)")
+    parser.add_argument("--threads", type=int, default=16, help="Request threads per worker (pooled server)")
     args = parser.parse_args()
     metrics_root = Path(args.metrics_root) if args.metrics_root else None
-    app = create_app(Path(args.run_root), Path(args.ce_ledger), metrics_root)
-    app.run(host=args.host, port=args.port)
+    app = create_app(Path(args.run_root), Path(args.ce_ledger), metrics_root, cache_bytes=args.cache_bytes)
+    if args.server == "dev":
+        app.run(host=args.host, port=args.port)
+    else:
+        serve(app, args.host, args.port, workers=args.workers, threads=args.threads)
 
 
 if __name__ == "__main__":
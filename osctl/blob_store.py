@@ -0,0 +1,210 @@
+"""Content-addressed store for run inputs (event logs, configs).
+
+Blobs live under ``<out-dir>/.blobs/sha256/<aa>/<rest-of-hex>`` keyed by the same
+``sha256:<hex>`` digest recorded in ``run_manifest.json``. Runs and replays
+hardlink (or reflink, or as a last resort copy) blobs into their run dirs instead
+of copying the source again, so N runs over the same multi-GB event log share one
+set of bytes. Blobs are read-only; ``gc`` removes blobs no manifest references.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set
+
+from .utils import COPY_CHUNK_SIZE, read_json
+
+STORE_DIRNAME = ".blobs"
+ALGO = "sha256"
+# blobs younger than this are never collected: a run ingests its inputs before
+# its manifest exists, so a fresh unreferenced blob may belong to an in-flight run
+DEFAULT_GC_GRACE_SECONDS = 3600
+# Linux FICLONE ioctl (_IOW(0x94, 9, int)); copy-on-write clone on btrfs/xfs
+_FICLONE = 0x40049409
+INPUT_KEYS = ("config", "events", "ct_config", "drift_config")
+
+
+class BlobStoreError(Exception):
+    """Raised for blob store failures."""
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - non-POSIX
+        return False
+    with src.open("rb") as fin, dst.open("wb") as fout:
+        try:
+            fcntl.ioctl(fout.fileno(), _FICLONE, fin.fileno())
+            return True
+        except OSError:
+            pass
+    dst.unlink()
+    return False
+
+
+class BlobStore:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    @classmethod
+    def for_run_root(cls, out_dir: Path) -> "BlobStore":
+        return cls(Path(out_dir) / STORE_DIRNAME)
+
+    def exists(self) -> bool:
+        return (self.root / ALGO).is_dir()
+
+    def path_for(self, digest: str) -> Path:
+        algo, _, hexdigest = digest.partition(":")
+        if algo != ALGO or len(hexdigest) != 64:
+            raise BlobStoreError(f"unsupported digest: {digest}")
+        return self.root / ALGO / hexdigest[:2] / hexdigest[2:]
+
+    def _is_blob(self, path: Path, digest: Optional[str]) -> bool:
+        if not digest:
+            return False
+        blob = self.path_for(digest)
+        try:
+            return blob.exists() and os.path.samefile(path, blob)
+        except OSError:
+            return False
+
+    def ingest(self, src: Path, known_digest: Optional[str] = None) -> str:
+        """Store ``src`` and return its digest, copying it only if the store lacks it.
+
+        A ``known_digest`` (the one recorded in a run manifest) is trusted only when
+        ``src`` is that blob itself, i.e. a link into the store; then nothing is read.
+        Otherwise ``src`` is hashed read-only first and copied into ``tmp/`` only on a
+        miss; the copy is hashed again and that digest wins, in case ``src`` changed
+        in between.
+        """
+        if self._is_blob(src, known_digest):
+            return known_digest  # type: ignore[return-value]
+        digest = self._hash(src)
+        if self.path_for(digest).exists():
+            return digest
+        tmp_dir = self.root / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        h = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(dir=tmp_dir)
+        tmp = Path(tmp_name)
+        try:
+            with src.open("rb") as fin, os.fdopen(fd, "wb") as fout:
+                for chunk in iter(lambda: fin.read(COPY_CHUNK_SIZE), b""):
+                    h.update(chunk)
+                    fout.write(chunk)
+            digest = f"{ALGO}:{h.hexdigest()}"
+            blob = self.path_for(digest)
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copystat(src, tmp)
+                os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+                try:
+                    # link, not replace: a concurrent ingest of the same bytes must
+                    # not swap the inode out from under runs already linked to it
+                    os.link(tmp, blob)
+                except FileExistsError:
+                    pass
+            return digest
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    @staticmethod
+    def _hash(path: Path) -> str:
+        h = hashlib.sha256()
+        with path.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(COPY_CHUNK_SIZE), b""):
+                h.update(chunk)
+        return f"{ALGO}:{h.hexdigest()}"
+
+    def materialize(self, digest: str, dst: Path) -> str:
+        """Place blob ``digest`` at ``dst``: hardlink, else reflink, else copy. Returns the method used."""
+        blob = self.path_for(digest)
+        if not blob.exists():
+            raise BlobStoreError(f"blob not found: {digest}")
+        dst.unlink(missing_ok=True)
+        try:
+            os.link(blob, dst)
+            return "hardlink"
+        except OSError:
+            pass
+        if _reflink(blob, dst):
+            shutil.copystat(blob, dst)
+            return "reflink"
+        shutil.copy2(blob, dst)
+        return "copy"
+
+    def store_into(self, src: Path, dst: Path, known_digest: Optional[str] = None) -> str:
+        """Ingest ``src`` and materialize it at ``dst``; returns the digest."""
+        digest = self.ingest(src, known_digest=known_digest)
+        self.materialize(digest, dst)
+        return digest
+
+    def iter_blobs(self) -> Iterator[tuple]:
+        base = self.root / ALGO
+        if not base.is_dir():
+            return
+        for prefix in sorted(base.iterdir()):
+            if not prefix.is_dir():
+                continue
+            for blob in sorted(prefix.iterdir()):
+                yield f"{ALGO}:{prefix.name}{blob.name}", blob
+
+    def gc(self, referenced: Set[str], dry_run: bool = False, grace_seconds: int = DEFAULT_GC_GRACE_SECONDS) -> Dict[str, Any]:
+        removed = []
+        kept = 0
+        freed = 0
+        cutoff = time.time() - grace_seconds
+        for digest, blob in self.iter_blobs():
+            st = blob.stat()
+            # ctime, not mtime: copystat carries the source's mtime over to the blob
+            if digest in referenced or st.st_ctime > cutoff:
+                kept += 1
+                continue
+            removed.append(digest)
+            freed += st.st_size
+            if not dry_run:
+                blob.unlink()
+        return {"kept": kept, "removed": removed, "freed_bytes": freed}
+
+
+def referenced_digests(run_root: Path) -> Set[str]:
+    """Input digests referenced by every run_manifest.json under ``run_root`` (runs and replays)."""
+    digests: Set[str] = set()
+    for manifest_path in Path(run_root).rglob("run_manifest.json"):
+        if STORE_DIRNAME in manifest_path.parts:
+            continue
+        try:
+            data = read_json(manifest_path)
+        except (OSError, ValueError):
+            continue
+        for key in INPUT_KEYS:
+            ref = data.get(key)
+            if isinstance(ref, dict) and ref.get("sha256"):
+                digests.add(ref["sha256"])
+    return digests
+
+
+def gc_command(args) -> int:
+    store = BlobStore.for_run_root(Path(args.out_dir))
+    if not store.exists():
+        print(json.dumps({"status": "OK", "kept": 0, "removed": 0, "freed_bytes": 0}))
+        return 0
+    result = store.gc(referenced_digests(Path(args.out_dir)), dry_run=args.dry_run, grace_seconds=args.grace_seconds)
+    print(
+        json.dumps(
+            {
+                "status": "DRY_RUN" if args.dry_run else "OK",
+                "kept": result["kept"],
+                "removed": len(result["removed"]),
+                "freed_bytes": result["freed_bytes"],
+            }
+        )
+    )
+    return 0
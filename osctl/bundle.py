@@ -0,0 +1,356 @@
+"""Streaming, parallel evidence bundle writer (``osctl_bundle.zip``).
+
+Members are read once in fixed-size blocks; each block is hashed (sha256 + crc32)
+on the way in and compressed on a thread pool (zlib and lzma release the GIL).
+Deflate members are split pigz-style: every block is an independent raw deflate
+segment primed with the previous block's last 32 KiB and ended with a sync flush,
+so the concatenation is one valid deflate stream that any unzip can read. Output is
+written sequentially; only the local header of each member is patched afterwards.
+
+Compression is chosen per member from a spec such as
+``"deflate:6,event_log.jsonl=store,decision_log.jsonl=lzma:6"``: entries without
+``name=`` set the default, methods are ``store``, ``deflate[:level]``,
+``lzma[:preset]`` and ``zstd[:level]`` (needs the optional ``zstandard`` package).
+
+The last member, ``bundle_manifest.json``, lists the sha256 and size of every other
+member so a bundle can be verified without extracting it.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import lzma
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+try:  # optional fast path, mirrors the fastjsonschema handling in utils
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+BUNDLE_MANIFEST_NAME = "bundle_manifest.json"
+BLOCK_SIZE = 1024 * 1024
+DICT_SIZE = 32 * 1024
+DEFAULT_COMPRESSION = "deflate:6"
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+ZIP_LZMA = 14
+ZIP_ZSTANDARD = 93
+METHOD_IDS = {"store": ZIP_STORED, "deflate": ZIP_DEFLATED, "lzma": ZIP_LZMA, "zstd": ZIP_ZSTANDARD}
+METHOD_NAMES = {v: k for k, v in METHOD_IDS.items()}
+DEFAULT_LEVELS = {"store": None, "deflate": 6, "lzma": 6, "zstd": 3}
+
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_MAX_ENTRIES = 0xFFFF
+# members at least this large get a zip64 local header up front; the compressed
+# size is only known after writing, and store/incompressible data can grow a little
+ZIP64_LOCAL_THRESHOLD = 0x7FFFFFFF
+FLAG_UTF8 = 0x800
+FLAG_LZMA_EOS = 0x002
+# liblzma's preset 0-9 dictionary sizes and literal/position bits, spelled out so the
+# zip LZMA properties header can be written without lzma's private encoder
+_LZMA_DICT_SIZES = (1 << 18, 1 << 20, 1 << 21, 1 << 22, 1 << 22, 1 << 23, 1 << 23, 1 << 24, 1 << 25, 1 << 26)
+_LZMA_LITERAL_BITS = {"lc": 3, "lp": 0, "pb": 2}
+
+
+class BundleError(Exception):
+    """Raised for invalid bundle options or unavailable codecs."""
+
+
+class Compression(NamedTuple):
+    method: str
+    level: Optional[int] = None
+
+    def __str__(self) -> str:
+        return self.method if self.level is None else f"{self.method}:{self.level}"
+
+
+def parse_compression(value: str) -> Compression:
+    method, _, level = value.strip().partition(":")
+    method = method.lower()
+    if method not in METHOD_IDS:
+        raise BundleError(f"unknown compression method: {method} (expected one of {sorted(METHOD_IDS)})")
+    if method == "zstd" and zstandard is None:
+        raise BundleError("zstd compression requires the 'zstandard' package")
+    if method == "store":
+        return Compression("store")
+    try:
+        compression = Compression(method, int(level) if level else DEFAULT_LEVELS[method])
+    except ValueError:
+        raise BundleError(f"invalid compression level: {value}") from None
+    if method == "lzma" and not 0 <= compression.level < len(_LZMA_DICT_SIZES):
+        raise BundleError(f"invalid compression level: {value} (lzma presets are 0-9)")
+    return compression
+
+
+def parse_compression_spec(spec: Optional[str]) -> Dict[str, Compression]:
+    """``"deflate:6,event_log.jsonl=store"`` -> {"*": deflate:6, "event_log.jsonl": store}."""
+    policy = {"*": parse_compression(DEFAULT_COMPRESSION)}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        name, sep, value = item.partition("=")
+        if sep:
+            policy[name.strip()] = parse_compression(value)
+        else:
+            policy["*"] = parse_compression(name)
+    return policy
+
+
+def _deflate_block(data: bytes, level: int, zdict: bytes, last: bool) -> bytes:
+    comp = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=zdict) if zdict else zlib.compressobj(level, zlib.DEFLATED, -15)
+    return comp.compress(data) + comp.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def _lzma1_filter(preset: int) -> Tuple[Dict[str, Any], bytes]:
+    """Explicit LZMA1 filter for ``preset`` and its 5-byte properties (lc/lp/pb byte, dict size)."""
+    spec = {"id": lzma.FILTER_LZMA1, "preset": preset, "dict_size": _LZMA_DICT_SIZES[preset], **_LZMA_LITERAL_BITS}
+    props = struct.pack("<BI", (spec["pb"] * 5 + spec["lp"]) * 9 + spec["lc"], spec["dict_size"])
+    return spec, props
+
+
+class _StreamCodec:
+    """Sequential codec (lzma/zstd) fed block by block; calls are serialized per member."""
+
+    def __init__(self, compression: Compression, workers: int):
+        if compression.method == "lzma":
+            lzma_filter, props = _lzma1_filter(compression.level)
+            self._comp: Any = lzma.LZMACompressor(lzma.FORMAT_RAW, filters=[lzma_filter])
+            self.header = struct.pack("<BBH", 9, 4, len(props)) + props
+        else:
+            cctx = zstandard.ZstdCompressor(level=compression.level, threads=workers if workers > 1 else 0)
+            self._comp = cctx.compressobj()
+            self.header = b""
+
+    def compress(self, data: bytes, last: bool) -> bytes:
+        out = self._comp.compress(data)
+        return out + self._comp.flush() if last else out
+
+
+class _Entry(NamedTuple):
+    name: bytes
+    method: int
+    flags: int
+    version: int
+    dostime: int
+    dosdate: int
+    crc: int
+    compressed_size: int
+    size: int
+    offset: int
+    external_attr: int
+
+
+def _dos_datetime(ts: float) -> Tuple[int, int]:
+    t = time.localtime(ts)
+    year = max(t.tm_year, 1980)
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+
+def _read_blocks(fh: BinaryIO, block_size: int) -> Iterator[Tuple[bytes, bool]]:
+    block = fh.read(block_size)
+    while True:
+        nxt = fh.read(block_size) if len(block) == block_size else b""
+        yield block, not nxt
+        if not nxt:
+            return
+        block = nxt
+
+
+class BundleWriter:
+    def __init__(self, path: Path, workers: Optional[int] = None, block_size: int = BLOCK_SIZE):
+        self.path = Path(path)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.block_size = block_size
+        self._fh = self.path.open("wb")
+        self._pool = ThreadPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        self._entries: List[_Entry] = []
+        self.members: List[Dict[str, Any]] = []
+
+    def __enter__(self) -> "BundleWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _submit(self, fn: Callable[..., bytes], *args: Any) -> Future:
+        if self._pool is None:
+            fut: Future = Future()
+            fut.set_result(fn(*args))
+            return fut
+        return self._pool.submit(fn, *args)
+
+    def _compressed_blocks(self, blocks: Iterable[Tuple[bytes, bool]], compression: Compression, digest: Any) -> Iterator[bytes]:
+        # hash in input order, compress on the pool, yield results in order (window of 2*workers)
+        window: Deque[Future] = deque()
+        codec = _StreamCodec(compression, self.workers) if compression.method in ("lzma", "zstd") else None
+        if codec is not None and codec.header:
+            yield codec.header
+        prev_tail = b""
+        for data, last in blocks:
+            digest(data)
+            if compression.method == "store":
+                yield data
+                continue
+            if codec is not None:
+                # stream codecs keep state across blocks: one block in flight per member
+                yield codec.compress(data, last)
+                continue
+            window.append(self._submit(_deflate_block, data, compression.level, prev_tail, last))
+            prev_tail = data[-DICT_SIZE:]
+            if len(window) >= self.workers * 2:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+    def _write_member(self, arcname: str, blocks: Iterable[Tuple[bytes, bool]], size_hint: int, mtime: float, mode: int, compression: Compression) -> None:
+        name = arcname.encode("utf-8")
+        method = METHOD_IDS[compression.method]
+        flags = FLAG_UTF8 | (FLAG_LZMA_EOS if method == ZIP_LZMA else 0)
+        zip64_local = size_hint >= ZIP64_LOCAL_THRESHOLD
+        version = 63 if method in (ZIP_LZMA, ZIP_ZSTANDARD) else (45 if zip64_local else 20)
+        dostime, dosdate = _dos_datetime(mtime)
+        offset = self._fh.tell()
+        extra = struct.pack("<HHQQ", 0x0001, 16, 0, 0) if zip64_local else b""
+        self._fh.write(
+            struct.pack("<IHHHHHIIIHH", 0x04034B50, version, flags, method, dostime, dosdate, 0, 0, 0, len(name), len(extra))
+            + name
+            + extra
+        )
+        data_start = self._fh.tell()
+
+        sha = hashlib.sha256()
+        crc = 0
+        size = 0
+
+        def digest(data: bytes) -> None:
+            nonlocal crc, size
+            sha.update(data)
+            crc = zlib.crc32(data, crc)
+            size += len(data)
+
+        for chunk in self._compressed_blocks(blocks, compression, digest):
+            self._fh.write(chunk)
+        end = self._fh.tell()
+        compressed_size = end - data_start
+        if not zip64_local and max(size, compressed_size) >= ZIP64_LIMIT:
+            raise BundleError(f"{arcname}: grew past 4 GiB without a zip64 header")
+
+        # patch crc/sizes into the local header
+        self._fh.seek(offset + 14)
+        if zip64_local:
+            self._fh.write(struct.pack("<III", crc, ZIP64_LIMIT, ZIP64_LIMIT))
+            self._fh.seek(offset + 30 + len(name) + 4)
+            self._fh.write(struct.pack("<QQ", size, compressed_size))
+        else:
+            self._fh.write(struct.pack("<III", crc, compressed_size, size))
+        self._fh.seek(end)
+
+        self._entries.append(
+            _Entry(name, method, flags, version, dostime, dosdate, crc, compressed_size, size, offset, (mode & 0xFFFF) << 16)
+        )
+        self.members.append({"name": arcname, "sha256": f"sha256:{sha.hexdigest()}", "size": size, "compression": str(compression)})
+
+    def add_file(self, src: Path, arcname: Optional[str] = None, compression: Compression = Compression("deflate", 6)) -> None:
+        st = src.stat()
+        with src.open("rb") as fh:
+            self._write_member(arcname or src.name, _read_blocks(fh, self.block_size), st.st_size, st.st_mtime, st.st_mode, compression)
+
+    def add_bytes(self, arcname: str, data: bytes, compression: Compression = Compression("deflate", 6)) -> None:
+        self._write_member(arcname, [(data, True)], len(data), time.time(), 0o100644, compression)
+
+    def _write_central_directory(self) -> None:
+        cd_start = self._fh.tell()
+        for e in self._entries:
+            fields: List[int] = []
+            size = e.size
+            compressed_size = e.compressed_size
+            offset = e.offset
+            if size >= ZIP64_LIMIT:
+                fields.append(size)
+                size = ZIP64_LIMIT
+            if compressed_size >= ZIP64_LIMIT:
+                fields.append(compressed_size)
+                compressed_size = ZIP64_LIMIT
+            if offset >= ZIP64_LIMIT:
+                fields.append(offset)
+                offset = ZIP64_LIMIT
+            extra = struct.pack("<HH" + "Q" * len(fields), 0x0001, 8 * len(fields), *fields) if fields else b""
+            version = max(e.version, 45) if fields else e.version
+            self._fh.write(
+                struct.pack(
+                    "<IHHHHHHIIIHHHHHII",
+                    0x02014B50,
+                    (3 << 8) | version,  # made by: unix
+                    version,
+                    e.flags,
+                    e.method,
+                    e.dostime,
+                    e.dosdate,
+                    e.crc,
+                    compressed_size,
+                    size,
+                    len(e.name),
+                    len(extra),
+                    0,
+                    0,
+                    0,
+                    e.external_attr,
+                    offset,
+                )
+                + e.name
+                + extra
+            )
+        cd_end = self._fh.tell()
+        count = len(self._entries)
+        cd_size = cd_end - cd_start
+        if count > ZIP_MAX_ENTRIES or cd_start >= ZIP64_LIMIT or cd_size >= ZIP64_LIMIT:
+            self._fh.write(struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, cd_size, cd_start))
+            self._fh.write(struct.pack("<IIQI", 0x07064B50, 0, cd_end, 1))
+            count = min(count, ZIP_MAX_ENTRIES)
+            cd_size = min(cd_size, ZIP64_LIMIT)
+            cd_start = min(cd_start, ZIP64_LIMIT)
+        self._fh.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, count, count, cd_size, cd_start, 0))
+
+    def close(self, manifest_meta: Optional[Dict[str, Any]] = None) -> None:
+        if self._fh.closed:
+            return
+        manifest = {"schema_version": "1.0", **(manifest_meta or {}), "members": list(self.members)}
+        self.add_bytes(BUNDLE_MANIFEST_NAME, json.dumps(manifest, indent=2).encode("utf-8"))
+        self._write_central_directory()
+        self._fh.close()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def abort(self) -> None:
+        self._fh.close()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+        self.path.unlink(missing_ok=True)
+
+
+def build_bundle(
+    bundle_path: Path,
+    members: Iterable[Path],
+    compression: Optional[Dict[str, Compression]] = None,
+    workers: Optional[int] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Write ``members`` (by file name) into ``bundle_path``; returns the embedded member list."""
+    policy = compression or parse_compression_spec(None)
+    writer = BundleWriter(bundle_path, workers=workers)
+    with writer:
+        for path in members:
+            writer.add_file(path, path.name, policy.get(path.name, policy["*"]))
+        writer.close(meta)
+    return writer.members
@@ -0,0 +1,49 @@
+"""Checkpoints for resuming interrupted one-shot runs (``run_checkpoint.json``).
+
+Streaming and sharded runs periodically make their outputs durable and record where
+they are: the next unread byte / row of the event log copy, the size of every appended
+artifact, and the run's accumulators (verdict, SLI sketches, trace correlator) as plain
+JSON from their ``to_dict``. ``osctl run --resume`` truncates the outputs back to those sizes
+and continues from the recorded offset, so the finished run has the same rows and
+digests as an uninterrupted one. The checkpoint is removed once the run completes.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .utils import now_utc_iso, read_json, write_json_atomic
+
+CHECKPOINT_FILENAME = "run_checkpoint.json"
+CHECKPOINT_SCHEMA_VERSION = "2.0"
+
+
+class Progress:
+    """Next unread position in the event log; only advanced past rows already handed on."""
+
+    __slots__ = ("offset", "row")
+
+    def __init__(self, offset: int = 0, row: int = 0):
+        self.offset = offset
+        self.row = row
+
+
+def write_checkpoint(path: Path, meta: Dict[str, Any], state: Dict[str, Any]) -> None:
+    write_json_atomic(
+        path,
+        {
+            "schema_version": CHECKPOINT_SCHEMA_VERSION,
+            "written_at": now_utc_iso(),
+            **meta,
+            "state": state,
+        },
+    )
+
+
+def read_checkpoint(path: Path) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Return ``(meta, state)`` or ``None`` when there is nothing to resume."""
+    if not path.exists():
+        return None
+    data = read_json(path)
+    state = data.pop("state")
+    return data, state
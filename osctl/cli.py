@@ -4,9 +4,15 @@ import argparse
 from pathlib import Path
 
 from . import config as cfg
+from .blob_store import DEFAULT_GC_GRACE_SECONDS, gc_command
+from .engine_batch import run_batch_command
 from .engine_replay import replay_command
 from .engine_run import run_command
 from .engine_verify import verify_command
+from .follow import DEFAULT_POLL_INTERVAL_S, DEFAULT_ROLL_INTERVAL_S
+from .replay_diff import DEFAULT_MAX_DIVERGENCES
+from .run_index import index_command
+from .sli import DEFAULT_VERIFY_WINDOW, sli_command
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -17,7 +23,7 @@ def build_parser() -> argparse.ArgumentParser:
     parent.add_argument("--log-level", default="info", choices=cfg.LOG_LEVELS, help="Log level")
     parent.add_argument("--dry-run", action="store_true", help="Validate inputs but do not write files")
 
-    parser = argparse.ArgumentParser(description="WarmLogic osctl run/replay/verify CLI", parents=[parent])
+    parser = argparse.ArgumentParser(description="WarmLogic osctl run/run-batch/replay/verify/index/sli/gc CLI", parents=[parent])
 
     sub = parser.add_subparsers(dest="cmd", required=True)
 
@@ -31,20 +37,70 @@ def build_parser() -> argparse.ArgumentParser:
     run_p.add_argument("--edition", help="Edition identifier")
     run_p.add_argument("--tag", help="Tag for this run")
     run_p.add_argument("--no-bundle", action="store_true", help="Skip bundle zip creation")
+    run_p.add_argument("--stream", action="store_true", help="Stream events and write decision/trigger rows incrementally (constant memory)")
+    run_p.add_argument("--workers", type=int, default=1, help="Derive decisions over newline-aligned shards on N processes (default: 1)")
+    run_p.add_argument("--blob-store", action="store_true", help="Link inputs from the content-addressed store under <out-dir>/.blobs instead of copying (or OSCTL_BLOB_STORE=1)")
+    run_p.add_argument("--bundle-compression", help="Per-member bundle compression, e.g. 'deflate:6,event_log.jsonl=store' (store, deflate[:level], lzma[:preset], zstd[:level]; or OSCTL_BUNDLE_COMPRESSION)")
+    run_p.add_argument("--bundle-workers", type=int, help="Threads compressing bundle members (default: CPU count)")
+    run_p.add_argument("--columnar", action="store_true", help="Also write the memory-mappable columnar sidecar decision_log.columns/ (or OSCTL_COLUMNAR=1)")
+    run_p.add_argument("--merkle", action="store_true", help="Also write per-row Merkle sidecars for the JSONL artifacts and record their roots in proof_manifest.json (or OSCTL_MERKLE=1)")
+    run_p.add_argument("--resume", action="store_true", help="Continue an interrupted --stream/--workers run with the same --run-id from its run_checkpoint.json (checkpoint cadence: OSCTL_CHECKPOINT_INTERVAL_S)")
+    run_p.add_argument("--follow", action="store_true", help="Tail a growing event log, appending rows incrementally from a persisted checkpoint (resume with the same --run-id)")
+    run_p.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL_S, help="With --follow: seconds between polls when the log has no new lines (default: 1)")
+    run_p.add_argument("--roll-interval", type=float, default=DEFAULT_ROLL_INTERVAL_S, help="With --follow: seconds between chained proof manifest segments (default: 60)")
+    run_p.add_argument("--max-idle", type=float, help="With --follow: stop after this many seconds without new lines (default: run until interrupted)")
     run_p.set_defaults(func=run_command)
 
+    batch_p = sub.add_parser("run-batch", help="Execute many runs from a job manifest on a process pool", parents=[parent])
+    batch_p.add_argument("--manifest", required=True, help="Job manifest: JSONL (one job per line) or JSON ({'jobs': [...]})")
+    batch_p.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    batch_p.add_argument("--no-bundle", action="store_true", help="Skip bundle zip creation")
+    batch_p.add_argument("--stream", action="store_true", help="Stream events and write decision/trigger rows incrementally (constant memory)")
+    batch_p.add_argument("--blob-store", action="store_true", help="Link inputs from the content-addressed store under <out-dir>/.blobs instead of copying (or OSCTL_BLOB_STORE=1)")
+    batch_p.add_argument("--bundle-compression", help="Per-member bundle compression, e.g. 'deflate:6,event_log.jsonl=store' (store, deflate[:level], lzma[:preset], zstd[:level]; or OSCTL_BUNDLE_COMPRESSION)")
+    batch_p.add_argument("--columnar", action="store_true", help="Also write the memory-mappable columnar sidecar decision_log.columns/ (or OSCTL_COLUMNAR=1)")
+    batch_p.add_argument("--merkle", action="store_true", help="Also write per-row Merkle sidecars for the JSONL artifacts and record their roots in proof_manifest.json (or OSCTL_MERKLE=1)")
+    batch_p.set_defaults(func=run_batch_command)
+
     replay_p = sub.add_parser("replay", help="Replay an existing run", parents=[parent])
     replay_p.add_argument("--run-id", required=True, help="Run id to replay")
     replay_p.add_argument("--manifest", help="Path to run_manifest.json (defaults to out/<run_id>/run_manifest.json)")
     replay_p.add_argument("--no-bundle", action="store_true", help="Skip bundle zip creation")
+    replay_p.add_argument("--max-divergences", type=int, default=DEFAULT_MAX_DIVERGENCES, help="Divergent rows to list per artifact in verify_report.json (default: 20)")
+    replay_p.add_argument("--decision-id", help="Replay only the events in this decision's trace and compare with the recorded decision_log rows")
     replay_p.set_defaults(func=replay_command)
 
     verify_p = sub.add_parser("verify", help="Verify artifacts for a run_id", parents=[parent])
-    verify_p.add_argument("--run-id", required=True, help="Run id to verify")
+    verify_p.add_argument("--run-id", help="Run id to verify (required unless --run-dir or --bundle is given)")
     verify_p.add_argument("--run-dir", help="Explicit run directory (default: out/<run_id>)")
     verify_p.add_argument("--proof-manifest", help="Override proof_manifest path")
+    verify_p.add_argument("--workers", type=int, help="Parallel workers for hashing and JSONL schema validation (default: CPU count)")
+    verify_p.add_argument("--fail-fast", action="store_true", help="Stop at the first check that fails the run (best-effort checks do not stop it)")
+    verify_p.add_argument("--paranoid", action="store_true", help="Ignore the verify cache and recompute every hash and schema check")
+    verify_p.add_argument("--bundle", help="Verify an osctl_bundle.zip in place, streaming members from the archive")
+    verify_p.add_argument("--report", help="With --bundle: also write the verify report to this path")
+    verify_p.add_argument("--rows", help="Only check rows N or START:END (end exclusive) of --artifact against its Merkle root, in O(log n)")
+    verify_p.add_argument("--artifact", default="decision_log.jsonl", help="With --rows: JSONL artifact to check (default: decision_log.jsonl)")
     verify_p.set_defaults(func=verify_command)
 
+    index_p = sub.add_parser("index", help="Maintain the run index (run_index.sqlite) under --out-dir", parents=[parent])
+    index_p.add_argument("action", choices=["rebuild"], help="rebuild: rescan run dirs and backfill the index")
+    index_p.add_argument("--metrics-root", help="Path to runtime_sli_*.json files (default: <out-dir>/../metrics)")
+    index_p.set_defaults(func=index_command)
+
+    sli_p = sub.add_parser("sli", help="Compute runtime SLIs into <metrics-root>/runtime_sli_<run_id>.json", parents=[parent])
+    sli_p.add_argument("--run-id", nargs="+", help="Run id(s) under --out-dir")
+    sli_p.add_argument("--all", action="store_true", help="Every run under --out-dir (batch mode)")
+    sli_p.add_argument("--metrics-root", help="Where runtime_sli_*.json are written (default: <out-dir>/../metrics)")
+    sli_p.add_argument("--ce-ledger", help="CE ledger JSONL for ce_open_count (default: ledger/pilots/TeamA/CE_Ledger_v1.jsonl if present)")
+    sli_p.add_argument("--window", type=int, default=DEFAULT_VERIFY_WINDOW, help="Runs in the verify_success_rate window (default: 20)")
+    sli_p.add_argument("--workers", type=int, help="Worker processes for batch mode (default: CPU count)")
+    sli_p.set_defaults(func=sli_command)
+
+    gc_p = sub.add_parser("gc", help="Remove blobs under <out-dir>/.blobs that no run manifest references", parents=[parent])
+    gc_p.add_argument("--grace-seconds", type=int, default=DEFAULT_GC_GRACE_SECONDS, help="Never remove blobs newer than this (default: 3600)")
+    gc_p.set_defaults(func=gc_command)
+
     return parser
 
 
@@ -0,0 +1,253 @@
+"""Columnar sidecar for ``decision_log.jsonl`` (``decision_log.columns/``).
+
+One ``.npy`` file per column, memory-mapped on read, so aggregations over millions of
+decisions are numpy operations instead of JSON parsing:
+
+- ``event_id`` / ``decision`` / ``failed_axis``: int32 dictionary codes
+  (``<col>.codes.npy``, -1 for null) plus the dictionary (``<col>.dict.npy``, UTF-8 bytes;
+  non-string values such as numeric event ids are stored as their ``str()``)
+- ``timestamp``: int64 microseconds since the epoch (``TIMESTAMP_NULL`` when absent)
+- ``witness_exists``: bool
+
+``meta.json`` records the row count and the size of the JSONL it was built from; a
+sidecar whose JSONL has since changed size is treated as stale.
+"""
+from __future__ import annotations
+
+import json
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+COLUMNS_SUFFIX = ".columns"
+META_FILENAME = "meta.json"
+DICT_COLUMNS = ("event_id", "decision", "failed_axis")
+TIMESTAMP_NULL = np.iinfo(np.int64).min
+CHUNK_ROWS = 65536
+# .npy header space reserved up front; the row count is only known at close
+_NPY_HEADER_BYTES = 128
+
+
+def columns_path_for(jsonl_path: Path) -> Path:
+    return jsonl_path.with_name(jsonl_path.stem + COLUMNS_SUFFIX)
+
+
+def _parse_timestamp(value: Any) -> int:
+    if not value:
+        return TIMESTAMP_NULL
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return TIMESTAMP_NULL
+    return int(dt.timestamp() * 1_000_000)
+
+
+class ColumnChunk(NamedTuple):
+    """A block of rows with chunk-local dictionaries (what shard workers send back)."""
+
+    rows: int
+    dictionaries: Dict[str, List[str]]
+    codes: Dict[str, np.ndarray]
+    timestamp: np.ndarray
+    witness_exists: np.ndarray
+
+
+class ColumnChunkBuilder:
+    def __init__(self) -> None:
+        self._lookup: Dict[str, Dict[str, int]] = {col: {} for col in DICT_COLUMNS}
+        self._codes: Dict[str, List[int]] = {col: [] for col in DICT_COLUMNS}
+        self._timestamp: List[int] = []
+        self._witness: List[bool] = []
+        self._last_ts: Any = None
+        self._last_ts_value = TIMESTAMP_NULL
+
+    def __len__(self) -> int:
+        return len(self._timestamp)
+
+    def add(self, decision: Dict[str, Any]) -> None:
+        witness = decision.get("witness_path") or {}
+        values = {
+            "event_id": decision.get("event_id"),
+            "decision": decision.get("decision"),
+            "failed_axis": witness.get("failed_axis") if isinstance(witness, dict) else None,
+        }
+        for col, value in values.items():
+            if value is None:
+                self._codes[col].append(-1)
+                continue
+            # event ids pass through from the log as-is; the dictionaries hold text
+            value = str(value)
+            lookup = self._lookup[col]
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(lookup)
+            self._codes[col].append(code)
+        ts = decision.get("timestamp")
+        if ts != self._last_ts:  # rows derived in the same second share a timestamp string
+            self._last_ts, self._last_ts_value = ts, _parse_timestamp(ts)
+        self._timestamp.append(self._last_ts_value)
+        self._witness.append(bool(isinstance(witness, dict) and witness.get("exists")))
+
+    def build(self) -> ColumnChunk:
+        return ColumnChunk(
+            rows=len(self),
+            dictionaries={col: list(lookup) for col, lookup in self._lookup.items()},
+            codes={col: np.asarray(codes, dtype=np.int32) for col, codes in self._codes.items()},
+            timestamp=np.asarray(self._timestamp, dtype=np.int64),
+            witness_exists=np.asarray(self._witness, dtype=np.bool_),
+        )
+
+
+class _NpyAppender:
+    """Appends raw little-endian values to a .npy file, writing its header at close."""
+
+    def __init__(self, path: Path, dtype: np.dtype):
+        self.path = path
+        self.dtype = np.dtype(dtype).newbyteorder("<") if np.dtype(dtype).itemsize > 1 else np.dtype(dtype)
+        self.rows = 0
+        self._fh = path.open("wb")
+        self._fh.write(b"\0" * _NPY_HEADER_BYTES)
+
+    def append(self, values: np.ndarray) -> None:
+        self._fh.write(np.ascontiguousarray(values, dtype=self.dtype).tobytes())
+        self.rows += len(values)
+
+    def close(self) -> None:
+        header = repr({"descr": np.lib.format.dtype_to_descr(self.dtype), "fortran_order": False, "shape": (self.rows,)})
+        prefix = np.lib.format.magic(1, 0)
+        pad = _NPY_HEADER_BYTES - len(prefix) - 2 - len(header) - 1
+        self._fh.seek(0)
+        self._fh.write(prefix + struct.pack("<H", _NPY_HEADER_BYTES - len(prefix) - 2) + header.encode("latin1") + b" " * pad + b"\n")
+        self._fh.close()
+
+
+class ColumnarWriter:
+    """Builds the sidecar from decision rows (``add``) or pre-built chunks (``add_chunk``)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.mkdir(parents=True, exist_ok=True)
+        self._lookup: Dict[str, Dict[str, int]] = {col: {} for col in DICT_COLUMNS}
+        self._codes = {col: _NpyAppender(path / f"{col}.codes.npy", np.int32) for col in DICT_COLUMNS}
+        self._timestamp = _NpyAppender(path / "timestamp.npy", np.int64)
+        self._witness = _NpyAppender(path / "witness_exists.npy", np.bool_)
+        self._builder = ColumnChunkBuilder()
+        self.rows = 0
+
+    def add(self, decision: Dict[str, Any]) -> None:
+        self._builder.add(decision)
+        if len(self._builder) >= CHUNK_ROWS:
+            self._flush_builder()
+
+    def _flush_builder(self) -> None:
+        if len(self._builder):
+            chunk = self._builder.build()
+            self._builder = ColumnChunkBuilder()
+            self.add_chunk(chunk)
+
+    def add_chunk(self, chunk: ColumnChunk) -> None:
+        self._flush_builder()
+        for col in DICT_COLUMNS:
+            lookup = self._lookup[col]
+            remap = np.fromiter((lookup.setdefault(v, len(lookup)) for v in chunk.dictionaries[col]), dtype=np.int32)
+            codes = chunk.codes[col]
+            # -1 (null) indexes the appended -1 slot
+            self._codes[col].append(np.append(remap, np.int32(-1))[codes] if len(codes) else codes)
+        self._timestamp.append(chunk.timestamp)
+        self._witness.append(chunk.witness_exists)
+        self.rows += chunk.rows
+
+    def close(self, source_size: Optional[int] = None) -> None:
+        self._flush_builder()
+        for appender in (*self._codes.values(), self._timestamp, self._witness):
+            appender.close()
+        for col in DICT_COLUMNS:
+            values = [v.encode("utf-8") for v in self._lookup[col]]
+            np.save(self.path / f"{col}.dict.npy", np.array(values, dtype=f"S{max(map(len, values), default=1)}"))
+        meta = {"schema_version": "1.0", "rows": self.rows, "source_size": source_size, "dict_columns": list(DICT_COLUMNS)}
+        (self.path / META_FILENAME).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+class ColumnarLog:
+    """Read side: memory-mapped columns of a decision log sidecar."""
+
+    def __init__(self, path: Path, meta: Dict[str, Any]):
+        self.path = path
+        self.meta = meta
+        self.rows = int(meta["rows"])
+        self._cache: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def open(cls, jsonl_path: Path) -> Optional["ColumnarLog"]:
+        path = columns_path_for(jsonl_path)
+        meta_path = path / META_FILENAME
+        if not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("source_size") is not None and jsonl_path.exists() and jsonl_path.stat().st_size != meta["source_size"]:
+            return None  # stale sidecar (artifact rewritten)
+        return cls(path, meta)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _load(self, filename: str) -> np.ndarray:
+        if filename not in self._cache:
+            self._cache[filename] = np.load(self.path / filename, mmap_mode="r")
+        return self._cache[filename]
+
+    def codes(self, col: str) -> np.ndarray:
+        return self._load(f"{col}.codes.npy")
+
+    def dictionary(self, col: str) -> List[str]:
+        return [v.decode("utf-8") for v in np.load(self.path / f"{col}.dict.npy")]
+
+    def timestamps(self) -> np.ndarray:
+        """int64 microseconds since the epoch; ``TIMESTAMP_NULL`` where absent."""
+        return self._load("timestamp.npy")
+
+    def witness_exists(self) -> np.ndarray:
+        return self._load("witness_exists.npy")
+
+    def mask(self, col: str, value: Optional[str]) -> np.ndarray:
+        """Boolean row mask for ``col == value`` (``None`` matches nulls)."""
+        if value is None:
+            return self.codes(col) < 0
+        try:
+            code = self.dictionary(col).index(value)
+        except ValueError:
+            return np.zeros(self.rows, dtype=np.bool_)
+        return self.codes(col) == code
+
+    def value_counts(self, col: str, where: Optional[np.ndarray] = None) -> Dict[Optional[str], int]:
+        codes = self.codes(col) if where is None else self.codes(col)[where]
+        values = self.dictionary(col)
+        counts = np.bincount(codes + 1, minlength=len(values) + 1)
+        result: Dict[Optional[str], int] = {v: int(n) for v, n in zip(values, counts[1:]) if n}
+        if counts[0]:
+            result[None] = int(counts[0])
+        return result
+
+    def time_range(self) -> Optional[tuple]:
+        ts = self.timestamps()
+        ts = ts[ts != TIMESTAMP_NULL]
+        if not len(ts):
+            return None
+        return int(ts.min()), int(ts.max())
+
+
+def build_columnar(jsonl_path: Path) -> ColumnarLog:
+    """Backfill a sidecar for a decision log written without one (one sequential parse)."""
+    writer = ColumnarWriter(columns_path_for(jsonl_path))
+    with jsonl_path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                writer.add(json.loads(line))
+    writer.close(source_size=jsonl_path.stat().st_size)
+    log = ColumnarLog.open(jsonl_path)
+    assert log is not None
+    return log
@@ -8,6 +8,21 @@ DEFAULT_OUT_DIR = Path(os.environ.get("OSCTL_OUT_DIR", "out/osctl_runs"))
 DEFAULT_CONFIG_ROOT = Path(os.environ.get("OSCTL_CONFIG_ROOT", "configs"))
 DEFAULT_SCHEMAS_ROOT = Path(os.environ.get("OSCTL_SCHEMAS_ROOT", "schemas"))
 DEFAULT_RUN_ID_PREFIX = os.environ.get("OSCTL_RUN_ID_PREFIX", "RUN_OSCTL")
+# "auto" uses fastjsonschema when installed, "jsonschema" forces the reference validator
+SCHEMA_BACKEND = os.environ.get("OSCTL_SCHEMA_BACKEND", "auto")
+# link run inputs from the content-addressed store under <out-dir>/.blobs instead of copying them
+BLOB_STORE = os.environ.get("OSCTL_BLOB_STORE", "").lower() in ("1", "true", "yes")
+# per-member bundle compression, e.g. "deflate:6,event_log.jsonl=store" (see osctl.bundle)
+BUNDLE_COMPRESSION = os.environ.get("OSCTL_BUNDLE_COMPRESSION", "")
+# also write the numpy-backed columnar sidecar decision_log.columns/ (see osctl.columnar)
+COLUMNAR = os.environ.get("OSCTL_COLUMNAR", "").lower() in ("1", "true", "yes")
+# also write per-row Merkle sidecars <artifact>.jsonl.merkle and record their roots (see osctl.merkle)
+MERKLE = os.environ.get("OSCTL_MERKLE", "").lower() in ("1", "true", "yes")
+# trace correlator watermark lag and idle timeout, in seconds of event time (see osctl.correlator)
+TRACE_ALLOWED_LATENESS_S = float(os.environ.get("OSCTL_TRACE_LATENESS_S", "300"))
+TRACE_TTL_S = float(os.environ.get("OSCTL_TRACE_TTL_S", "3600"))
+# seconds between run_checkpoint.json writes in streaming/sharded runs; 0 disables (see osctl.checkpoint)
+CHECKPOINT_INTERVAL_S = float(os.environ.get("OSCTL_CHECKPOINT_INTERVAL_S", "60"))
 
 LOG_LEVELS = ("debug", "info", "warning", "error")
 
@@ -0,0 +1,229 @@
+"""Streaming trace correlator (``trace_findings.jsonl``).
+
+Events are joined per trace (``trace_id``, else ``request_id``, else ``decision_id``) in a
+keyed state store (``expiry.KeyedExpiryStore``) as the log streams past. The watermark is the largest ``ts_utc`` seen
+minus ``allowed_lateness``. A completed trace (``RESPONSE_SENT`` / ``DECISION_FROZEN`` /
+``PIPELINE_END``) is closed once the watermark passes its last event; an open trace is
+closed as expired once the watermark passes its last event plus ``trace_ttl``. Memory
+is bounded by the traces still open, not by log size (``max_open_traces`` caps it
+outright).
+
+Findings:
+
+- ``late_evidence``: evidence stamped after its admissibility window closed, or emitted
+  after the governance decision it supports
+- ``missing_evidence``: a ``GOV_DECISION`` whose trace closed without evidence for it
+- ``late_event``: an event whose ``ts_utc`` was already behind the watermark on arrival
+- ``trace_expired``: a trace idle for ``trace_ttl`` without completing (or evicted at
+  ``max_open_traces``)
+
+Shard workers reduce events to ``CorrelationRecord``s; the parent feeds them to one
+correlator in event order, so findings do not depend on ``--workers``.
+"""
+from __future__ import annotations
+
+import functools
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+from .expiry import KeyedExpiryStore, trace_key_of
+from .rules import EVIDENCE_EVENT_TYPES, event_type_of
+
+FINDINGS_FILENAME = "trace_findings.jsonl"
+DEFAULT_ALLOWED_LATENESS_S = 300.0
+DEFAULT_TRACE_TTL_S = 3600.0
+DEFAULT_MAX_OPEN_TRACES = 1_000_000
+COMPLETION_EVENT_TYPES = frozenset({"RESPONSE_SENT", "DECISION_FROZEN", "PIPELINE_END"})
+FINDING_KINDS = ("late_evidence", "missing_evidence", "late_event", "trace_expired")
+
+
+class CorrelationRecord(NamedTuple):
+    """The parts of an event the correlator needs (what shard workers send back)."""
+
+    row: int
+    event_id: Optional[str]
+    event_type: Optional[str]
+    trace_key: str
+    decision_id: Optional[str]
+    ts: Optional[float]
+    window_close: Optional[float]
+    has_evidence: bool
+
+
+@functools.lru_cache(maxsize=4096)
+def _epoch(value: str) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _epoch_of(value: Any) -> Optional[float]:
+    return _epoch(value) if isinstance(value, str) and value else None
+
+
+def _finite(value: float) -> Optional[float]:
+    return value if value not in (float("inf"), float("-inf")) else None
+
+
+def correlation_record(row: int, evt: Dict[str, Any]) -> Optional[CorrelationRecord]:
+    trace_key = trace_key_of(evt)
+    if trace_key is None:
+        return None
+    window = evt.get("admissibility_window")
+    return CorrelationRecord(
+        row=row,
+        event_id=evt.get("event_id"),
+        event_type=event_type_of(evt),
+        trace_key=trace_key,
+        decision_id=evt.get("decision_id"),
+        ts=_epoch_of(evt.get("ts_utc") or evt.get("timestamp")),
+        window_close=_epoch_of(window.get("close_at")) if isinstance(window, dict) else None,
+        has_evidence=bool(evt.get("evidence_refs") or evt.get("evidence_ref")),
+    )
+
+
+class _Trace:
+    __slots__ = ("key", "first_row", "last_ts", "completed", "deadline", "decisions", "evidenced", "trace_evidence")
+
+    def __init__(self, key: str, first_row: int):
+        self.key = key
+        self.first_row = first_row
+        self.last_ts: Optional[float] = None
+        self.completed = False
+        self.deadline = float("inf")
+        # decision_id -> (row, event_id, ts) of its GOV_DECISION
+        self.decisions: Dict[str, Tuple[int, Optional[str], Optional[float]]] = {}
+        self.evidenced: Set[str] = set()  # decision_ids with evidence
+        self.trace_evidence = False  # evidence not tied to a decision covers the whole trace
+
+
+class TraceCorrelator:
+    def __init__(
+        self,
+        emit: Callable[[Dict[str, Any]], None],
+        allowed_lateness: float = DEFAULT_ALLOWED_LATENESS_S,
+        trace_ttl: float = DEFAULT_TRACE_TTL_S,
+        max_open_traces: int = DEFAULT_MAX_OPEN_TRACES,
+    ):
+        self.emit = emit
+        self.allowed_lateness = allowed_lateness
+        self.trace_ttl = trace_ttl
+        self.max_open_traces = max_open_traces
+        self._traces: KeyedExpiryStore[_Trace] = KeyedExpiryStore(self._expire, allowed_lateness, max_open_traces)
+        self.counts: Dict[str, int] = {kind: 0 for kind in FINDING_KINDS}
+        self.traces_closed = 0
+
+    @property
+    def watermark(self) -> float:
+        return self._traces.watermark
+
+    @property
+    def peak_open_traces(self) -> int:
+        return self._traces.peak_open
+
+    def _finding(self, kind: str, trace: _Trace, row: int, event_id: Optional[str], decision_id: Optional[str], **detail: Any) -> None:
+        self.counts[kind] += 1
+        self.emit({"kind": kind, "trace_key": trace.key, "row": row, "event_id": event_id, "decision_id": decision_id, **detail})
+
+    def add(self, rec: CorrelationRecord) -> None:
+        trace = self._traces.get(rec.trace_key) or self._traces.put(rec.trace_key, _Trace(rec.trace_key, rec.row))
+        if rec.ts is not None and rec.ts < self.watermark:
+            self._finding("late_event", trace, rec.row, rec.event_id, rec.decision_id, behind_watermark_s=round(self.watermark - rec.ts, 3))
+
+        if rec.event_type in EVIDENCE_EVENT_TYPES or (rec.has_evidence and rec.event_type != "GOV_DECISION"):
+            if rec.decision_id:
+                trace.evidenced.add(rec.decision_id)
+                decided = trace.decisions.get(rec.decision_id)
+                if rec.event_type == "EVIDENCE_EMIT" and decided and decided[2] is not None and rec.ts is not None and rec.ts > decided[2]:
+                    self._finding("late_evidence", trace, rec.row, rec.event_id, rec.decision_id, reason="after_decision")
+            else:
+                trace.trace_evidence = True
+            if rec.window_close is not None and rec.ts is not None and rec.ts > rec.window_close:
+                self._finding("late_evidence", trace, rec.row, rec.event_id, rec.decision_id, reason="after_window_close")
+        elif rec.event_type == "GOV_DECISION" and rec.decision_id:
+            trace.decisions.setdefault(rec.decision_id, (rec.row, rec.event_id, rec.ts))
+            if rec.has_evidence:
+                trace.evidenced.add(rec.decision_id)
+        if rec.event_type in COMPLETION_EVENT_TYPES:
+            trace.completed = True
+
+        if rec.ts is not None:
+            trace.last_ts = rec.ts if trace.last_ts is None else max(trace.last_ts, rec.ts)
+        if trace.last_ts is not None:
+            self._traces.schedule(trace.key, trace.last_ts + self.allowed_lateness + (0.0 if trace.completed else self.trace_ttl))
+        if rec.ts is not None:
+            self._traces.observe(rec.ts)
+        self._traces.enforce_cap()
+
+    def add_many(self, records: Iterable[CorrelationRecord]) -> None:
+        for rec in records:
+            self.add(rec)
+
+    def _expire(self, trace: _Trace, evicted: bool) -> None:
+        self._close(trace, expired=evicted or not trace.completed, evicted=evicted)
+
+    def _close(self, trace: _Trace, expired: bool, evicted: bool = False) -> None:
+        self.traces_closed += 1
+        if expired:
+            self._finding("trace_expired", trace, trace.first_row, None, None, evicted=evicted)
+        if not trace.trace_evidence:
+            for decision_id, (row, event_id, _) in trace.decisions.items():
+                if decision_id not in trace.evidenced:
+                    self._finding("missing_evidence", trace, row, event_id, decision_id)
+
+    def close(self) -> Dict[str, Any]:
+        """Close every trace still open (end of log) and return the summary."""
+        for trace in sorted(self._traces.drain(), key=lambda t: t.first_row):
+            self._close(trace, expired=False)
+        return self.summary()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Open traces and stream position, as plain JSON (for run checkpoints)."""
+        return {
+            "allowed_lateness": self.allowed_lateness,
+            "trace_ttl": self.trace_ttl,
+            "max_open_traces": self.max_open_traces,
+            **self._traces.to_dict(),
+            "open": [
+                {
+                    "key": t.key,
+                    "first_row": t.first_row,
+                    "last_ts": t.last_ts,
+                    "completed": t.completed,
+                    "deadline": _finite(t.deadline),
+                    "decisions": [[decision_id, *decided] for decision_id, decided in t.decisions.items()],
+                    "evidenced": sorted(t.evidenced),
+                    "trace_evidence": t.trace_evidence,
+                }
+                for t in self._traces.values()
+            ],
+            "counts": dict(self.counts),
+            "traces_closed": self.traces_closed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], emit: Callable[[Dict[str, Any]], None]) -> "TraceCorrelator":
+        correlator = cls(emit, float(data["allowed_lateness"]), float(data["trace_ttl"]), int(data["max_open_traces"]))
+        correlator._traces.restore(data)
+        for item in data.get("open") or []:
+            trace = _Trace(item["key"], int(item["first_row"]))
+            trace.last_ts = item["last_ts"]
+            trace.completed = bool(item["completed"])
+            trace.deadline = float("inf") if item["deadline"] is None else float(item["deadline"])
+            trace.decisions = {d[0]: (int(d[1]), d[2], d[3]) for d in item["decisions"]}
+            trace.evidenced = set(item["evidenced"])
+            trace.trace_evidence = bool(item["trace_evidence"])
+            correlator._traces.open[trace.key] = trace
+        correlator.counts.update(data.get("counts") or {})
+        correlator.traces_closed = int(data.get("traces_closed", 0))
+        return correlator
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "findings": dict(self.counts),
+            "traces_closed": self.traces_closed,
+            "peak_open_traces": self.peak_open_traces,
+            "allowed_lateness_s": self.allowed_lateness,
+            "trace_ttl_s": self.trace_ttl,
+        }
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import config as cfg
+from .blob_store import BlobStore
+from .engine_run import RunError, _resolve, enforce_evidence_for_tag, execute_run
+from .utils import generate_run_id, iter_jsonl, read_json
+
+
+class BatchError(Exception):
+    """Raised for invalid batch manifests."""
+
+
+JOB_KEYS = ("config", "events", "ct_config", "drift_config", "run_id", "cohort_id", "edition", "tag")
+
+
+def load_batch_manifest(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        raise BatchError(f"batch manifest not found: {path}")
+    if path.suffix == ".jsonl":
+        jobs = list(iter_jsonl(path))
+    else:
+        data = read_json(path)
+        jobs = data.get("jobs", []) if isinstance(data, dict) else data
+    seen = set()
+    for idx, job in enumerate(jobs):
+        if not isinstance(job, dict) or not job.get("config") or not job.get("events"):
+            raise BatchError(f"job {idx+1}: 'config' and 'events' are required")
+        unknown = set(job) - set(JOB_KEYS)
+        if unknown:
+            raise BatchError(f"job {idx+1}: unknown keys {sorted(unknown)}")
+        run_id = job.get("run_id")
+        if run_id in seen:
+            raise BatchError(f"job {idx+1}: duplicate run_id {run_id}")
+        if run_id:
+            seen.add(run_id)
+    return jobs
+
+
+def _run_job(job: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    config_root = Path(options["config_root"])
+    try:
+        run_id, run_dir = execute_run(
+            run_id=job["run_id"],
+            out_dir=Path(options["out_dir"]),
+            config_path=_resolve(job["config"], config_root),
+            events_path=_resolve(job["events"], config_root),
+            ct_config_path=_resolve(job["ct_config"], config_root) if job.get("ct_config") else None,
+            drift_config_path=_resolve(job["drift_config"], config_root) if job.get("drift_config") else None,
+            schemas_root=Path(options["schemas_root"]),
+            cohort_id=job.get("cohort_id"),
+            edition=job.get("edition"),
+            tag=job.get("tag"),
+            no_bundle=options["no_bundle"],
+            dry_run=options["dry_run"],
+            enforce_evidence_refs=enforce_evidence_for_tag(job.get("tag")),
+            stream=options["stream"],
+            blob_store=BlobStore(Path(options["blob_store"])) if options["blob_store"] else None,
+            bundle_compression=options["bundle_compression"],
+            bundle_workers=options["bundle_workers"],
+            columnar=options["columnar"],
+            merkle=options["merkle"],
+        )
+        return {"run_id": run_id, "run_dir": str(run_dir), "status": "SUCCESS" if not options["dry_run"] else "DRY_RUN"}
+    except RunError as exc:
+        return {"run_id": job["run_id"], "status": "ERROR", "error": str(exc)}
+    except Exception as exc:  # unexpected; keep the rest of the batch going
+        return {"run_id": job["run_id"], "status": "ERROR", "error": f"{type(exc).__name__}: {exc}"}
+
+
+def execute_batch(
+    jobs: List[Dict[str, Any]],
+    *,
+    out_dir: Path,
+    config_root: Path,
+    schemas_root: Path,
+    workers: Optional[int] = None,
+    no_bundle: bool = False,
+    dry_run: bool = False,
+    stream: bool = False,
+    blob_store: bool = False,
+    bundle_compression: Optional[str] = None,
+    columnar: bool = False,
+    merkle: bool = False,
+) -> List[Dict[str, Any]]:
+    # run ids are assigned up front so parallel jobs never collide on a generated id
+    prefix = generate_run_id(cfg.DEFAULT_RUN_ID_PREFIX)
+    jobs = [dict(job, run_id=job.get("run_id") or f"{prefix}_{idx+1:04d}") for idx, job in enumerate(jobs)]
+    options = {
+        "out_dir": str(out_dir),
+        "config_root": str(config_root),
+        "schemas_root": str(schemas_root),
+        "no_bundle": no_bundle,
+        "dry_run": dry_run,
+        "stream": stream,
+        "blob_store": str(BlobStore.for_run_root(out_dir).root) if blob_store else None,
+        "bundle_compression": bundle_compression,
+        "columnar": columnar,
+        "merkle": merkle,
+    }
+    workers = workers or os.cpu_count() or 1
+    # parallel jobs already fill the cores: one bundle compression thread each
+    options["bundle_workers"] = None if workers == 1 or len(jobs) <= 1 else 1
+    if workers == 1 or len(jobs) <= 1:
+        return [_run_job(job, options) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(_run_job, jobs, [options] * len(jobs)))
+
+
+def run_batch_command(args) -> int:
+    try:
+        jobs = load_batch_manifest(Path(args.manifest))
+        results = execute_batch(
+            jobs,
+            out_dir=Path(args.out_dir),
+            config_root=Path(args.config_root),
+            schemas_root=Path(args.schemas_root),
+            workers=args.workers,
+            no_bundle=args.no_bundle,
+            dry_run=args.dry_run,
+            stream=args.stream,
+            blob_store=args.blob_store or cfg.BLOB_STORE,
+            bundle_compression=args.bundle_compression,
+            columnar=args.columnar or cfg.COLUMNAR,
+            merkle=args.merkle or cfg.MERKLE,
+        )
+    except BatchError as exc:
+        print(json.dumps({"status": "ERROR", "error": str(exc)}))
+        return 2
+    except Exception as exc:  # unexpected
+        print(json.dumps({"status": "ERROR", "error": str(exc)}))
+        return 2
+
+    failed = [r for r in results if r["status"] == "ERROR"]
+    summary = {
+        "status": "SUCCESS" if not failed else ("ERROR" if len(failed) == len(results) else "PARTIAL"),
+        "total": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "runs": results,
+    }
+    print(json.dumps(summary))
+    return 0 if not failed else 1
@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 
-from .engine_run import execute_run
+from .blob_store import BlobStore
+from .engine_run import _derive_rows, enforce_evidence_for_tag, execute_run
+from .line_index import LineIndex, build_line_index
 from .models import RunManifest
+from .replay_diff import diff_fields, diff_run_outputs
+from .rules import plan_for_config
+from .shards import iter_jsonl_offsets
+from .trace_index import TRACE_INDEX_FILENAME, decision_trace_events
 from .utils import ensure_dir, read_json, sha256_file, write_json
 
 
@@ -17,6 +23,74 @@ def _default_manifest_path(run_id: str, out_dir: Path) -> Path:
     return out_dir / run_id / "run_manifest.json"
 
 
+def _resolve_in(base_dir: Path, path_str: str) -> Path:
+    path = Path(path_str)
+    return path if path.is_absolute() else (base_dir / path).resolve()
+
+
+def _read_event(fh, offset: int) -> Dict[str, Any]:
+    fh.seek(offset)
+    line = fh.readline().decode("utf-8").strip()
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return {"raw": line}
+
+
+def _decision_events(run_dir: Path, events_path: Path, decision_id: str) -> Tuple[List[Tuple[int, int]], bool]:
+    trace_index = run_dir / TRACE_INDEX_FILENAME
+    if trace_index.exists():
+        return decision_trace_events(trace_index, decision_id), True
+    # runs written before the trace index existed: one sequential scan of the event log
+    rows: List[Tuple[int, int]] = []
+    trace_ids = set()
+    keyed = []
+    for idx, (offset, evt) in enumerate(iter_jsonl_offsets(events_path)):
+        if evt.get("trace_id") or evt.get("decision_id"):
+            keyed.append((idx, offset, evt.get("trace_id"), evt.get("decision_id")))
+            if evt.get("decision_id") == decision_id and evt.get("trace_id"):
+                trace_ids.add(evt.get("trace_id"))
+    for idx, offset, trace_id, dec_id in keyed:
+        if dec_id == decision_id or (trace_id is not None and trace_id in trace_ids):
+            rows.append((idx, offset))
+    return rows, False
+
+
+def replay_decision(manifest: RunManifest, run_dir: Path, decision_id: str) -> Dict[str, Any]:
+    """Re-derive only the events in ``decision_id``'s trace and compare with the recorded decision_log rows."""
+    events_path = _resolve_in(run_dir, manifest.events["path"])
+    decision_log_path = _resolve_in(run_dir, manifest.artifacts.get("decision_log", "decision_log.jsonl"))
+    targets, indexed = _decision_events(run_dir, events_path, decision_id)
+    if not targets:
+        raise ReplayError(f"decision_id not found in run {manifest.run_id}: {decision_id}")
+    decisions = LineIndex.open(decision_log_path) or build_line_index(decision_log_path)
+    enforce = enforce_evidence_for_tag(manifest.tag)
+    plan = plan_for_config(_resolve_in(run_dir, manifest.config["path"]))
+
+    mismatches: List[Dict[str, Any]] = []
+    with events_path.open("rb") as fh:
+        for row, offset in targets:
+            evt = _read_event(fh, offset)
+            replayed, _ = next(_derive_rows(manifest.run_id, [evt], enforce, start_index=row, plan=plan))
+            recorded_line = next(decisions.iter_rows(row), (row, None))[1]
+            if recorded_line is None:
+                mismatches.append({"row": row, "event_id": replayed["event_id"], "reason": "missing_decision_row"})
+                continue
+            recorded = json.loads(recorded_line)
+            fields = diff_fields(recorded, replayed)
+            if fields:
+                mismatches.append({"row": row, "event_id": replayed["event_id"], "fields": fields})
+    return {
+        "run_id": manifest.run_id,
+        "decision_id": decision_id,
+        "status": "OK" if not mismatches else "REPLAY_MISMATCH",
+        "events": len(targets),
+        "rows": [row for row, _ in targets],
+        "indexed": indexed,
+        "mismatches": mismatches,
+    }
+
+
 def replay_command(args) -> int:
     manifest_path = Path(args.manifest) if args.manifest else _default_manifest_path(args.run_id, Path(args.out_dir))
     if not manifest_path.exists():
@@ -24,6 +98,13 @@ def replay_command(args) -> int:
         return 2
     try:
         manifest = RunManifest.from_dict(read_json(manifest_path))
+        if args.decision_id:
+            summary = replay_decision(manifest, manifest_path.parent, args.decision_id)
+            if not args.dry_run:
+                replay_dir = ensure_dir(manifest_path.parent / "replay")
+                write_json(replay_dir / f"decision_{args.decision_id}.json", summary)
+            print(json.dumps(summary))
+            return 0 if summary["status"] == "OK" else 1
         base_dir = manifest_path.parent
         replay_dir = ensure_dir(base_dir / "replay")
         replay_run_id = f"{manifest.run_id}_replay"
@@ -46,6 +127,19 @@ def replay_command(args) -> int:
             if not drift_resolved.is_absolute():
                 drift_resolved = (base_dir / drift_resolved).resolve()
 
+        # inputs linked from the run root's blob store are reused by digest, not re-read
+        blob_store = BlobStore.for_run_root(base_dir.parent)
+        input_digests = {
+            str(path): ref["sha256"]
+            for path, ref in (
+                (original_config, manifest.config),
+                (original_events, manifest.events),
+                (ct_resolved, manifest.ct_config),
+                (drift_resolved, manifest.drift_config),
+            )
+            if path and ref and ref.get("sha256")
+        }
+
         new_run_id, new_run_dir = execute_run(
             run_id=replay_run_id,
             out_dir=replay_dir,
@@ -59,13 +153,23 @@ def replay_command(args) -> int:
             dry_run=args.dry_run,
             ct_config_path=ct_resolved,
             drift_config_path=drift_resolved,
+            update_index=False,
+            blob_store=blob_store if blob_store.exists() else None,
+            input_digests=input_digests,
         )
 
+        # always re-hash the inputs: a store-linked input is identified by the manifest
+        # digest, and a blob edited in place through its link still carries that digest
         mismatches: List[str] = []
-        if manifest.config.get("sha256") and manifest.config["sha256"] != sha256_file(original_config):
-            mismatches.append("config_sha_mismatch")
-        if manifest.events.get("sha256") and manifest.events["sha256"] != sha256_file(original_events):
-            mismatches.append("events_sha_mismatch")
+        for label, ref, path in (("config", manifest.config, original_config), ("events", manifest.events, original_events)):
+            if ref.get("sha256") and ref["sha256"] != sha256_file(path):
+                mismatches.append(f"{label}_sha_mismatch")
+
+        output_diff = None
+        if not args.dry_run:
+            output_diff = diff_run_outputs(base_dir, new_run_dir, max_divergences=args.max_divergences)
+            if output_diff["status"] != "MATCH":
+                mismatches.append("outputs_diverged")
 
         summary = {
             "run_id": new_run_id,
@@ -73,7 +177,10 @@ def replay_command(args) -> int:
             "status": "OK" if not mismatches else "REPLAY_MISMATCH",
             "mismatches": mismatches,
         }
-        write_json(new_run_dir / "verify_report.json", {"run_id": new_run_id, "overall_status": summary["status"], "checks": mismatches})
+        report = {"run_id": new_run_id, "overall_status": summary["status"], "checks": mismatches}
+        if output_diff is not None:
+            report["diff"] = output_diff
+        write_json(new_run_dir / "verify_report.json", report)
         print(json.dumps(summary))
         return 0 if not mismatches else 1
     except Exception as exc:
@@ -1,19 +1,34 @@
 from __future__ import annotations
 
 import json
-import shutil
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-import zipfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from . import config as cfg
+from .blob_store import BlobStore
+from .bundle import BundleError, build_bundle, parse_compression_spec
+from .checkpoint import CHECKPOINT_FILENAME, CHECKPOINT_SCHEMA_VERSION, Progress, read_checkpoint, write_checkpoint
+from .correlator import FINDINGS_FILENAME, CorrelationRecord, TraceCorrelator, correlation_record
+from .columnar import ColumnarWriter, ColumnChunk, ColumnChunkBuilder, build_columnar, columns_path_for
+from .line_index import LineIndexWriter, index_path_for
+from .merkle import build_merkle, merkle_path_for, merkle_ref
 from .models import ArtifactRef, ProofManifest, RunManifest
+from .rules import EvaluationPlan, RuleError, VerdictAccumulator, compile_checks, plan_for_config
+from .run_index import upsert_run
+from .sketch import SKETCH_FILENAME, SketchAccumulator, write_sketches
+from .shards import count_rows, iter_jsonl_offsets, iter_jsonl_spans, split_byte_ranges
+from .trace_index import TRACE_INDEX_FILENAME, TraceIndexWriter, TraceKey
 from .utils import (
+    HashingWriter,
+    copy_and_hash,
     ensure_dir,
     generate_run_id,
     get_git_commit,
     now_utc_iso,
-    read_jsonl,
     sha256_file,
     validate_json,
     write_json,
@@ -31,21 +46,252 @@ def _resolve(path_str: str, root: Path) -> Path:
     return root / path
 
 
-def _build_govdec(run_id: str, verdict: str, witness_exists: bool, failed_axis: Optional[str]) -> Dict[str, Any]:
+def enforce_evidence_for_tag(tag: Optional[str]) -> bool:
+    return bool(tag and "advisory" in tag.lower())
+
+
+def _build_govdec(run_id: str, verdict: VerdictAccumulator) -> Dict[str, Any]:
     return {
         "schema_version": "1.0",
         "run_id": run_id,
         "decision_id": f"dec-{run_id}",
         "timestamp": now_utc_iso(),
-        "verdict": verdict,
-        "witness_path": {"exists": witness_exists, "failed_axis": failed_axis},
+        "verdict": verdict.verdict,
+        "witness_path": {"exists": not verdict.failed, "failed_axis": verdict.failed_axis},
+        "decisions": verdict.summary(),
     }
 
 
-def _write_jsonl(path: Path, rows: List[Dict[str, Any]]) -> None:
-    with path.open("w", encoding="utf-8") as fh:
+def _write_jsonl(path: Path, rows: Iterable[Dict[str, Any]], line_index: Optional[LineIndexWriter] = None) -> str:
+    with HashingWriter(path, line_index) as fh:
         for row in rows:
             fh.write(json.dumps(row) + "\n")
+    return fh.digest()
+
+
+def _derive_rows(
+    run_id: str,
+    events: Iterable[Dict[str, Any]],
+    enforce_evidence_refs: bool = False,
+    start_index: int = 0,
+    plan: Optional[EvaluationPlan] = None,
+    verdict: Optional[VerdictAccumulator] = None,
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    evaluate = (plan or compile_checks(None)).evaluate
+    for idx, evt in enumerate(events, start=start_index):
+        event_id = evt.get("event_id") or evt.get("id") or f"event-{idx+1}"
+        evidence_refs = evt.get("evidence_refs") or evt.get("evidence_ref")
+        if enforce_evidence_refs and (not evidence_refs):
+            raise RunError(f"missing evidence_refs for event {event_id} (CHG-TEAM-A-003 enforcement)")
+        failed_axis, check_id = evaluate(evt)
+        if verdict is not None:
+            verdict.add(idx, failed_axis)
+        witness_path: Dict[str, Any] = {"exists": failed_axis is None, "failed_axis": failed_axis}
+        if check_id is not None:
+            witness_path["check_id"] = check_id
+        decision = {
+            "run_id": run_id,
+            "event_id": event_id,
+            "decision": "PASS" if failed_axis is None else "FAIL",
+            "timestamp": now_utc_iso(),
+            "witness_path": witness_path,
+            "evidence_refs": evidence_refs or [],
+        }
+        trigger = {
+            "run_id": run_id,
+            "event_id": event_id,
+            "trigger": "ACT" if failed_axis is None else "HOLD",
+            "timestamp": decision["timestamp"],
+            "axis": "AETC" if failed_axis is None else failed_axis,
+        }
+        yield decision, trigger
+
+
+def _trace_keyed(
+    events: Iterable[Tuple[int, Dict[str, Any]]], start_index: int, record: Callable[[TraceKey], None]
+) -> Iterator[Dict[str, Any]]:
+    # reports (row, offset, trace_id, decision_id) for correlated events on their way to _derive_rows
+    for idx, (offset, evt) in enumerate(events, start=start_index):
+        trace_id = evt.get("trace_id")
+        decision_id = evt.get("decision_id")
+        if trace_id or decision_id:
+            record((idx, offset, trace_id, decision_id))
+        yield evt
+
+
+def _correlate(
+    events: Iterable[Dict[str, Any]], start_index: int, add: Callable[[CorrelationRecord], None]
+) -> Iterator[Dict[str, Any]]:
+    # reduces each trace-correlated event to a CorrelationRecord on its way to _derive_rows
+    for idx, evt in enumerate(events, start=start_index):
+        rec = correlation_record(idx, evt)
+        if rec is not None:
+            add(rec)
+        yield evt
+
+
+def _observe(events: Iterable[Dict[str, Any]], add: Callable[[Dict[str, Any]], None]) -> Iterator[Dict[str, Any]]:
+    # feeds each event to the SLI sketches on its way to _derive_rows
+    for evt in events:
+        add(evt)
+        yield evt
+
+
+def _tee_decisions(
+    rows: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]], add: Optional[Callable[[Dict[str, Any]], None]]
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    # feeds each decision to the columnar sidecar on its way to serialization
+    if add is None:
+        yield from rows
+        return
+    for decision, trigger in rows:
+        add(decision)
+        yield decision, trigger
+
+
+def _serialize_rows(rows: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]]) -> Iterator[Tuple[str, str]]:
+    for decision, trigger in rows:
+        yield json.dumps(decision) + "\n", json.dumps(trigger) + "\n"
+
+
+def _stream_lines(
+    lines: Iterable[Tuple[str, str]],
+    dec_fh: HashingWriter,
+    trg_fh: HashingWriter,
+    checkpoint: Optional[Callable[[], None]] = None,
+    checkpoint_interval: float = 0.0,
+) -> Tuple[str, str]:
+    with dec_fh, trg_fh:
+        next_checkpoint = time.monotonic() + checkpoint_interval
+        for decision_line, trigger_line in lines:
+            dec_fh.write(decision_line)
+            trg_fh.write(trigger_line)
+            if checkpoint is not None and time.monotonic() >= next_checkpoint:
+                checkpoint()
+                next_checkpoint = time.monotonic() + checkpoint_interval
+    return dec_fh.digest(), trg_fh.digest()
+
+
+def _track(spans: Iterable[Tuple[int, int, Dict[str, Any]]], progress: Progress) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    # the stages downstream are lazy and 1:1, so when a row has been written its event is
+    # the last one pulled from here and progress points just past it
+    for offset, next_offset, evt in spans:
+        progress.offset = next_offset
+        progress.row += 1
+        yield offset, evt
+
+
+def _place_input(src: Path, dst: Path, blob_store: Optional[BlobStore], input_digests: Optional[Dict[str, str]]) -> str:
+    if blob_store is None:
+        # dst may be a hardlink into the blob store from an earlier run with this
+        # run_id; unlink rather than truncate so the shared blob is never rewritten
+        dst.unlink(missing_ok=True)
+        return copy_and_hash(src, dst)
+    return blob_store.store_into(src, dst, known_digest=(input_digests or {}).get(str(src)))
+
+
+def _count_shard(path: str, start: int, end: int) -> int:
+    return count_rows(Path(path), start, end)
+
+
+def _derive_shard(
+    run_id: str,
+    path: str,
+    start: int,
+    end: int,
+    start_index: int,
+    enforce_evidence_refs: bool,
+    config_path: str,
+    columnar: bool = False,
+) -> Tuple[str, str, List[TraceKey], Optional[ColumnChunk], SketchAccumulator, VerdictAccumulator, List[CorrelationRecord]]:
+    trace_keys: List[TraceKey] = []
+    correlations: List[CorrelationRecord] = []
+    slis = SketchAccumulator(defer_lags=True)  # lags are joined in the parent, across shards
+    verdict = VerdictAccumulator()
+    plan = plan_for_config(Path(config_path))  # compiled once per worker process
+    events = _trace_keyed(iter_jsonl_offsets(Path(path), start, end), start_index, trace_keys.append)
+    events = _observe(_correlate(events, start_index, correlations.append), slis.add)
+    columns = ColumnChunkBuilder() if columnar else None
+    rows = _tee_decisions(
+        _derive_rows(run_id, events, enforce_evidence_refs, start_index, plan, verdict),
+        columns.add if columns is not None else None,
+    )
+    decision_lines: List[str] = []
+    trigger_lines: List[str] = []
+    for decision_line, trigger_line in _serialize_rows(rows):
+        decision_lines.append(decision_line)
+        trigger_lines.append(trigger_line)
+    # one joined chunk per shard keeps pickling and the parent-side merge cheap
+    slis.flush()
+    return "".join(decision_lines), "".join(trigger_lines), trace_keys, columns.build() if columns is not None else None, slis, verdict, correlations
+
+
+def _derive_sharded(
+    run_id: str,
+    events_path: Path,
+    workers: int,
+    enforce_evidence_refs: bool,
+    config_path: Path,
+    record_many: Callable[[List[TraceKey]], None],
+    add_verdict: Callable[[VerdictAccumulator], None],
+    add_correlations: Callable[[List[CorrelationRecord]], None],
+    add_columns: Optional[Callable[[ColumnChunk], None]] = None,
+    add_slis: Optional[Callable[[SketchAccumulator], None]] = None,
+    progress: Optional[Progress] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Derive serialized rows on a process pool, yielding per-shard chunks in original event order.
+
+    Shards are newline-aligned byte ranges. A first pass counts rows per shard so each
+    shard knows its global event index (fallback event ids depend on it); at most
+    ``2 * workers`` derived shards are held in memory at a time. Work starts at
+    ``progress`` and advances it past each merged shard.
+    """
+    progress = progress or Progress()
+    ranges = split_byte_ranges(events_path, workers * 4, start=progress.offset)
+    if not ranges:
+        return
+    path = str(events_path)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        counts = list(pool.map(_count_shard, [path] * len(ranges), [r[0] for r in ranges], [r[1] for r in ranges]))
+        bases = [progress.row + sum(counts[:i]) for i in range(len(counts))]
+        pending: deque = deque()
+
+        def merge_next() -> Tuple[str, str]:
+            future, end, count = pending.popleft()
+            chunk = _merge_shard(future.result(), record_many, add_verdict, add_correlations, add_columns, add_slis)
+            progress.offset = end
+            progress.row += count
+            return chunk
+
+        for (start, end), base, count in zip(ranges, bases, counts):
+            future = pool.submit(
+                _derive_shard, run_id, path, start, end, base, enforce_evidence_refs, str(config_path), add_columns is not None
+            )
+            pending.append((future, end, count))
+            if len(pending) >= workers * 2:
+                yield merge_next()
+        while pending:
+            yield merge_next()
+
+
+def _merge_shard(
+    result: Tuple[str, str, List[TraceKey], Optional[ColumnChunk], SketchAccumulator, VerdictAccumulator, List[CorrelationRecord]],
+    record_many: Callable[[List[TraceKey]], None],
+    add_verdict: Callable[[VerdictAccumulator], None],
+    add_correlations: Callable[[List[CorrelationRecord]], None],
+    add_columns: Optional[Callable[[ColumnChunk], None]],
+    add_slis: Optional[Callable[[SketchAccumulator], None]],
+) -> Tuple[str, str]:
+    decision_chunk, trigger_chunk, trace_keys, columns, slis, verdict, correlations = result
+    record_many(trace_keys)
+    add_verdict(verdict)
+    # shards arrive in event order, so the correlator sees one continuous stream
+    add_correlations(correlations)
+    if add_columns and columns is not None:
+        add_columns(columns)
+    if add_slis:
+        add_slis(slis)
+    return decision_chunk, trigger_chunk
 
 
 def execute_run(
@@ -63,67 +309,89 @@ def execute_run(
     no_bundle: bool = False,
     dry_run: bool = False,
     enforce_evidence_refs: bool = False,
+    stream: bool = False,
+    workers: int = 1,
+    update_index: bool = True,
+    blob_store: Optional[BlobStore] = None,
+    input_digests: Optional[Dict[str, str]] = None,
+    bundle_compression: Optional[str] = None,
+    bundle_workers: Optional[int] = None,
+    columnar: bool = False,
+    resume: bool = False,
+    checkpoint_interval: Optional[float] = None,
+    merkle: bool = False,
 ) -> Tuple[str, Path]:
+    if resume and (not run_id or dry_run):
+        raise RunError("--resume needs --run-id and cannot be combined with --dry-run")
     if not config_path.exists():
         raise RunError(f"config not found: {config_path}")
+    try:
+        plan = plan_for_config(config_path)
+    except RuleError as exc:
+        raise RunError(str(exc)) from exc
+    try:
+        bundle_policy = parse_compression_spec(bundle_compression or cfg.BUNDLE_COMPRESSION) if not no_bundle else None
+    except BundleError as exc:
+        raise RunError(str(exc)) from exc
     if not events_path.exists():
         raise RunError(f"events not found: {events_path}")
     run_id = run_id or generate_run_id(cfg.DEFAULT_RUN_ID_PREFIX)
     run_dir = out_dir / run_id
+    checkpoint_path = run_dir / CHECKPOINT_FILENAME
+    resumed = read_checkpoint(checkpoint_path) if resume else None
+    if resume and resumed is None and (run_dir / "verify_report.json").exists():
+        # the run finished (and dropped its checkpoint) before it could be interrupted
+        return run_id, run_dir
+    if resumed is not None and resumed[0].get("schema_version") != CHECKPOINT_SCHEMA_VERSION:
+        raise RunError(f"{checkpoint_path} was written by another osctl version; rerun without --resume")
+    if resumed is not None and resumed[0].get("enforce_evidence_refs") != enforce_evidence_refs:
+        raise RunError(f"{checkpoint_path} was written with different run options; rerun without --resume")
     if not dry_run:
         ensure_dir(run_dir)
 
-    # copy inputs
-    if not dry_run:
+    # copy inputs (or link them from the blob store), hashing each one in the same
+    # pass; the copy and the source share bytes, so a single digest serves both the
+    # manifest and meta.sources
+    ct_copy = None
+    drift_copy = None
+    ct_sha = None
+    drift_sha = None
+    if resumed is not None:
+        # keep the copies the checkpoint was derived from; they must still be intact
+        inputs = resumed[0]["inputs"]
+        for label, src in (("events", events_path), ("config", config_path), ("ct_config", ct_config_path), ("drift_config", drift_config_path)):
+            ref = inputs.get(label)
+            if (ref is None) != (src is None) or (ref and sha256_file(run_dir / ref["path"]) != ref["sha256"]):
+                raise RunError(f"{label} of {run_id} changed since it was interrupted; rerun without --resume")
+        events_copy, events_sha = run_dir / inputs["events"]["path"], inputs["events"]["sha256"]
+        config_copy, config_sha = run_dir / inputs["config"]["path"], inputs["config"]["sha256"]
+        if ct_config_path:
+            ct_copy, ct_sha = run_dir / inputs["ct_config"]["path"], inputs["ct_config"]["sha256"]
+        if drift_config_path:
+            drift_copy, drift_sha = run_dir / inputs["drift_config"]["path"], inputs["drift_config"]["sha256"]
+    elif not dry_run:
+        checkpoint_path.unlink(missing_ok=True)
         events_copy = run_dir / "event_log.jsonl"
-        shutil.copy2(events_path, events_copy)
+        events_sha = _place_input(events_path, events_copy, blob_store, input_digests)
         config_copy = run_dir / Path(config_path).name
-        shutil.copy2(config_path, config_copy)
-        ct_copy = None
-        drift_copy = None
+        config_sha = _place_input(config_path, config_copy, blob_store, input_digests)
         if ct_config_path:
             ct_copy = run_dir / Path(ct_config_path).name
-            shutil.copy2(ct_config_path, ct_copy)
+            ct_sha = _place_input(ct_config_path, ct_copy, blob_store, input_digests)
         if drift_config_path:
             drift_copy = run_dir / Path(drift_config_path).name
-            shutil.copy2(drift_config_path, drift_copy)
+            drift_sha = _place_input(drift_config_path, drift_copy, blob_store, input_digests)
     else:
         events_copy = events_path
         config_copy = config_path
         ct_copy = ct_config_path
         drift_copy = drift_config_path
+        events_sha = sha256_file(events_path)
+        config_sha = sha256_file(config_path)
+        ct_sha = sha256_file(ct_config_path) if ct_config_path else None
+        drift_sha = sha256_file(drift_config_path) if drift_config_path else None
 
     # derive govdec/decision/trigger rows
-    events_data = read_jsonl(events_copy if events_copy.exists() else events_path)
-    decisions: List[Dict[str, Any]] = []
-    triggers: List[Dict[str, Any]] = []
-    for idx, evt in enumerate(events_data):
-        event_id = evt.get("event_id") or evt.get("id") or f"event-{idx+1}"
-        evidence_refs = evt.get("evidence_refs") or evt.get("evidence_ref")
-        if enforce_evidence_refs and (not evidence_refs):
-            raise RunError(f"missing evidence_refs for event {event_id} (CHG-TEAM-A-003 enforcement)")
-        decision = {
-            "run_id": run_id,
-            "event_id": event_id,
-            "decision": "PASS",
-            "timestamp": now_utc_iso(),
-            "witness_path": {"exists": True, "failed_axis": None},
-            "evidence_refs": evidence_refs or [],
-        }
-        decisions.append(decision)
-        triggers.append(
-            {
-                "run_id": run_id,
-                "event_id": event_id,
-                "trigger": "ACT",
-                "timestamp": decision["timestamp"],
-                "axis": "AETC",
-            }
-        )
-
-    govdec = _build_govdec(run_id, "PASS", True, None)
-
-    # write outputs
     govdec_path = run_dir / "govdec.json"
     decision_log_path = run_dir / "decision_log.jsonl"
     trigger_events_path = run_dir / "trigger_events.jsonl"
@@ -131,10 +399,133 @@ def execute_run(
     proof_manifest_path = run_dir / "proof_manifest.json"
     verify_report_path = run_dir / "verify_report.json"
 
+    events_source = events_copy if events_copy.exists() else events_path
+    trace_findings_path = run_dir / FINDINGS_FILENAME
+    progress = Progress()
+    dec_fh: Optional[HashingWriter] = None
+    trg_fh: Optional[HashingWriter] = None
+    if resumed is not None:
+        # reopen every appended artifact at the checkpoint; later bytes are discarded
+        meta, state = resumed
+        progress = Progress(meta["progress"]["offset"], meta["progress"]["row"])
+        sizes = meta["sizes"]
+        try:
+            trace_index: Optional[TraceIndexWriter] = TraceIndexWriter(run_dir / TRACE_INDEX_FILENAME, resume_rows=progress.row)
+        except sqlite3.DatabaseError as exc:
+            raise RunError(f"trace index of {run_id} is damaged ({exc}); rerun without --resume") from exc
+        dec_index = LineIndexWriter.resume(index_path_for(decision_log_path), progress.row, sizes["decision_log"])
+        dec_fh = HashingWriter.resume(decision_log_path, sizes["decision_log"], dec_index)
+        trg_fh = HashingWriter.resume(trigger_events_path, sizes["trigger_events"])
+        findings: Optional[HashingWriter] = HashingWriter.resume(trace_findings_path, sizes["trace_findings"])
+        slis = SketchAccumulator.from_dict(state["slis"])
+        verdict = VerdictAccumulator.from_dict(state["verdict"])
+        correlator = TraceCorrelator.from_dict(state["correlator"], lambda finding: None)
+        # a columnar sidecar cannot be reopened mid-block; it is rebuilt from the finished log
+        columns = None
+    else:
+        trace_index = TraceIndexWriter(run_dir / TRACE_INDEX_FILENAME) if not dry_run else None
+        findings = HashingWriter(trace_findings_path) if not dry_run else None
+        slis = SketchAccumulator(allowed_lateness=cfg.TRACE_ALLOWED_LATENESS_S, trace_ttl=cfg.TRACE_TTL_S)
+        verdict = VerdictAccumulator()
+        correlator = TraceCorrelator(lambda finding: None, allowed_lateness=cfg.TRACE_ALLOWED_LATENESS_S, trace_ttl=cfg.TRACE_TTL_S)
+        columns = ColumnarWriter(columns_path_for(decision_log_path)) if columnar and not dry_run else None
+    if findings is not None:
+        correlator.emit = lambda finding: findings.write(json.dumps({"run_id": run_id, **finding}) + "\n")
+    record = trace_index.add if trace_index else (lambda key: None)
+    record_many = trace_index.add_many if trace_index else (lambda keys: None)
+    add_column_row = columns.add if columns else None
+    if checkpoint_interval is None:
+        checkpoint_interval = cfg.CHECKPOINT_INTERVAL_S
+
+    def save_checkpoint() -> None:
+        # make every output durable up to ``progress`` before recording it
+        assert dec_fh and trg_fh and findings and trace_index
+        dec_fh.sync()
+        if dec_fh.line_index is not None:
+            dec_fh.line_index.sync()
+        trg_fh.sync()
+        findings.sync()
+        trace_index.checkpoint()
+        copies = (("events", events_copy, events_sha), ("config", config_copy, config_sha), ("ct_config", ct_copy, ct_sha), ("drift_config", drift_copy, drift_sha))
+        write_checkpoint(
+            checkpoint_path,
+            {
+                "run_id": run_id,
+                "enforce_evidence_refs": enforce_evidence_refs,
+                "inputs": {label: {"path": copy.name, "sha256": sha} for label, copy, sha in copies if copy},
+                "progress": {"offset": progress.offset, "row": progress.row},
+                "sizes": {
+                    "decision_log": dec_fh.bytes_written,
+                    "trigger_events": trg_fh.bytes_written,
+                    "trace_findings": findings.bytes_written,
+                },
+            },
+            {"slis": slis.to_dict(), "verdict": verdict.to_dict(), "correlator": correlator.to_dict()},
+        )
+
+    try:
+        if stream or workers > 1 or resumed is not None:
+            # rows hit disk as they are derived: lazily on one core (constant memory) or
+            # per byte-range shard on a process pool, merged back in event order; both
+            # record ``progress`` so the run can be checkpointed and resumed
+            if workers > 1:
+                lines = _derive_sharded(
+                    run_id,
+                    events_source,
+                    workers,
+                    enforce_evidence_refs,
+                    config_copy,
+                    record_many,
+                    verdict.merge,
+                    correlator.add_many,
+                    columns.add_chunk if columns else None,
+                    slis.merge,
+                    progress,
+                )
+            else:
+                start = progress.row
+                events = _trace_keyed(_track(iter_jsonl_spans(events_source, progress.offset), progress), start, record)
+                events = _observe(_correlate(events, start, correlator.add), slis.add)
+                lines = _serialize_rows(
+                    _tee_decisions(_derive_rows(run_id, events, enforce_evidence_refs, start, plan, verdict), add_column_row)
+                )
+            if dry_run:
+                for _ in lines:
+                    pass
+            else:
+                if dec_fh is None or trg_fh is None:
+                    dec_fh = HashingWriter(decision_log_path, LineIndexWriter(index_path_for(decision_log_path)))
+                    trg_fh = HashingWriter(trigger_events_path)
+                decision_log_sha, trigger_events_sha = _stream_lines(
+                    lines, dec_fh, trg_fh, save_checkpoint if checkpoint_interval > 0 else None, checkpoint_interval
+                )
+        else:
+            decisions: List[Dict[str, Any]] = []
+            triggers: List[Dict[str, Any]] = []
+            events = _observe(_correlate(_trace_keyed(iter_jsonl_offsets(events_source), 0, record), 0, correlator.add), slis.add)
+            derived = _derive_rows(run_id, events, enforce_evidence_refs, plan=plan, verdict=verdict)
+            for decision, trigger in _tee_decisions(derived, add_column_row):
+                decisions.append(decision)
+                triggers.append(trigger)
+            if not dry_run:
+                decision_log_sha = _write_jsonl(decision_log_path, decisions, LineIndexWriter(index_path_for(decision_log_path)))
+                trigger_events_sha = _write_jsonl(trigger_events_path, triggers)
+        correlation_summary = correlator.close()
+    finally:
+        if trace_index:
+            trace_index.close()
+        if findings:
+            findings.close()
+    if columns is not None:
+        columns.close(source_size=decision_log_path.stat().st_size)
+    elif columnar and resumed is not None:
+        build_columnar(decision_log_path)
+
+    govdec = _build_govdec(run_id, verdict)
+
+    # write outputs
     if not dry_run:
-        write_json(govdec_path, govdec)
-        _write_jsonl(decision_log_path, decisions)
-        _write_jsonl(trigger_events_path, triggers)
+        govdec_sha = write_json(govdec_path, govdec)
 
     git_commit = get_git_commit()
     manifest = RunManifest(
@@ -142,14 +533,14 @@ def execute_run(
         created_at=now_utc_iso(),
         config={
             "path": str(config_copy.relative_to(run_dir) if not dry_run else config_copy),
-            "sha256": sha256_file(config_copy),
+            "sha256": config_sha,
         },
         events={
             "path": str(events_copy.relative_to(run_dir) if not dry_run else events_copy),
-            "sha256": sha256_file(events_copy),
+            "sha256": events_sha,
         },
-        ct_config={"path": str(ct_copy.relative_to(run_dir)), "sha256": sha256_file(ct_copy)} if ct_copy else None,
-        drift_config={"path": str(drift_copy.relative_to(run_dir)), "sha256": sha256_file(drift_copy)} if drift_copy else None,
+        ct_config={"path": str(ct_copy.relative_to(run_dir)), "sha256": ct_sha} if ct_copy else None,
+        drift_config={"path": str(drift_copy.relative_to(run_dir)), "sha256": drift_sha} if drift_copy else None,
         cohort_id=cohort_id,
         edition=edition,
         tag=tag,
@@ -159,16 +550,21 @@ def execute_run(
             "govdec": str(govdec_path.relative_to(run_dir)) if not dry_run else "govdec.json",
             "decision_log": str(decision_log_path.relative_to(run_dir)) if not dry_run else "decision_log.jsonl",
             "trigger_events": str(trigger_events_path.relative_to(run_dir)) if not dry_run else "trigger_events.jsonl",
+            "decision_log_index": index_path_for(decision_log_path).name,
+            "trace_index": TRACE_INDEX_FILENAME,
+            "sli_sketch": SKETCH_FILENAME,
+            "trace_findings": FINDINGS_FILENAME,
             "proof_manifest": str(proof_manifest_path.relative_to(run_dir)),
             "verify_report": str(verify_report_path.relative_to(run_dir)),
         },
         meta={
             "sources": {
-                "config": {"path": str(config_path), "sha256": sha256_file(config_path)},
-                "events": {"path": str(events_path), "sha256": sha256_file(events_path)},
-                "ct_config": {"path": str(ct_config_path), "sha256": sha256_file(ct_config_path)} if ct_config_path else None,
-                "drift_config": {"path": str(drift_config_path), "sha256": sha256_file(drift_config_path)} if drift_config_path else None,
-            }
+                "config": {"path": str(config_path), "sha256": config_sha},
+                "events": {"path": str(events_path), "sha256": events_sha},
+                "ct_config": {"path": str(ct_config_path), "sha256": ct_sha} if ct_config_path else None,
+                "drift_config": {"path": str(drift_config_path), "sha256": drift_sha} if drift_config_path else None,
+            },
+            "trace_correlation": correlation_summary,
         },
     )
 
@@ -176,17 +572,27 @@ def execute_run(
         if not no_bundle:
             bundle_dir = ensure_dir(run_dir / "bundle")
             bundle_path = bundle_dir / "osctl_bundle.zip"
+        write_sketches(run_dir / SKETCH_FILENAME, run_id, manifest.created_at, slis)
+        if columnar:
+            # written here, or rebuilt from the finished log by a resumed run
+            manifest.artifacts["decision_log_columns"] = columns_path_for(decision_log_path).name
+        merkle_roots: Dict[str, Dict[str, Any]] = {}
+        if merkle:
+            for key, path in (("decision_log", decision_log_path), ("trigger_events", trigger_events_path), ("trace_findings", trace_findings_path)):
+                merkle_roots[path.name] = merkle_ref(*build_merkle(path))
+                manifest.artifacts[f"{key}_merkle"] = merkle_path_for(path).name
         # manifest must include bundle path before hashing/writing
         if not no_bundle:
             manifest.artifacts["bundle"] = str(bundle_path.relative_to(run_dir))
 
-        write_json(run_manifest_path, manifest.to_dict())
+        run_manifest_sha = write_json(run_manifest_path, manifest.to_dict())
 
         artifacts = [
-            ArtifactRef(path="run_manifest.json", sha256=sha256_file(run_manifest_path), type="manifest"),
-            ArtifactRef(path="govdec.json", sha256=sha256_file(govdec_path), type="govdec"),
-            ArtifactRef(path="decision_log.jsonl", sha256=sha256_file(decision_log_path), type="decision_log"),
-            ArtifactRef(path="trigger_events.jsonl", sha256=sha256_file(trigger_events_path), type="trigger_events"),
+            ArtifactRef(path="run_manifest.json", sha256=run_manifest_sha, type="manifest"),
+            ArtifactRef(path="govdec.json", sha256=govdec_sha, type="govdec"),
+            ArtifactRef(path="decision_log.jsonl", sha256=decision_log_sha, type="decision_log", merkle=merkle_roots.get("decision_log.jsonl")),
+            ArtifactRef(path="trigger_events.jsonl", sha256=trigger_events_sha, type="trigger_events", merkle=merkle_roots.get("trigger_events.jsonl")),
+            ArtifactRef(path=FINDINGS_FILENAME, sha256=findings.digest(), type="trace_findings", merkle=merkle_roots.get(FINDINGS_FILENAME)),
             ArtifactRef(path=manifest.events["path"], sha256=manifest.events["sha256"], type="event_log"),
             ArtifactRef(path=manifest.config["path"], sha256=manifest.config["sha256"], type="config"),
         ]
@@ -204,9 +610,15 @@ def execute_run(
         write_json(proof_manifest_path, proof_manifest.to_dict())
 
         if not no_bundle:
-            with zipfile.ZipFile(bundle_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-                for p in [run_manifest_path, govdec_path, decision_log_path, trigger_events_path, proof_manifest_path, events_copy, config_copy]:
-                    zf.write(p, arcname=p.name)
+            build_bundle(
+                bundle_path,
+                [run_manifest_path, govdec_path, decision_log_path, trigger_events_path, trace_findings_path, proof_manifest_path]
+                + [events_copy, config_copy]
+                + [p for p in (ct_copy, drift_copy) if p],
+                compression=bundle_policy,
+                workers=bundle_workers,
+                meta={"run_id": run_id},
+            )
 
         write_json(verify_report_path, {"run_id": run_id, "overall_status": "PENDING", "checks": []})
 
@@ -217,12 +629,20 @@ def execute_run(
         if run_errors or proof_errors:
             raise RunError(f"schema validation failed: run={run_errors} proof={proof_errors}")
 
+        if update_index:
+            upsert_run(out_dir, run_dir)
+        checkpoint_path.unlink(missing_ok=True)
+
     return run_id, run_dir
 
 
 def run_command(args) -> int:
+    if getattr(args, "follow", False):
+        from .follow import follow_command  # follow builds on this module
+
+        return follow_command(args)
     try:
-        enforce_evidence = bool(args.tag and "advisory" in args.tag.lower())
+        enforce_evidence = enforce_evidence_for_tag(args.tag)
         run_id, run_dir = execute_run(
             run_id=args.run_id,
             out_dir=Path(args.out_dir),
@@ -237,6 +657,14 @@ def run_command(args) -> int:
             no_bundle=args.no_bundle,
             dry_run=args.dry_run,
             enforce_evidence_refs=enforce_evidence,
+            stream=args.stream,
+            workers=args.workers,
+            blob_store=BlobStore.for_run_root(Path(args.out_dir)) if args.blob_store or cfg.BLOB_STORE else None,
+            bundle_compression=args.bundle_compression,
+            bundle_workers=args.bundle_workers,
+            columnar=args.columnar or cfg.COLUMNAR,
+            resume=args.resume,
+            merkle=args.merkle or cfg.MERKLE,
         )
         summary = {
             "run_id": run_id,
@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+import hashlib
+import io
+import itertools
 import json
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-import jsonschema
+from .bundle import BUNDLE_MANIFEST_NAME
+from .follow import verify_chain
+from .merkle import MerkleError, format_root, prove_rows, root_of_lines, verify_rows
+from .models import ArtifactRef, ProofManifest, RunManifest
+from .run_index import index_path, upsert_run
+from .utils import COPY_CHUNK_SIZE, get_validator, read_json, validate_json, write_json
+from .verify_cache import VerifyCache
 
-from .models import ProofManifest, RunManifest
-from .utils import load_schema, read_json, read_jsonl, sha256_file, validate_json, write_json
+VALIDATE_CHUNK_ROWS = 20000
 
 
 class VerifyError(Exception):
@@ -22,26 +34,211 @@ def _add_check(checks: List[Dict[str, Any]], name: str, ok: bool, reason: Option
     checks.append({"name": name, "status": "PASS" if ok else "FAIL", **({"reason": reason} if reason else {})})
 
 
-def verify_command(args) -> int:
-    run_dir = Path(args.run_dir) if args.run_dir else _default_run_dir(args.run_id, Path(args.out_dir))
-    proof_path = Path(args.proof_manifest) if args.proof_manifest else run_dir / "proof_manifest.json"
-    run_manifest_path = run_dir / "run_manifest.json"
-    govdec_path = run_dir / "govdec.json"
-    decision_log_path = run_dir / "decision_log.jsonl"
-    trigger_events_path = run_dir / "trigger_events.jsonl"
+def _iter_rows(lines: Iterable[str]) -> Iterator[str]:
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield line
 
-    if not proof_path.exists():
-        print(json.dumps({"status": "ERROR", "error": f"missing proof manifest: {proof_path}"}))
-        return 2
 
+def _chunked(rows: Iterator[str], size: int) -> Iterator[Tuple[int, List[str]]]:
+    start = 0
+    chunk: List[str] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+def _validate_chunk(schema_path: str, start: int, lines: List[str]) -> List[str]:
+    # runs in worker processes; get_validator compiles the schema once per process
+    validator = get_validator(Path(schema_path))
+    errs: List[str] = []
+    if validator is None:
+        return errs
+    for offset, line in enumerate(lines):
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            row = {"raw": line}
+        errs.extend([f"line {start+offset+1}: {e}" for e in validator.iter_errors(row)])
+    return errs
+
+
+def validate_jsonl_lines(
+    lines: Iterable[str],
+    schema_path: Path,
+    workers: int = 1,
+    fail_fast: bool = False,
+    chunk_rows: int = VALIDATE_CHUNK_ROWS,
+) -> List[str]:
+    """Schema-check JSONL rows in chunks, on a process pool when ``workers > 1``.
+
+    Rows are read lazily; at most ``2 * workers`` chunks are in flight. With ``fail_fast``
+    validation stops after the first chunk that reports errors.
+    """
+    chunks = _chunked(_iter_rows(lines), chunk_rows)
+    head = list(itertools.islice(chunks, 2))
+    errs: List[str] = []
+    if workers <= 1 or len(head) < 2:
+        for start, chunk in itertools.chain(head, chunks):
+            errs.extend(_validate_chunk(str(schema_path), start, chunk))
+            if fail_fast and errs:
+                break
+        return errs
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        stopped = False
+        for start, chunk in itertools.chain(head, chunks):
+            pending.append(pool.submit(_validate_chunk, str(schema_path), start, chunk))
+            if len(pending) >= workers * 2:
+                errs.extend(pending.popleft().result())
+                if fail_fast and errs:
+                    stopped = True
+                    break
+        while pending and not stopped:
+            errs.extend(pending.popleft().result())
+            stopped = fail_fast and bool(errs)
+        for fut in pending:
+            fut.cancel()
+    return errs
+
+
+def hash_artifacts(
+    items: List[Any],
+    hasher: Callable[[Any], Optional[str]],
+    workers: int = 1,
+    stop: Optional[Callable[[Any, Optional[str]], bool]] = None,
+) -> List[Tuple[Any, Optional[str]]]:
+    """Hash ``items`` on a thread pool (hashlib releases the GIL), returning results in input order.
+
+    ``stop(item, digest)`` returning True cancels everything still queued (fail-fast).
+    """
+    results: List[Tuple[Any, Optional[str]]] = []
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            digest = hasher(item)
+            results.append((item, digest))
+            if stop and stop(item, digest):
+                break
+        return results
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        futures: List[Future] = [pool.submit(hasher, item) for item in items]
+        for item, fut in zip(items, futures):
+            digest = fut.result()
+            results.append((item, digest))
+            if stop and stop(item, digest):
+                for rest in futures:
+                    rest.cancel()
+                break
+    return results
+
+
+class RunDirSource:
+    """Artifacts of an expanded run directory (hashes and schema passes go through the verify cache)."""
+
+    def __init__(self, run_dir: Path, cache: VerifyCache):
+        self.run_dir = run_dir
+        self.cache = cache
+
+    def exists(self, rel: str) -> bool:
+        return (self.run_dir / rel).exists()
+
+    def read_json(self, rel: str) -> Any:
+        return read_json(self.run_dir / rel)
+
+    def open_text(self, rel: str) -> IO[str]:
+        return (self.run_dir / rel).open("r", encoding="utf-8")
+
+    def sha256(self, rel: str) -> Optional[str]:
+        return self.cache.sha256(rel)
+
+    def merkle_root(self, rel: str) -> Optional[str]:
+        return self.cache.merkle_root(rel)
+
+    def schema_passed(self, rel: str, schema_path: Path) -> bool:
+        return self.cache.schema_passed(rel, schema_path)
+
+    def record_schema_pass(self, rel: str, schema_path: Path) -> None:
+        self.cache.record_schema_pass(rel, schema_path)
+
+
+class BundleSource:
+    """Artifacts read straight out of ``osctl_bundle.zip``; nothing is extracted to disk.
+
+    Members are matched by file name (bundles are flat). zipfile checks each member's
+    CRC as it is read, and threads may read different members concurrently.
+    """
+
+    def __init__(self, bundle_path: Path):
+        self.bundle_path = bundle_path
+        self.zf = zipfile.ZipFile(bundle_path)
+        self.names = set(self.zf.namelist())
+        self._digests: Dict[str, Optional[str]] = {}
+
+    def close(self) -> None:
+        self.zf.close()
+
+    def _member(self, rel: str) -> str:
+        return Path(rel).name
+
+    def exists(self, rel: str) -> bool:
+        return self._member(rel) in self.names
+
+    def read_json(self, rel: str) -> Any:
+        return json.loads(self.zf.read(self._member(rel)))
+
+    def open_text(self, rel: str) -> IO[str]:
+        return io.TextIOWrapper(self.zf.open(self._member(rel)), encoding="utf-8")
+
+    def sha256(self, rel: str) -> Optional[str]:
+        name = self._member(rel)
+        if name not in self._digests:
+            if name not in self.names:
+                return None
+            h = hashlib.sha256()
+            with self.zf.open(name) as fh:
+                for chunk in iter(lambda: fh.read(COPY_CHUNK_SIZE), b""):
+                    h.update(chunk)
+            self._digests[name] = f"sha256:{h.hexdigest()}"
+        return self._digests[name]
+
+    def merkle_root(self, rel: str) -> Optional[str]:
+        name = self._member(rel)
+        if name not in self.names:
+            return None
+        with self.zf.open(name) as fh:
+            return format_root(root_of_lines(fh)[0])
+
+    def schema_passed(self, rel: str, schema_path: Path) -> bool:
+        return False
+
+    def record_schema_pass(self, rel: str, schema_path: Path) -> None:
+        pass
+
+
+def verify_artifacts(
+    source: Any,
+    schemas_root: Path,
+    workers: int,
+    fail_fast: bool,
+    proof_manifest_path: Optional[Path] = None,
+) -> Tuple[str, List[Dict[str, Any]], bool]:
+    """Run the verify stages against ``source``; returns (overall, checks, stopped_early)."""
     checks: List[Dict[str, Any]] = []
     errors: List[str] = []
-    try:
-        proof_manifest = ProofManifest.from_dict(read_json(proof_path))
-        run_manifest = RunManifest.from_dict(read_json(run_manifest_path))
+    proof_manifest = ProofManifest.from_dict(
+        read_json(proof_manifest_path) if proof_manifest_path else source.read_json("proof_manifest.json")
+    )
+    run_manifest = RunManifest.from_dict(source.read_json("run_manifest.json"))
 
+    def stage_manifest_schemas() -> None:
         # schema validation (best-effort)
-        schemas_root = Path(args.schemas_root)
         for label, obj, filename in [
             ("run_manifest_schema", run_manifest.to_dict(), "run_manifest.schema.json"),
             ("proof_manifest_schema", proof_manifest.to_dict(), "proof_manifest.schema.json"),
@@ -53,43 +250,80 @@ def verify_command(args) -> int:
             else:
                 _add_check(checks, label, True)
 
-        # decision_log schema validation (JSONL)
-        decision_schema = load_schema(schemas_root / "decision_log.schema.json")
-        if decision_schema and decision_log_path.exists():
-            validator = jsonschema.Draft7Validator(decision_schema)
-            errs: List[str] = []
-            for idx, row in enumerate(read_jsonl(decision_log_path)):
-                errs.extend([f"line {idx+1}: {e.message} at {list(e.path)}" for e in validator.iter_errors(row)])
-            _add_check(checks, "decision_log_schema", len(errs) == 0, "; ".join(errs) if errs else None)
+    def stage_jsonl_schemas() -> None:
+        # decision_log / trigger_events schema validation (JSONL, parallel chunks)
+        for label, rel, filename in [
+            ("decision_log_schema", "decision_log.jsonl", "decision_log.schema.json"),
+            ("trigger_events_schema", "trigger_events.jsonl", "trigger_event.schema.json"),
+        ]:
+            schema_file = schemas_root / filename
+            if get_validator(schema_file) is None or not source.exists(rel):
+                continue
+            if source.schema_passed(rel, schema_file):
+                _add_check(checks, label, True)
+                continue
+            with source.open_text(rel) as fh:
+                errs = validate_jsonl_lines(fh, schema_file, workers=workers, fail_fast=fail_fast)
+            if not errs:
+                source.record_schema_pass(rel, schema_file)
+            _add_check(checks, label, len(errs) == 0, "; ".join(errs) if errs else None)
             errors.extend(errs)
+            if fail_fast and errs:
+                return
 
-        # trigger_events schema validation (JSONL)
-        trigger_schema = load_schema(schemas_root / "trigger_event.schema.json")
-        if trigger_schema and trigger_events_path.exists():
-            validator = jsonschema.Draft7Validator(trigger_schema)
-            errs: List[str] = []
-            for idx, row in enumerate(read_jsonl(trigger_events_path)):
-                errs.extend([f"line {idx+1}: {e.message} at {list(e.path)}" for e in validator.iter_errors(row)])
-            _add_check(checks, "trigger_events_schema", len(errs) == 0, "; ".join(errs) if errs else None)
-            errors.extend(errs)
+    def stage_artifact_hashes() -> None:
+        # artifact existence and hash checks (thread pool; unchanged files come from the cache)
+        def mismatch(artifact: ArtifactRef, digest: Optional[str]) -> bool:
+            return fail_fast and digest != artifact.sha256
 
-        # artifact existence and hash checks
-        for artifact in proof_manifest.artifacts:
-            artifact_path = run_dir / artifact.path
-            if not artifact_path.exists():
+        for artifact, current_hash in hash_artifacts(
+            proof_manifest.artifacts, lambda artifact: source.sha256(artifact.path), workers, stop=mismatch
+        ):
+            if current_hash is None:
                 _add_check(checks, f"artifact_exists:{artifact.path}", False, "missing")
                 errors.append(f"missing {artifact.path}")
-                continue
-            current_hash = sha256_file(artifact_path)
-            if current_hash != artifact.sha256:
+            elif current_hash != artifact.sha256:
                 _add_check(checks, f"artifact_hash:{artifact.path}", False, f"expected {artifact.sha256}, got {current_hash}")
                 errors.append(f"hash mismatch {artifact.path}")
             else:
                 _add_check(checks, f"artifact_hash:{artifact.path}", True)
 
+    def stage_bundle_manifest() -> None:
+        # bundles only: embedded member digests (mostly already hashed by the previous stage)
+        if not isinstance(source, BundleSource):
+            return
+        if not source.exists(BUNDLE_MANIFEST_NAME):
+            _add_check(checks, "bundle_manifest_present", False, f"{BUNDLE_MANIFEST_NAME} missing")
+            errors.append(f"{BUNDLE_MANIFEST_NAME} missing")
+            return
+        members = source.read_json(BUNDLE_MANIFEST_NAME).get("members", [])
+        bad = [m["name"] for m in members if source.sha256(m["name"]) != m.get("sha256")]
+        _add_check(checks, "bundle_manifest_digests", not bad, f"mismatch: {', '.join(bad)}" if bad else None)
+        errors.extend(f"bundle member mismatch {name}" for name in bad)
+
+    def stage_proof_chain() -> None:
+        # follow runs: every chain segment links to the digest of the one before it
+        heads = [a for a in proof_manifest.artifacts if a.type == "proof_chain_head"]
+        for head in heads:
+            errs = verify_chain(source.read_json, source.sha256, head.path) if source.exists(head.path) else [f"{head.path}: missing"]
+            _add_check(checks, "proof_chain", not errs, "; ".join(errs) if errs else None)
+            errors.extend(errs)
+
+    def stage_merkle_roots() -> None:
+        # --merkle runs: the recorded roots must match the rows (partial verify trusts them)
+        for artifact in proof_manifest.artifacts:
+            if not artifact.merkle or not source.exists(artifact.path):
+                continue
+            root = source.merkle_root(artifact.path)
+            ok = root == artifact.merkle.get("root")
+            _add_check(checks, f"merkle_root:{artifact.path}", ok, None if ok else f"expected {artifact.merkle.get('root')}, got {root}")
+            if not ok:
+                errors.append(f"merkle root mismatch {artifact.path}")
+
+    def stage_invariants() -> None:
         # minimal invariants
-        if govdec_path.exists():
-            govdec = read_json(govdec_path)
+        if source.exists("govdec.json"):
+            govdec = source.read_json("govdec.json")
             wp = govdec.get("witness_path", {})
             ok = isinstance(wp, dict) and "exists" in wp
             _add_check(checks, "govdec_witness_path_present", ok, None if ok else "witness_path missing")
@@ -98,13 +332,142 @@ def verify_command(args) -> int:
             errors.append("govdec missing")
 
         # decision_log presence
-        _add_check(checks, "decision_log_present", decision_log_path.exists(), None if decision_log_path.exists() else "decision_log missing")
-        _add_check(checks, "trigger_events_present", trigger_events_path.exists(), None if trigger_events_path.exists() else "trigger_events missing")
+        for name, rel in (("decision_log", "decision_log.jsonl"), ("trigger_events", "trigger_events.jsonl")):
+            present = source.exists(rel)
+            _add_check(checks, f"{name}_present", present, None if present else f"{name} missing")
+
+    # only checks that add to ``errors`` decide the verdict (the manifest schema and witness
+    # checks are best-effort), so fail-fast stops on those alone and never changes the verdict
+    stopped_early = False
+    for stage in (stage_manifest_schemas, stage_jsonl_schemas, stage_artifact_hashes, stage_bundle_manifest, stage_proof_chain, stage_merkle_roots, stage_invariants):
+        failed_before = len(errors)
+        stage()
+        if fail_fast and len(errors) > failed_before:
+            stopped_early = True
+            break
+
+    overall = "PASS" if not errors else "FAIL"
+    return overall, checks, stopped_early
+
+
+def _verify_bundle(args, workers: int) -> int:
+    bundle_path = Path(args.bundle)
+    if not bundle_path.exists():
+        print(json.dumps({"status": "ERROR", "error": f"missing bundle: {bundle_path}"}))
+        return 2
+    try:
+        source = BundleSource(bundle_path)
+        try:
+            overall, checks, stopped_early = verify_artifacts(
+                source,
+                Path(args.schemas_root),
+                workers,
+                args.fail_fast,
+                Path(args.proof_manifest) if args.proof_manifest else None,
+            )
+            run_id = source.read_json("run_manifest.json").get("run_id")
+        finally:
+            source.close()
+        if args.run_id and args.run_id != run_id:
+            overall = "FAIL"
+            checks.append({"name": "bundle_run_id", "status": "FAIL", "reason": f"bundle is for run {run_id}"})
+        # archives are often read-only: the report goes to --report (if given) and stdout
+        verify_report = {"run_id": run_id, "bundle": str(bundle_path), "overall_status": overall, "checks": checks}
+        if stopped_early:
+            verify_report["fail_fast"] = True
+        if args.report:
+            write_json(Path(args.report), verify_report)
+        summary: Dict[str, Any] = {"status": overall, "run_id": run_id, "bundle": str(bundle_path)}
+        if overall != "PASS":
+            summary["failed"] = [c["name"] for c in checks if c["status"] == "FAIL"]
+        print(json.dumps(summary))
+        return 0 if overall == "PASS" else 1
+    except Exception as exc:
+        print(json.dumps({"status": "ERROR", "error": str(exc)}))
+        return 2
+
 
-        overall = "PASS" if not errors else "FAIL"
-        verify_report = {"run_id": args.run_id, "overall_status": overall, "checks": checks}
+def parse_row_range(spec: str) -> Tuple[int, int]:
+    """``N`` or ``START:END`` (end exclusive) -> ``(start, end)``."""
+    start, sep, end = spec.partition(":")
+    try:
+        lo = int(start)
+        hi = int(end) if sep else lo + 1
+    except ValueError:
+        lo = hi = -1
+    if lo < 0 or hi <= lo:
+        raise ValueError(f"invalid row range {spec!r}; expected N or START:END")
+    return lo, hi
+
+
+def verify_row_range(run_dir: Path, rel: str, lo: int, hi: int, proof_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Check rows ``[lo, hi)`` of a JSONL artifact against the Merkle root in the proof manifest.
+
+    Reads only those rows and O(log n) sidecar nodes; the sidecar itself is untrusted,
+    since a wrong proof cannot reproduce the recorded root.
+    """
+    proof_manifest = ProofManifest.from_dict(read_json(proof_path or run_dir / "proof_manifest.json"))
+    artifact = next((a for a in proof_manifest.artifacts if a.path == rel or a.type == rel), None)
+    if artifact is None:
+        raise MerkleError(f"{rel} is not in the proof manifest")
+    if not artifact.merkle:
+        raise MerkleError(f"{artifact.path} has no Merkle root (run with --merkle)")
+    proved = prove_rows(run_dir / artifact.path, lo, hi)
+    ok = proved["leaves"] == artifact.merkle["leaves"] and verify_rows(proved["rows"], lo, proved["leaves"], proved["proof"], artifact.merkle["root"])
+    return {
+        "status": "PASS" if ok else "FAIL",
+        "artifact": artifact.path,
+        "rows": [lo, hi],
+        "leaves": artifact.merkle["leaves"],
+        "root": artifact.merkle["root"],
+        "proof_nodes": len(proved["proof"]),
+    }
+
+
+def _verify_rows(args, run_dir: Path, run_id: str, proof_path: Path) -> int:
+    # partial verify: no report or cache update, the full run was not checked
+    try:
+        lo, hi = parse_row_range(args.rows)
+        result = verify_row_range(run_dir, args.artifact, lo, hi, proof_path)
+    except (ValueError, MerkleError, OSError) as exc:
+        print(json.dumps({"status": "ERROR", "error": str(exc)}))
+        return 2
+    print(json.dumps({"status": result["status"], "run_id": run_id, **result}))
+    return 0 if result["status"] == "PASS" else 1
+
+
+def verify_command(args) -> int:
+    workers = args.workers or os.cpu_count() or 1
+    if args.bundle:
+        return _verify_bundle(args, workers)
+    if not args.run_id and not args.run_dir:
+        print(json.dumps({"status": "ERROR", "error": "--run-id, --run-dir or --bundle is required"}))
+        return 2
+    run_dir = Path(args.run_dir) if args.run_dir else _default_run_dir(args.run_id, Path(args.out_dir))
+    run_id = args.run_id or run_dir.name
+    proof_path = Path(args.proof_manifest) if args.proof_manifest else run_dir / "proof_manifest.json"
+    if args.rows:
+        return _verify_rows(args, run_dir, run_id, proof_path)
+    cache = VerifyCache.load(run_dir, paranoid=args.paranoid)
+
+    if not proof_path.exists():
+        print(json.dumps({"status": "ERROR", "error": f"missing proof manifest: {proof_path}"}))
+        return 2
+
+    try:
+        overall, checks, stopped_early = verify_artifacts(
+            RunDirSource(run_dir, cache), Path(args.schemas_root), workers, args.fail_fast, proof_path
+        )
+        verify_report = {"run_id": run_id, "overall_status": overall, "checks": checks}
+        if stopped_early:
+            verify_report["fail_fast"] = True
+        verify_report["cache"] = {"hits": cache.hits, "misses": cache.misses, "paranoid": bool(args.paranoid)}
         write_json(run_dir / "verify_report.json", verify_report)
-        print(json.dumps({"status": overall, "run_id": args.run_id}))
+        cache.save()
+        # never create an index next to an ad-hoc --run-dir (replay output, scratch dirs)
+        if run_dir.parent.resolve() == Path(args.out_dir).resolve() or index_path(run_dir.parent).exists():
+            upsert_run(run_dir.parent, run_dir)
+        print(json.dumps({"status": overall, "run_id": run_id}))
         return 0 if overall == "PASS" else 1
     except Exception as exc:
         print(json.dumps({"status": "ERROR", "error": str(exc)}))
@@ -0,0 +1,42 @@
+"""Event-log constants and timestamp parsing shared by the SLI and sketch modules."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+CHUNK_ROWS = 100000  # events buffered before timestamps are parsed in one vectorized call
+TRIGGER_EVENT = "TRIGGER_FIRED"
+EVIDENCE_EVENT = "EVIDENCE_EMIT"
+
+
+def epoch_seconds(values: List[Optional[str]]) -> np.ndarray:
+    """ISO-8601 strings -> float64 epoch seconds (NaN where missing or unparseable)."""
+    # fast path: UTC strings ("...Z" / "+00:00") parse in one numpy call
+    naive = []
+    for v in values:
+        if not isinstance(v, str):
+            naive.append("NaT")
+        elif v.endswith("Z"):
+            naive.append(v[:-1])
+        elif v.endswith("+00:00"):
+            naive.append(v[:-6])
+        else:
+            naive = None
+            break
+    if naive is not None:
+        try:
+            parsed = np.array(naive, dtype="datetime64[ms]")
+            out = parsed.astype(np.int64).astype(np.float64) / 1000.0
+            out[np.isnat(parsed)] = np.nan
+            return out
+        except ValueError:
+            pass
+    out = np.full(len(values), np.nan)
+    for i, v in enumerate(values):
+        try:
+            out[i] = datetime.fromisoformat(str(v).replace("Z", "+00:00")).timestamp()
+        except (TypeError, ValueError):
+            pass
+    return out
@@ -0,0 +1,118 @@
+"""Keyed state with event-time expiry, shared by the streaming trace joins.
+
+``KeyedExpiryStore`` holds one state object per trace key. The watermark is the largest
+timestamp seen minus ``allowed_lateness``; a key whose deadline the event time has passed
+is dropped and handed to ``expire``. ``max_open`` caps the store outright by evicting the
+earliest deadline first. ``TraceCorrelator`` and ``SketchAccumulator`` both keep their
+per-trace state here, keyed by ``trace_key_of``.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+S = TypeVar("S")
+
+
+def trace_key_of(evt: Dict[str, Any]) -> Optional[str]:
+    """The key events are joined on: ``trace_id``, else ``request_id``, else ``decision_id``."""
+    key = evt.get("trace_id") or evt.get("request_id") or evt.get("decision_id")
+    return str(key) if key else None
+
+
+class KeyedExpiryStore(Generic[S]):
+    """Per-key state objects (each with a ``deadline`` attribute) closed in deadline order.
+
+    ``expire(state, evicted)`` is called after the key has been removed; ``evicted`` is
+    True when ``max_open`` pushed it out before its deadline.
+    """
+
+    def __init__(self, expire: Callable[[S, bool], None], allowed_lateness: float, max_open: int):
+        self.expire = expire
+        self.allowed_lateness = allowed_lateness
+        self.max_open = max_open
+        self.max_ts = -math.inf
+        self.open: Dict[str, S] = {}
+        # (deadline, seq, key); entries whose deadline no longer matches are stale
+        self.deadlines: List[Tuple[float, int, str]] = []
+        self.seq = 0
+        self.peak_open = 0
+
+    @property
+    def watermark(self) -> float:
+        return self.max_ts - self.allowed_lateness
+
+    def __len__(self) -> int:
+        return len(self.open)
+
+    def get(self, key: str) -> Optional[S]:
+        return self.open.get(key)
+
+    def put(self, key: str, state: S) -> S:
+        self.open[key] = state
+        self.peak_open = max(self.peak_open, len(self.open))
+        return state
+
+    def values(self) -> Iterator[S]:
+        return iter(self.open.values())
+
+    def schedule(self, key: str, deadline: float) -> None:
+        """Move ``key``'s deadline (the old heap entry goes stale)."""
+        state: Any = self.open[key]
+        if deadline != state.deadline:
+            state.deadline = deadline
+            self.seq += 1
+            heapq.heappush(self.deadlines, (deadline, self.seq, key))
+
+    def _pop_live(self) -> Optional[S]:
+        while self.deadlines:
+            deadline, _, key = heapq.heappop(self.deadlines)
+            state: Any = self.open.get(key)
+            if state is not None and state.deadline == deadline:
+                return self.open.pop(key)
+        return None
+
+    def observe(self, ts: float) -> None:
+        """Advance event time to ``ts``, expiring every key whose deadline it has passed."""
+        if ts <= self.max_ts:
+            return
+        self.max_ts = ts
+        # deadlines already include allowed_lateness, so compare against the max event time
+        while self.deadlines and self.deadlines[0][0] <= ts:
+            deadline, _, key = heapq.heappop(self.deadlines)
+            state: Any = self.open.get(key)
+            if state is not None and state.deadline == deadline:
+                del self.open[key]
+                self.expire(state, False)
+
+    def enforce_cap(self) -> None:
+        while len(self.open) > self.max_open:
+            state = self._pop_live()
+            if state is None:
+                # only keys without a deadline remain: evict the oldest
+                state = self.open.pop(next(iter(self.open)))
+            self.expire(state, True)
+
+    def drain(self) -> List[S]:
+        """Remove every open key (end of log), in insertion order, without expiring them."""
+        states = list(self.open.values())
+        self.open = {}
+        self.deadlines = []
+        return states
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Stream position and deadline heap (stale entries included, so keys close in the
+        same order after a restore); the owner serializes the state objects."""
+        return {
+            "max_ts": self.max_ts if self.max_ts > -math.inf else None,
+            "deadlines": [list(entry) for entry in self.deadlines],
+            "seq": self.seq,
+            "peak_open": self.peak_open,
+        }
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        self.max_ts = -math.inf if data.get("max_ts") is None else float(data["max_ts"])
+        self.deadlines = [(float(deadline), int(seq), str(key)) for deadline, seq, key in data.get("deadlines") or []]
+        self.seq = int(data.get("seq", 0))
+        self.peak_open = int(data.get("peak_open", 0))
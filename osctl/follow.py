@@ -0,0 +1,433 @@
+"""``osctl run --follow``: incremental runs over an event log that keeps growing.
+
+The source log is tailed from a byte offset persisted in ``<run_dir>/follow_checkpoint.json``.
+Each poll consumes only complete lines, appends them to the run's ``event_log.jsonl`` copy,
+and appends the derived rows to ``decision_log.jsonl`` / ``trigger_events.jsonl``. The
+checkpoint is replaced atomically only after those appends are fsynced, and a restart
+first truncates every output back to its checkpointed size, so each event is processed
+exactly once even across crashes.
+
+Every ``roll_interval`` seconds (and on exit) the rows appended since the previous roll
+are sealed into ``proof_chain/segment_<seq>.json``. A segment records the byte range and
+sha256 of each artifact's new bytes, the cumulative digests, and ``prev_sha256`` (the
+digest of the previous segment file). ``proof_manifest.json``, ``govdec.json`` and
+``run_manifest.json`` are rewritten at the same time; the proof manifest lists the chain
+head, so verifying it pins the entire history.
+
+Follow runs keep decision/trigger rows, the row index and the proof chain current; the
+derived sidecars of one-shot runs (trace index, trace findings, SLI sketches, columnar
+sidecar, bundle) are not maintained.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import config as cfg
+from .engine_run import RunError, _derive_rows, _place_input, _resolve, enforce_evidence_for_tag
+from .line_index import LineIndexWriter, index_path_for
+from .models import ArtifactRef, ProofManifest, RunManifest
+from .rules import EvaluationPlan, RuleError, VerdictAccumulator, plan_for_config
+from .run_index import upsert_run
+from .utils import (
+    ensure_dir,
+    generate_run_id,
+    get_git_commit,
+    now_utc_iso,
+    read_json,
+    sha256_file,
+    write_json,
+    write_json_atomic,
+)
+
+CHECKPOINT_FILENAME = "follow_checkpoint.json"
+CHAIN_DIRNAME = "proof_chain"
+DEFAULT_POLL_INTERVAL_S = 1.0
+DEFAULT_ROLL_INTERVAL_S = 60.0
+READ_BATCH_BYTES = 8 * 1024 * 1024
+# artifact name -> proof manifest type, in the order rows are appended
+FOLLOWED_ARTIFACTS = {
+    "event_log.jsonl": "event_log",
+    "decision_log.jsonl": "decision_log",
+    "trigger_events.jsonl": "trigger_events",
+}
+
+
+def segment_path(seq: int) -> str:
+    return f"{CHAIN_DIRNAME}/segment_{seq:06d}.json"
+
+
+class _AppendLog:
+    """An append-only artifact: cumulative digest plus a digest of the current segment."""
+
+    def __init__(self, path: Path, size: int, segment_start: Optional[int] = None):
+        self.path = path
+        self._fh = path.open("r+b" if path.exists() else "wb")
+        self._fh.truncate(size)  # drop anything written after the last checkpoint
+        self.size = size
+        self.segment_start = size if segment_start is None else segment_start
+        # hashlib state cannot be persisted, so a reopened log re-hashes what it holds
+        self._full = hashlib.sha256()
+        self._segment = hashlib.sha256()
+        self._fh.seek(0)
+        pos = 0
+        while pos < size:
+            chunk = self._fh.read(min(size - pos, READ_BATCH_BYTES))
+            self._full.update(chunk)
+            if pos + len(chunk) > self.segment_start:
+                self._segment.update(chunk[max(0, self.segment_start - pos) :])
+            pos += len(chunk)
+        self._fh.seek(size)
+
+    def append(self, data: bytes) -> None:
+        self._fh.write(data)
+        self._full.update(data)
+        self._segment.update(data)
+        self.size += len(data)
+
+    def sync(self) -> None:
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def digest(self) -> str:
+        return f"sha256:{self._full.hexdigest()}"
+
+    def seal_segment(self) -> Dict[str, Any]:
+        sealed = {
+            "offset": self.segment_start,
+            "length": self.size - self.segment_start,
+            "sha256": f"sha256:{self._segment.hexdigest()}",
+            "cumulative_sha256": self.digest(),
+        }
+        self.segment_start = self.size
+        self._segment = hashlib.sha256()
+        return sealed
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+def _source_identity(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return st.st_dev, st.st_ino
+
+
+class FollowRun:
+    def __init__(
+        self,
+        *,
+        run_id: str,
+        out_dir: Path,
+        config_path: Path,
+        events_path: Path,
+        plan: EvaluationPlan,
+        cohort_id: Optional[str] = None,
+        edition: Optional[str] = None,
+        tag: Optional[str] = None,
+        enforce_evidence_refs: bool = False,
+        roll_interval: float = DEFAULT_ROLL_INTERVAL_S,
+        update_index: bool = True,
+    ):
+        self.run_id = run_id
+        self.out_dir = out_dir
+        self.run_dir = ensure_dir(out_dir / run_id)
+        self.events_path = events_path
+        self.plan = plan
+        self.cohort_id = cohort_id
+        self.edition = edition
+        self.tag = tag
+        self.enforce_evidence_refs = enforce_evidence_refs
+        self.roll_interval = roll_interval
+        self.update_index = update_index
+        self.checkpoint_path = self.run_dir / CHECKPOINT_FILENAME
+        ensure_dir(self.run_dir / CHAIN_DIRNAME)
+
+        checkpoint = read_json(self.checkpoint_path) if self.checkpoint_path.exists() else None
+        self.config_copy = self.run_dir / config_path.name
+        if checkpoint is None:
+            self.config_sha = _place_input(config_path, self.config_copy, None, None)
+            self.created_at = now_utc_iso()
+            checkpoint = {"source": {"path": str(events_path), "offset": 0, "identity": list(_source_identity(events_path))}}
+        else:
+            if checkpoint.get("run_id") != run_id:
+                raise RunError(f"{self.checkpoint_path} belongs to run {checkpoint.get('run_id')}")
+            self.config_sha = checkpoint["config_sha256"]
+            if sha256_file(config_path) != self.config_sha:
+                raise RunError(f"config changed since this follow run started: {config_path}")
+            self.created_at = checkpoint["created_at"]
+        self.source_offset = int(checkpoint["source"]["offset"])
+        self.source_identity = tuple(checkpoint["source"]["identity"])
+        self.rows = int(checkpoint.get("rows", 0))
+        self.seq = int(checkpoint.get("seq", 0))
+        self.chain_head: Optional[str] = checkpoint.get("chain_head")
+        self.verdict = VerdictAccumulator.from_dict(checkpoint.get("verdict") or {})
+        sizes = checkpoint.get("sizes") or {}
+        segment_starts = checkpoint.get("segment_starts") or {}
+        self.segment_start_row = int(checkpoint.get("segment_start_row", 0))
+        self.logs: Dict[str, _AppendLog] = {}
+        for name in FOLLOWED_ARTIFACTS:
+            size = int(sizes.get(name, 0))
+            self.logs[name] = _AppendLog(self.run_dir / name, size, int(segment_starts.get(name, size)))
+        decision_log = self.logs["decision_log.jsonl"]
+        self.line_index = LineIndexWriter.resume(index_path_for(decision_log.path), self.rows, decision_log.size)
+        self.last_roll = time.monotonic()
+
+    # -- polling -------------------------------------------------------------------------
+
+    def poll(self) -> int:
+        """Consume the complete lines appended to the source since the checkpoint; returns rows."""
+        try:
+            identity = _source_identity(self.events_path)
+            size = self.events_path.stat().st_size
+        except FileNotFoundError:
+            return 0  # rotated away; wait for it to reappear
+        if identity != self.source_identity or size < self.source_offset:
+            raise RunError(f"event log was truncated or replaced: {self.events_path}")
+        if size == self.source_offset:
+            return 0
+        with self.events_path.open("rb") as fh:
+            fh.seek(self.source_offset)
+            data = fh.read(min(size - self.source_offset, READ_BATCH_BYTES))
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            if len(data) >= READ_BATCH_BYTES:
+                raise RunError(f"line longer than {READ_BATCH_BYTES} bytes at offset {self.source_offset}")
+            return 0  # a partial line: wait for the writer to finish it
+        data = data[:end]
+        events = []
+        for raw in data.split(b"\n")[:-1]:
+            # a writer can leave invalid UTF-8 behind; replacing it keeps the follower
+            # alive and the line still lands as a {"raw": ...} row
+            line = raw.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                events.append({"raw": line})
+        decision_lines: List[str] = []
+        trigger_lines: List[str] = []
+        for decision, trigger in _derive_rows(
+            self.run_id, events, self.enforce_evidence_refs, start_index=self.rows, plan=self.plan, verdict=self.verdict
+        ):
+            decision_lines.append(json.dumps(decision) + "\n")
+            trigger_lines.append(json.dumps(trigger) + "\n")
+        decision_text = "".join(decision_lines)
+        self.logs["event_log.jsonl"].append(data)
+        self.logs["decision_log.jsonl"].append(decision_text.encode("utf-8"))
+        self.logs["trigger_events.jsonl"].append("".join(trigger_lines).encode("utf-8"))
+        self.line_index.add_text(decision_text)
+        self.source_offset += end
+        self.rows += len(events)
+        self._commit()
+        return len(events)
+
+    def _commit(self) -> None:
+        for log in self.logs.values():
+            log.sync()
+        self.line_index.sync()
+        write_json_atomic(
+            self.checkpoint_path,
+            {
+                "schema_version": "1.0",
+                "run_id": self.run_id,
+                "created_at": self.created_at,
+                "updated_at": now_utc_iso(),
+                "config_sha256": self.config_sha,
+                "source": {"path": str(self.events_path), "offset": self.source_offset, "identity": list(self.source_identity)},
+                "rows": self.rows,
+                "sizes": {name: log.size for name, log in self.logs.items()},
+                "segment_starts": {name: log.segment_start for name, log in self.logs.items()},
+                "segment_start_row": self.segment_start_row,
+                "seq": self.seq,
+                "chain_head": self.chain_head,
+                "verdict": self.verdict.to_dict(),
+            },
+        )
+
+    # -- proof chain ----------------------------------------------------------------------
+
+    def roll(self, final: bool = False) -> Optional[str]:
+        """Seal rows appended since the last roll into the next chain segment."""
+        self.last_roll = time.monotonic()
+        if self.rows == self.segment_start_row and self.chain_head is not None:
+            if final:
+                self._write_manifests(final)
+            return None
+        self.seq += 1
+        rel = segment_path(self.seq)
+        segment = {
+            "schema_version": "1.0",
+            "run_id": self.run_id,
+            "seq": self.seq,
+            "created_at": now_utc_iso(),
+            "rows": [self.segment_start_row, self.rows],
+            "source_offset": self.source_offset,
+            "artifacts": {name: log.seal_segment() for name, log in self.logs.items()},
+            "prev_sha256": self.chain_head,
+        }
+        self.chain_head = write_json(self.run_dir / rel, segment)
+        self.segment_start_row = self.rows
+        self._commit()
+        self._write_manifests(final)
+        return rel
+
+    def _write_manifests(self, final: bool) -> None:
+        govdec = {
+            "schema_version": "1.0",
+            "run_id": self.run_id,
+            "decision_id": f"dec-{self.run_id}",
+            "timestamp": now_utc_iso(),
+            "verdict": self.verdict.verdict,
+            "witness_path": {"exists": not self.verdict.failed, "failed_axis": self.verdict.failed_axis},
+            "decisions": self.verdict.summary(),
+        }
+        govdec_sha = write_json(self.run_dir / "govdec.json", govdec)
+        events_log = self.logs["event_log.jsonl"]
+        manifest = RunManifest(
+            run_id=self.run_id,
+            created_at=self.created_at,
+            config={"path": self.config_copy.name, "sha256": self.config_sha},
+            events={"path": events_log.path.name, "sha256": events_log.digest()},
+            cohort_id=self.cohort_id,
+            edition=self.edition,
+            tag=self.tag,
+            git_commit=get_git_commit(),
+            status="SUCCESS" if final else "FOLLOWING",
+            artifacts={
+                "govdec": "govdec.json",
+                "decision_log": "decision_log.jsonl",
+                "trigger_events": "trigger_events.jsonl",
+                "decision_log_index": index_path_for(self.logs["decision_log.jsonl"].path).name,
+                "proof_chain_head": segment_path(self.seq),
+                "proof_manifest": "proof_manifest.json",
+                "verify_report": "verify_report.json",
+            },
+            meta={
+                "sources": {
+                    "config": {"path": str(self.config_copy), "sha256": self.config_sha},
+                    "events": {"path": str(self.events_path), "offset": self.source_offset},
+                },
+                "follow": {"rows": self.rows, "segments": self.seq, "chain_head": self.chain_head},
+            },
+        )
+        run_manifest_sha = write_json(self.run_dir / "run_manifest.json", manifest.to_dict())
+        artifacts = [
+            ArtifactRef(path="run_manifest.json", sha256=run_manifest_sha, type="manifest"),
+            ArtifactRef(path="govdec.json", sha256=govdec_sha, type="govdec"),
+            *(ArtifactRef(path=name, sha256=self.logs[name].digest(), type=kind) for name, kind in FOLLOWED_ARTIFACTS.items()),
+            ArtifactRef(path=self.config_copy.name, sha256=self.config_sha, type="config"),
+            ArtifactRef(path=segment_path(self.seq), sha256=self.chain_head, type="proof_chain_head"),
+        ]
+        proof = ProofManifest(
+            run_id=self.run_id,
+            created_at=now_utc_iso(),
+            artifacts=artifacts,
+            verification={"status": "PENDING", "details": f"generated by osctl run --follow (segment {self.seq})"},
+        )
+        write_json(self.run_dir / "proof_manifest.json", proof.to_dict())
+        verify_report = self.run_dir / "verify_report.json"
+        if not verify_report.exists():
+            write_json(verify_report, {"run_id": self.run_id, "overall_status": "PENDING", "checks": []})
+        if self.update_index:
+            upsert_run(self.out_dir, self.run_dir)
+
+    def close(self) -> None:
+        self.line_index.close()
+        for log in self.logs.values():
+            log.close()
+
+    # -- main loop ------------------------------------------------------------------------
+
+    def follow(
+        self,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_S,
+        max_idle: Optional[float] = None,
+        on_roll: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """Tail the source until interrupted (or idle for ``max_idle`` seconds), then seal the chain."""
+        idle_since = time.monotonic()
+        try:
+            while True:
+                if self.poll():
+                    idle_since = time.monotonic()
+                    continue  # drain a backlog before sleeping
+                now = time.monotonic()
+                if now - self.last_roll >= self.roll_interval:
+                    rel = self.roll()
+                    if rel and on_roll:
+                        on_roll(rel)
+                if max_idle is not None and now - idle_since >= max_idle:
+                    break
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            rel = self.roll(final=True)
+            if rel and on_roll:
+                on_roll(rel)
+            self.close()
+
+
+def verify_chain(read_json_at: Callable[[str], Dict[str, Any]], sha256_at: Callable[[str], Optional[str]], head: str) -> List[str]:
+    """Walk a proof chain back from ``head``; returns problems (empty when every link holds)."""
+    errors: List[str] = []
+    rel: Optional[str] = head
+    while rel is not None:
+        segment = read_json_at(rel)
+        seq = int(segment.get("seq", 0))
+        prev = segment.get("prev_sha256")
+        if seq <= 1:
+            if prev is not None:
+                errors.append(f"{rel}: first segment has prev_sha256")
+            break
+        prev_rel = segment_path(seq - 1)
+        actual = sha256_at(prev_rel)
+        if actual is None:
+            errors.append(f"{prev_rel}: missing")
+            break
+        if actual != prev:
+            errors.append(f"{rel}: prev_sha256 {prev} does not match {prev_rel} ({actual})")
+        rel = prev_rel
+    return errors
+
+
+def follow_command(args) -> int:
+    try:
+        if args.dry_run or args.workers > 1 or args.columnar:
+            raise RunError("--follow cannot be combined with --dry-run, --workers or --columnar")
+        config_path = _resolve(args.config, Path(args.config_root))
+        events_path = _resolve(args.events, Path(args.config_root))
+        for label, path in (("config", config_path), ("events", events_path)):
+            if not path.exists():
+                raise RunError(f"{label} not found: {path}")
+        try:
+            plan = plan_for_config(config_path)
+        except RuleError as exc:
+            raise RunError(str(exc)) from exc
+        run = FollowRun(
+            run_id=args.run_id or generate_run_id(cfg.DEFAULT_RUN_ID_PREFIX),
+            out_dir=Path(args.out_dir),
+            config_path=config_path,
+            events_path=events_path,
+            plan=plan,
+            cohort_id=args.cohort_id,
+            edition=args.edition,
+            tag=args.tag,
+            enforce_evidence_refs=enforce_evidence_for_tag(args.tag),
+            roll_interval=args.roll_interval,
+        )
+
+        def report_roll(segment: str) -> None:
+            print(json.dumps({"run_id": run.run_id, "segment": segment, "rows": run.rows, "status": "FOLLOWING"}), flush=True)
+
+        run.follow(poll_interval=args.poll_interval, max_idle=args.max_idle, on_roll=report_roll)
+        print(json.dumps({"run_id": run.run_id, "run_dir": str(run.run_dir), "rows": run.rows, "segments": run.seq, "status": "SUCCESS"}))
+        return 0
+    except RunError as exc:
+        print(json.dumps({"status": "ERROR", "error": str(exc)}))
+        return 2
@@ -0,0 +1,207 @@
+"""Sidecar row-offset index for JSONL artifacts (``<name>.jsonl.idx``).
+
+The index is a flat array of little-endian uint64 byte offsets, one per row, so row ``i``
+of the JSONL file can be read with a single seek.
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+INDEX_SUFFIX = ".idx"
+DEFAULT_SCAN_ROWS = 50000
+_FLUSH_ENTRIES = 65536
+_ENTRY = struct.Struct("<Q")
+
+
+def index_path_for(jsonl_path: Path) -> Path:
+    return jsonl_path.with_name(jsonl_path.name + INDEX_SUFFIX)
+
+
+def _to_le(offsets: array) -> array:
+    if sys.byteorder != "little":
+        offsets = array("Q", offsets)
+        offsets.byteswap()
+    return offsets
+
+
+class LineIndexWriter:
+    """Records the start offset of every row written to a JSONL file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fh = path.open("wb")
+        self._pending = array("Q")
+        self.position = 0
+        self.rows = 0
+
+    @classmethod
+    def resume(cls, path: Path, rows: int, position: int) -> "LineIndexWriter":
+        """Reopen an index for appending after its first ``rows`` entries (file ends at ``position``)."""
+        writer = cls.__new__(cls)
+        writer.path = path
+        writer._fh = path.open("r+b" if path.exists() else "wb")
+        writer._fh.truncate(rows * 8)
+        writer._fh.seek(rows * 8)
+        writer._pending = array("Q")
+        writer.position = position
+        writer.rows = rows
+        return writer
+
+    def add_row(self, nbytes: int) -> None:
+        self._pending.append(self.position)
+        self.position += nbytes
+        self.rows += 1
+        if len(self._pending) >= _FLUSH_ENTRIES:
+            self.flush()
+
+    def add_text(self, text: str) -> None:
+        # text holds one or more complete rows; json.dumps output is ASCII unless ensure_ascii=False
+        ascii_only = text.isascii()
+        for part in text.split("\n")[:-1]:
+            self.add_row((len(part) if ascii_only else len(part.encode("utf-8"))) + 1)
+
+    def flush(self) -> None:
+        if self._pending:
+            _to_le(self._pending).tofile(self._fh)
+            self._pending = array("Q")
+
+    def sync(self) -> None:
+        self.flush()
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        self.flush()
+        self._fh.close()
+
+
+class LineIndex:
+    """Read side of a row-offset index; entries are read on demand (the row count comes
+    from the file size), so opening an index and reading a page never loads the whole file."""
+
+    def __init__(self, jsonl_path: Path, rows: int, size: int):
+        self.jsonl_path = jsonl_path
+        self.idx_path = index_path_for(jsonl_path)
+        self.rows = rows
+        self.size = size
+
+    @classmethod
+    def open(cls, jsonl_path: Path) -> Optional["LineIndex"]:
+        idx_path = index_path_for(jsonl_path)
+        try:
+            idx_size = idx_path.stat().st_size
+            size = jsonl_path.stat().st_size
+        except OSError:
+            return None
+        if idx_size % _ENTRY.size:
+            return None  # partially written
+        index = cls(jsonl_path, idx_size // _ENTRY.size, size)
+        if index.rows and index.offset(index.rows - 1) >= size:
+            return None  # stale index (artifact rewritten or truncated)
+        return index
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def offset(self, row: int) -> int:
+        """Byte offset of ``row`` (one 8-byte read)."""
+        with self.idx_path.open("rb") as fh:
+            fh.seek(row * _ENTRY.size)
+            return _ENTRY.unpack(fh.read(_ENTRY.size))[0]
+
+    def iter_rows(self, start: int = 0) -> Iterator[Tuple[int, str]]:
+        """Yield (row_number, line) from ``start`` onwards, seeking straight to the first row."""
+        if start >= self.rows:
+            return
+        with self.jsonl_path.open("rb") as fh:
+            fh.seek(self.offset(start))
+            for row_no in range(start, self.rows):
+                raw = fh.readline()
+                if not raw:
+                    return
+                yield row_no, raw.decode("utf-8").rstrip("\n")
+
+
+def build_line_index(jsonl_path: Path) -> LineIndex:
+    """Backfill an index for an artifact written before indexes existed (one sequential scan).
+
+    The index is built under a temporary name and renamed into place, so concurrent
+    readers (console threads) never see a partially written file.
+    """
+    idx_path = index_path_for(jsonl_path)
+    fd, tmp = tempfile.mkstemp(prefix=idx_path.name + ".", suffix=".tmp", dir=idx_path.parent)
+    os.close(fd)
+    writer = LineIndexWriter(Path(tmp))
+    try:
+        with jsonl_path.open("rb") as fh:
+            for raw in fh:
+                writer.add_row(len(raw))
+        writer.close()
+        os.replace(tmp, idx_path)
+    except BaseException:
+        writer.close()
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    index = LineIndex.open(jsonl_path)
+    assert index is not None
+    return index
+
+
+def read_page(
+    jsonl_path: Path,
+    cursor: int = 0,
+    limit: int = 100,
+    predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    build_missing: bool = True,
+    scan_limit: int = DEFAULT_SCAN_ROWS,
+) -> Dict[str, Any]:
+    """Return up to ``limit`` rows starting at row ``cursor``.
+
+    Unfiltered pages are a single seek + ``limit`` reads. Filtered pages scan forward from
+    the cursor only until the page is full or ``scan_limit`` rows have been read, so a
+    selective filter never scans the whole log in one request; ``next_cursor`` resumes
+    where the scan stopped (a page may come back short, or empty, with a cursor).
+    """
+    if not jsonl_path.exists():
+        return {"items": [], "total": 0, "cursor": cursor, "next_cursor": None}
+    index = LineIndex.open(jsonl_path)
+    if index is None and build_missing:
+        try:
+            index = build_line_index(jsonl_path)
+        except OSError:
+            index = None  # read-only run dir: fall back to a sequential scan
+    if index is not None:
+        rows: Iterator[Tuple[int, str]] = index.iter_rows(cursor)
+        total: Optional[int] = len(index)
+    else:
+        rows = _scan_rows(jsonl_path, cursor)
+        total = None
+    items: List[Dict[str, Any]] = []
+    next_cursor: Optional[int] = None
+    scanned = 0
+    for row_no, line in rows:
+        if len(items) >= limit or scanned >= scan_limit:
+            next_cursor = row_no
+            break
+        scanned += 1
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            row = {"raw": line}
+        if predicate is None or predicate(row):
+            items.append(row)
+    return {"items": items, "total": total, "cursor": cursor, "next_cursor": next_cursor}
+
+
+def _scan_rows(jsonl_path: Path, start: int) -> Iterator[Tuple[int, str]]:
+    with jsonl_path.open("r", encoding="utf-8") as fh:
+        for row_no, line in enumerate(fh):
+            if row_no >= start:
+                yield row_no, line.rstrip("\n")
@@ -0,0 +1,255 @@
+"""Merkle trees over JSONL artifact rows (``<name>.jsonl.merkle``).
+
+Each row (its raw bytes, newline included) is a leaf; hashing follows RFC 6962:
+``leaf = sha256(0x00 || row)``, ``node = sha256(0x01 || left || right)``, and a level
+with an odd node count promotes its last node unchanged. The rows partition the file,
+so the root commits to every byte of the artifact. ``osctl run --merkle`` records the
+root of each JSONL artifact in ``proof_manifest.json``
+(``{"merkle": {"algorithm", "root", "leaves"}}``).
+
+The sidecar holds a 16-byte header (magic, little-endian uint64 leaf count) and then
+every level bottom-up, 32 bytes per node. A proof for rows ``[lo, hi)`` is the list of
+sibling hashes needed to rebuild the root from those rows: at most two per level, read
+with one seek each, so checking a row costs O(log n) instead of rehashing the artifact.
+"""
+from __future__ import annotations
+
+import hashlib
+import struct
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .line_index import LineIndex, build_line_index
+
+MERKLE_SUFFIX = ".merkle"
+MERKLE_ALGORITHM = "rfc6962-sha256-rows"
+_MAGIC = b"OSMRKL01"
+_HEADER = struct.Struct("<8sQ")
+_NODE = 32
+_BATCH_NODES = 65536  # nodes hashed per read while building upper levels (even)
+EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+
+class MerkleError(Exception):
+    """Raised for missing or malformed Merkle sidecars and out-of-range row requests."""
+
+
+def merkle_path_for(jsonl_path: Path) -> Path:
+    return jsonl_path.with_name(jsonl_path.name + MERKLE_SUFFIX)
+
+
+def leaf_hash(row: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + row).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def format_root(root: bytes) -> str:
+    return f"sha256:{root.hex()}"
+
+
+def _level_sizes(leaves: int) -> List[int]:
+    sizes = [leaves]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    return sizes
+
+
+def _range_steps(lo: int, hi: int, leaves: int) -> Iterator[Tuple[int, int, int, bool, bool]]:
+    # per level: (level, lo, hi, needs left sibling lo-1, needs right sibling hi); the
+    # prover and the verifier walk the same steps, so proofs carry no position data
+    level, size = 0, leaves
+    while size > 1:
+        yield level, lo, hi, lo % 2 == 1, hi % 2 == 1 and hi < size
+        level, lo, hi, size = level + 1, lo // 2, (hi + 1) // 2, (size + 1) // 2
+
+
+def root_from_range(leaf_hashes: Sequence[bytes], lo: int, leaves: int, proof: Sequence[bytes]) -> bytes:
+    """Rebuild the root from the hashes of leaves ``[lo, lo + len(leaf_hashes))`` and their proof."""
+    hi = lo + len(leaf_hashes)
+    if not 0 <= lo < hi <= leaves:
+        raise MerkleError(f"rows [{lo}, {hi}) outside a tree of {leaves} leaves")
+    nodes = list(leaf_hashes)
+    siblings = iter(proof)
+    try:
+        for _, _, _, need_left, need_right in _range_steps(lo, hi, leaves):
+            if need_left:
+                nodes.insert(0, next(siblings))
+            if need_right:
+                nodes.append(next(siblings))
+            nodes = [node_hash(nodes[i], nodes[i + 1]) if i + 1 < len(nodes) else nodes[i] for i in range(0, len(nodes), 2)]
+    except StopIteration:
+        raise MerkleError("proof is too short") from None
+    if next(siblings, None) is not None:
+        raise MerkleError("proof is too long")
+    return nodes[0]
+
+
+class MerkleRoot:
+    """Root of rows fed one at a time, in O(log n) memory (used by ``osctl verify``).
+
+    Complete subtrees are merged binary-carry style; folding what is left from the right
+    gives the same root as the level-by-level build.
+    """
+
+    def __init__(self) -> None:
+        self._stack: List[Tuple[int, bytes]] = []  # (height, hash) of complete subtrees
+        self.leaves = 0
+
+    def add_row(self, row: bytes) -> None:
+        height, digest = 0, leaf_hash(row)
+        while self._stack and self._stack[-1][0] == height:
+            digest = node_hash(self._stack.pop()[1], digest)
+            height += 1
+        self._stack.append((height, digest))
+        self.leaves += 1
+
+    def root(self) -> bytes:
+        if not self._stack:
+            return EMPTY_ROOT
+        digest = self._stack[-1][1]
+        for _, left in reversed(self._stack[:-1]):
+            digest = node_hash(left, digest)
+        return digest
+
+
+def root_of_lines(lines: Iterable[bytes]) -> Tuple[bytes, int]:
+    """(root, leaves) of raw JSONL lines, e.g. a binary file handle or zip member."""
+    acc = MerkleRoot()
+    for line in lines:
+        acc.add_row(line)
+    return acc.root(), acc.leaves
+
+
+class MerkleTree:
+    """Read side of a sidecar: root, leaf count and range proofs."""
+
+    def __init__(self, path: Path, fh: IO[bytes], leaves: int):
+        self.path = path
+        self._fh = fh
+        self.leaves = leaves
+        sizes = _level_sizes(leaves)
+        self._level_start = [_HEADER.size + _NODE * sum(sizes[:i]) for i in range(len(sizes))]
+
+    @classmethod
+    def open(cls, jsonl_path: Path) -> Optional["MerkleTree"]:
+        path = merkle_path_for(jsonl_path)
+        if not path.exists():
+            return None
+        fh = path.open("rb")
+        magic, leaves = _HEADER.unpack(fh.read(_HEADER.size).ljust(_HEADER.size, b"\0"))
+        if magic != _MAGIC or path.stat().st_size != _HEADER.size + _NODE * sum(_level_sizes(leaves)):
+            fh.close()
+            raise MerkleError(f"{path}: not a Merkle sidecar or truncated")
+        return cls(path, fh, leaves)
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self) -> "MerkleTree":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def node(self, level: int, index: int) -> bytes:
+        self._fh.seek(self._level_start[level] + _NODE * index)
+        return self._fh.read(_NODE)
+
+    @property
+    def root(self) -> bytes:
+        return self.node(len(self._level_start) - 1, 0) if self.leaves else EMPTY_ROOT
+
+    def range_proof(self, lo: int, hi: int) -> List[bytes]:
+        if not 0 <= lo < hi <= self.leaves:
+            raise MerkleError(f"rows [{lo}, {hi}) outside a tree of {self.leaves} leaves")
+        proof: List[bytes] = []
+        for level, level_lo, level_hi, need_left, need_right in _range_steps(lo, hi, self.leaves):
+            if need_left:
+                proof.append(self.node(level, level_lo - 1))
+            if need_right:
+                proof.append(self.node(level, level_hi))
+        return proof
+
+
+def build_merkle(jsonl_path: Path) -> Tuple[bytes, int]:
+    """Write ``<jsonl>.merkle`` in one sequential pass over the artifact; returns (root, leaves).
+
+    Leaves are streamed to the sidecar, then each upper level is built by reading the one
+    below it back in batches, so memory stays flat for any artifact size.
+    """
+    path = merkle_path_for(jsonl_path)
+    tmp = path.with_name(path.name + ".tmp")
+    leaves = 0
+    with tmp.open("w+b") as out:
+        out.write(_HEADER.pack(_MAGIC, 0))
+        with jsonl_path.open("rb") as fh:
+            batch: List[bytes] = []
+            for line in fh:
+                batch.append(leaf_hash(line))
+                if len(batch) >= _BATCH_NODES:
+                    out.write(b"".join(batch))
+                    leaves += len(batch)
+                    batch = []
+            out.write(b"".join(batch))
+            leaves += len(batch)
+        level_start, size = _HEADER.size, leaves
+        while size > 1:
+            next_start = level_start + _NODE * size
+            for first in range(0, size, _BATCH_NODES):
+                out.seek(level_start + _NODE * first)
+                data = out.read(_NODE * min(_BATCH_NODES, size - first))
+                nodes = [data[i : i + _NODE] for i in range(0, len(data), _NODE)]
+                parents = [node_hash(nodes[i], nodes[i + 1]) if i + 1 < len(nodes) else nodes[i] for i in range(0, len(nodes), 2)]
+                out.seek(0, 2)
+                out.write(b"".join(parents))
+            level_start, size = next_start, (size + 1) // 2
+        out.seek(level_start)
+        root = out.read(_NODE) if leaves else EMPTY_ROOT
+        out.seek(0)
+        out.write(_HEADER.pack(_MAGIC, leaves))
+    tmp.replace(path)
+    return root, leaves
+
+
+def merkle_ref(root: bytes, leaves: int) -> Dict[str, Any]:
+    """The ``merkle`` entry of a proof manifest artifact."""
+    return {"algorithm": MERKLE_ALGORITHM, "root": format_root(root), "leaves": leaves}
+
+
+def _read_rows(jsonl_path: Path, lo: int, hi: int) -> List[bytes]:
+    index = LineIndex.open(jsonl_path)
+    if index is None:
+        try:
+            index = build_line_index(jsonl_path)
+        except OSError:
+            index = None  # read-only run dir: scan to the first row instead
+    with jsonl_path.open("rb") as fh:
+        if index is not None:
+            if hi > len(index):
+                raise MerkleError(f"{jsonl_path.name} has {len(index)} rows")
+            fh.seek(index.offset(lo))
+        else:
+            for _ in range(lo):
+                fh.readline()
+        rows = [fh.readline() for _ in range(hi - lo)]
+    if not rows or not rows[-1]:
+        raise MerkleError(f"{jsonl_path.name} has fewer than {hi} rows")
+    return rows
+
+
+def prove_rows(jsonl_path: Path, lo: int, hi: int) -> Dict[str, Any]:
+    """Rows ``[lo, hi)`` of an artifact with their inclusion proof from its sidecar."""
+    tree = MerkleTree.open(jsonl_path)
+    if tree is None:
+        raise MerkleError(f"no Merkle sidecar for {jsonl_path.name} (run with --merkle)")
+    with tree:
+        proof = tree.range_proof(lo, hi)
+    return {"lo": lo, "hi": hi, "leaves": tree.leaves, "rows": _read_rows(jsonl_path, lo, hi), "proof": proof}
+
+
+def verify_rows(rows: Sequence[bytes], lo: int, leaves: int, proof: Sequence[bytes], expected_root: str) -> bool:
+    """Check raw ``rows`` (starting at row ``lo``) against a manifest root."""
+    return format_root(root_from_range([leaf_hash(row) for row in rows], lo, leaves, proof)) == expected_root
@@ -12,6 +12,8 @@ class ArtifactRef:
     sha256: str
     type: Optional[str] = None
     schema_version: Optional[str] = None
+    # JSONL artifacts with a Merkle sidecar: {"algorithm", "root", "leaves"} (see osctl.merkle)
+    merkle: Optional[Dict[str, Any]] = None
 
     @classmethod
     def from_path(cls, base_dir, path, type: Optional[str] = None) -> "ArtifactRef":
@@ -31,11 +33,19 @@ class ArtifactRef:
             data["type"] = self.type
         if self.schema_version:
             data["schema_version"] = self.schema_version
+        if self.merkle:
+            data["merkle"] = self.merkle
         return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ArtifactRef":
-        return cls(path=data["path"], sha256=data["sha256"], type=data.get("type"), schema_version=data.get("schema_version"))
+        return cls(
+            path=data["path"],
+            sha256=data["sha256"],
+            type=data.get("type"),
+            schema_version=data.get("schema_version"),
+            merkle=data.get("merkle"),
+        )
 
 
 @dataclass
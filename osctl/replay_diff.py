@@ -0,0 +1,168 @@
+"""Row-level diff of a run's outputs against its replay.
+
+``decision_log.jsonl`` and ``trigger_events.jsonl`` are compared as streams keyed by
+``event_id`` (rows without one fall back to their ordinal). Both sides are derived in event order, so rows normally pair up in
+lockstep and nothing is buffered; rows that arrive out of step wait in a bounded
+pending window (``max_pending`` keys per side) until their partner shows up, and are
+reported as missing/extra once evicted. Volatile fields are ignored.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from itertools import zip_longest
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from .utils import iter_jsonl, read_json
+
+VOLATILE_FIELDS: FrozenSet[str] = frozenset({"timestamp", "run_id"})
+# govdec's decision_id is derived from the run id ("dec-<run_id>")
+GOVDEC_VOLATILE_FIELDS: FrozenSet[str] = VOLATILE_FIELDS | {"decision_id"}
+DEFAULT_MAX_DIVERGENCES = 20
+DEFAULT_MAX_PENDING = 100000
+DIFF_ARTIFACTS = ("decision_log.jsonl", "trigger_events.jsonl")
+
+Row = Tuple[int, Dict[str, Any]]
+
+
+def diff_fields(expected: Dict[str, Any], actual: Dict[str, Any], volatile: FrozenSet[str] = VOLATILE_FIELDS) -> List[str]:
+    keys = (set(expected) | set(actual)) - volatile
+    return sorted(k for k in keys if expected.get(k) != actual.get(k))
+
+
+def _row_key(row: Optional[Row], key: str) -> Any:
+    # rows without the key pair by position rather than all sharing the key None
+    if row is None:
+        return None
+    value = row[1].get(key)
+    return ("row", row[0]) if value is None else value
+
+
+def _rows(path: Path) -> Iterator[Row]:
+    return enumerate(iter_jsonl(path)) if path.exists() else iter(())
+
+
+class _Pending:
+    """Rows from one side still waiting for a partner, oldest key first."""
+
+    def __init__(self) -> None:
+        self.rows: "OrderedDict[Any, deque]" = OrderedDict()
+        self.size = 0
+
+    def push(self, key: Any, row: Row) -> None:
+        self.rows.setdefault(key, deque()).append(row)
+        self.size += 1
+
+    def pop(self, key: Any) -> Optional[Row]:
+        queue = self.rows.get(key)
+        if not queue:
+            return None
+        row = queue.popleft()
+        if not queue:
+            del self.rows[key]
+        self.size -= 1
+        return row
+
+    def evict_oldest(self) -> Tuple[Any, deque]:
+        key, queue = self.rows.popitem(last=False)
+        self.size -= len(queue)
+        return key, queue
+
+
+class JsonlDiff:
+    def __init__(self, key: str = "event_id", max_divergences: int = DEFAULT_MAX_DIVERGENCES):
+        self.key = key
+        self.max_divergences = max_divergences
+        self.counts = {"rows_original": 0, "rows_replay": 0, "matched": 0, "changed": 0, "missing_in_replay": 0, "extra_in_replay": 0}
+        self.divergences: List[Dict[str, Any]] = []
+
+    def _record(self, kind: str, key: Any, **detail: Any) -> None:
+        self.counts[kind] += 1
+        if len(self.divergences) < self.max_divergences:
+            keyed = {"keyed_by": "row"} if isinstance(key, tuple) else {self.key: key}
+            self.divergences.append({"kind": kind, **keyed, **detail})
+
+    def compare(self, key: Any, original: Row, replay: Row) -> None:
+        fields = diff_fields(original[1], replay[1])
+        if fields:
+            self._record("changed", key, row_original=original[0], row_replay=replay[0], fields=fields)
+        else:
+            self.counts["matched"] += 1
+
+    def unpaired(self, kind: str, key: Any, rows: deque) -> None:
+        row_field = "row_original" if kind == "missing_in_replay" else "row_replay"
+        for row, _ in rows:
+            self._record(kind, key, **{row_field: row})
+
+    def result(self) -> Dict[str, Any]:
+        return {**self.counts, "divergences": self.divergences}
+
+
+def diff_jsonl(
+    original: Path,
+    replay: Path,
+    key: str = "event_id",
+    max_divergences: int = DEFAULT_MAX_DIVERGENCES,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> Dict[str, Any]:
+    """Merge-join ``original`` and ``replay`` rows on ``key``; memory is bounded by ``max_pending``."""
+    diff = JsonlDiff(key, max_divergences)
+    pending_orig = _Pending()
+    pending_replay = _Pending()
+    for orig_row, replay_row in zip_longest(_rows(original), _rows(replay)):
+        orig_key = _row_key(orig_row, key)
+        replay_key = _row_key(replay_row, key)
+        if orig_row:
+            diff.counts["rows_original"] += 1
+        if replay_row:
+            diff.counts["rows_replay"] += 1
+        # fast path: both streams in step
+        if orig_row and replay_row and orig_key == replay_key and not pending_orig.size and not pending_replay.size:
+            diff.compare(orig_key, orig_row, replay_row)
+            continue
+        if orig_row:
+            partner = pending_replay.pop(orig_key)
+            if partner:
+                diff.compare(orig_key, orig_row, partner)
+            else:
+                pending_orig.push(orig_key, orig_row)
+        if replay_row:
+            partner = pending_orig.pop(replay_key)
+            if partner:
+                diff.compare(replay_key, partner, replay_row)
+            else:
+                pending_replay.push(replay_key, replay_row)
+        while pending_orig.size > max_pending:
+            diff.unpaired("missing_in_replay", *pending_orig.evict_oldest())
+        while pending_replay.size > max_pending:
+            diff.unpaired("extra_in_replay", *pending_replay.evict_oldest())
+    while pending_orig.rows:
+        diff.unpaired("missing_in_replay", *pending_orig.evict_oldest())
+    while pending_replay.rows:
+        diff.unpaired("extra_in_replay", *pending_replay.evict_oldest())
+    return diff.result()
+
+
+def diff_run_outputs(
+    original_dir: Path,
+    replay_dir: Path,
+    max_divergences: int = DEFAULT_MAX_DIVERGENCES,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> Dict[str, Any]:
+    """Diff govdec.json, decision_log.jsonl and trigger_events.jsonl of a run and its replay."""
+    report: Dict[str, Any] = {}
+    diverged = False
+    for name in DIFF_ARTIFACTS:
+        result = diff_jsonl(original_dir / name, replay_dir / name, max_divergences=max_divergences, max_pending=max_pending)
+        diverged = diverged or any(result[k] for k in ("changed", "missing_in_replay", "extra_in_replay"))
+        report[name] = result
+    orig_govdec = original_dir / "govdec.json"
+    replay_govdec = replay_dir / "govdec.json"
+    if orig_govdec.exists() and replay_govdec.exists():
+        fields = diff_fields(read_json(orig_govdec), read_json(replay_govdec), GOVDEC_VOLATILE_FIELDS)
+    else:
+        fields = ["<missing>"]
+    diverged = diverged or bool(fields)
+    report["govdec.json"] = {"fields": fields}
+    report["status"] = "DIVERGED" if diverged else "MATCH"
+    return report
@@ -0,0 +1,249 @@
+"""PASS v2 rule engine: runtime config ``checks:`` compiled into an evaluation plan.
+
+Each check in the config (``{id, type, config}``) compiles to predicates keyed by
+``event_type`` (``type`` in older logs). A predicate returns the failed PASS axis
+(``A``/``E``/``T``/``C``) or ``None``. Evaluation is non-compensatory: an event's
+first failing predicate decides it (``FAIL`` + ``HOLD`` trigger); otherwise it is
+``PASS`` + ``ACT``. Dispatch is one dict lookup per event, so events whose type no
+predicate cares about cost almost nothing.
+
+``pass_v2`` options (defaults in ``PASS_V2_DEFAULTS``):
+
+- ``allow_missing_evidence_refs``: when false, evidence-bearing events must carry refs (E)
+- ``boundary_checks_enabled``: admissibility windows must be well formed and contain the
+  event timestamp (E); ``observed_latency_ms`` must not exceed ``sla_ms`` (T)
+- ``transfer_awareness_enabled``: governance decisions must name an ``override_owner``
+  (A) and carry a known ``cost_estimate`` (C)
+
+Gate evaluations (``GOV_GATE_EVAL``) and fired triggers (``TRIGGER_FIRED``) report their
+own axis state and are always honoured.
+"""
+from __future__ import annotations
+
+import functools
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+AXES = ("A", "E", "T", "C")
+# failed_axis for a gate that reports no witness path without naming a blocked indicator
+WHOLE_PATH_AXIS = "AETC"
+PASS_V2_DEFAULTS = {
+    "allow_missing_evidence_refs": True,
+    "boundary_checks_enabled": False,
+    "transfer_awareness_enabled": False,
+}
+EVIDENCE_EVENT_TYPES = ("EVIDENCE_EMIT", "EVIDENCE_SUBMITTED", "APPEAL_FILED")
+DECISION_EVENT_TYPES = ("GOV_DECISION",)
+
+Predicate = Callable[[Dict[str, Any]], Optional[str]]
+# (check_id, predicate) in evaluation order
+Rule = Tuple[str, Predicate]
+
+
+class RuleError(Exception):
+    """Raised for invalid ``checks:`` configuration."""
+
+
+def event_type_of(evt: Dict[str, Any]) -> Optional[str]:
+    return evt.get("event_type") or evt.get("type")
+
+
+def _parse_ts(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _evidence_present(evt: Dict[str, Any]) -> Optional[str]:
+    return None if (evt.get("evidence_refs") or evt.get("evidence_ref")) else "E"
+
+
+def _window_contains_event(evt: Dict[str, Any]) -> Optional[str]:
+    window = evt.get("admissibility_window")
+    if window is None:
+        return None
+    if not isinstance(window, dict):
+        return "E"
+    open_at = _parse_ts(window.get("open_at"))
+    close_at = _parse_ts(window.get("close_at"))
+    if open_at is None or close_at is None or close_at < open_at:
+        return "E"
+    ts = _parse_ts(evt.get("ts_utc") or evt.get("timestamp"))
+    if ts is not None and not open_at <= ts <= close_at:
+        return "E"
+    return None
+
+
+def _within_sla(evt: Dict[str, Any]) -> Optional[str]:
+    observed = evt.get("observed_latency_ms")
+    sla = evt.get("sla_ms")
+    if isinstance(observed, (int, float)) and isinstance(sla, (int, float)) and observed > sla:
+        return "T"
+    return None
+
+
+def _override_owner_named(evt: Dict[str, Any]) -> Optional[str]:
+    return None if evt.get("override_owner") else "A"
+
+
+def _cost_known(evt: Dict[str, Any]) -> Optional[str]:
+    cost = evt.get("cost_estimate")
+    return None if cost and cost != "unknown" else "C"
+
+
+def _gate_open(evt: Dict[str, Any]) -> Optional[str]:
+    state = evt.get("indicator_state") or {}
+    for axis in AXES:
+        if state.get(axis, "OPEN") != "OPEN":
+            return axis
+    if evt.get("witness_path_exists") is False or evt.get("verdict") == "FAIL":
+        return WHOLE_PATH_AXIS
+    return None
+
+
+def _trigger_clear(evt: Dict[str, Any]) -> Optional[str]:
+    mapping = evt.get("pass_mapping") or {}
+    if mapping.get("expected_effect") == "FAIL":
+        return mapping.get("indicator") or WHOLE_PATH_AXIS
+    return None
+
+
+def _compile_pass_v2(options: Dict[str, Any]) -> List[Tuple[str, Predicate]]:
+    opts = {**PASS_V2_DEFAULTS, **options}
+    rules: List[Tuple[str, Predicate]] = [("GOV_GATE_EVAL", _gate_open), ("TRIGGER_FIRED", _trigger_clear)]
+    if not opts["allow_missing_evidence_refs"]:
+        rules += [(t, _evidence_present) for t in EVIDENCE_EVENT_TYPES]
+    if opts["boundary_checks_enabled"]:
+        rules += [(t, _window_contains_event) for t in EVIDENCE_EVENT_TYPES]
+        rules += [(t, _within_sla) for t in DECISION_EVENT_TYPES]
+    if opts["transfer_awareness_enabled"]:
+        rules += [(t, _override_owner_named) for t in DECISION_EVENT_TYPES]
+        rules += [(t, _cost_known) for t in DECISION_EVENT_TYPES]
+    return rules
+
+
+CHECK_COMPILERS: Dict[str, Callable[[Dict[str, Any]], List[Tuple[str, Predicate]]]] = {
+    "pass_v2": _compile_pass_v2,
+}
+
+
+class EvaluationPlan:
+    """Compiled checks: ``event_type -> ((check_id, predicate), ...)``."""
+
+    def __init__(self, dispatch: Dict[str, Tuple[Rule, ...]], check_ids: Tuple[str, ...]):
+        self.dispatch = dispatch
+        self.check_ids = check_ids
+
+    def evaluate(self, evt: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """Return ``(failed_axis, check_id)`` for the first failing predicate, or ``(None, None)``."""
+        rules = self.dispatch.get(event_type_of(evt))
+        if rules:
+            for check_id, predicate in rules:
+                axis = predicate(evt)
+                if axis is not None:
+                    return axis, check_id
+        return None, None
+
+
+def compile_checks(checks: Optional[List[Dict[str, Any]]]) -> EvaluationPlan:
+    dispatch: Dict[str, List[Rule]] = {}
+    check_ids: List[str] = []
+    for i, check in enumerate(checks or []):
+        if not isinstance(check, dict):
+            raise RuleError(f"checks[{i}] must be a mapping")
+        check_type = check.get("type")
+        compiler = CHECK_COMPILERS.get(check_type)
+        if compiler is None:
+            raise RuleError(f"checks[{i}]: unknown check type {check_type!r} (known: {', '.join(sorted(CHECK_COMPILERS))})")
+        check_id = str(check.get("id") or f"{check_type}#{i}")
+        options = check.get("config") or {}
+        if not isinstance(options, dict):
+            raise RuleError(f"checks[{i}] ({check_id}): config must be a mapping")
+        for event_type, predicate in compiler(options):
+            dispatch.setdefault(event_type, []).append((check_id, predicate))
+        check_ids.append(check_id)
+    return EvaluationPlan({k: tuple(v) for k, v in dispatch.items()}, tuple(check_ids))
+
+
+def load_checks(config_path: Path) -> List[Dict[str, Any]]:
+    """Read the ``checks:`` block of a runtime config (an absent block means no checks)."""
+    try:
+        data = yaml.safe_load(config_path.read_text(encoding="utf-8"))
+    except yaml.YAMLError as exc:
+        raise RuleError(f"cannot parse config {config_path}: {exc}") from exc
+    checks = (data or {}).get("checks") if isinstance(data, dict) else None
+    if checks is None:
+        return []
+    if not isinstance(checks, list):
+        raise RuleError(f"{config_path}: checks must be a list")
+    return checks
+
+
+@functools.lru_cache(maxsize=8)
+def _plan_for(config_path: str, mtime_ns: int) -> EvaluationPlan:
+    return compile_checks(load_checks(Path(config_path)))
+
+
+def plan_for_config(config_path: Path) -> EvaluationPlan:
+    """Compile ``config_path``'s checks once per process (shard workers reuse the plan)."""
+    return _plan_for(str(config_path), config_path.stat().st_mtime_ns)
+
+
+class VerdictAccumulator:
+    """Folds decisions into the run verdict; shard accumulators merge in event order."""
+
+    def __init__(self) -> None:
+        self.decisions = 0
+        self.failed = 0
+        self.failed_axes: Counter = Counter()
+        self.first_failure: Optional[Tuple[int, str]] = None  # (row, axis)
+
+    def add(self, row: int, failed_axis: Optional[str]) -> None:
+        self.decisions += 1
+        if failed_axis is not None:
+            self.failed += 1
+            self.failed_axes[failed_axis] += 1
+            if self.first_failure is None or row < self.first_failure[0]:
+                self.first_failure = (row, failed_axis)
+
+    def merge(self, other: "VerdictAccumulator") -> None:
+        self.decisions += other.decisions
+        self.failed += other.failed
+        self.failed_axes.update(other.failed_axes)
+        if other.first_failure is not None and (self.first_failure is None or other.first_failure[0] < self.first_failure[0]):
+            self.first_failure = other.first_failure
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.summary(), "first_failure": list(self.first_failure) if self.first_failure else None}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VerdictAccumulator":
+        acc = cls()
+        acc.decisions = int(data.get("decisions", 0))
+        acc.failed = int(data.get("failed", 0))
+        acc.failed_axes.update(data.get("failed_axes") or {})
+        first = data.get("first_failure")
+        acc.first_failure = (int(first[0]), str(first[1])) if first else None
+        return acc
+
+    @property
+    def verdict(self) -> str:
+        return "FAIL" if self.failed else "PASS"
+
+    @property
+    def failed_axis(self) -> Optional[str]:
+        return self.first_failure[1] if self.first_failure else None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "decisions": self.decisions,
+            "failed": self.failed,
+            "failed_axes": dict(sorted(self.failed_axes.items())),
+        }
@@ -0,0 +1,236 @@
+"""SQLite catalog of runs under an out dir, kept current by osctl run/verify.
+
+Rows are keyed by run_id, which is also the run's directory name. Runs written without
+the index (or removed from disk) are picked up lazily: the out dir's mtime changes
+whenever a run dir is added or removed, and ``query_runs`` reconciles the index with
+the directory listing when that mtime differs from the one recorded at the last pass.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .utils import read_json
+
+INDEX_FILENAME = "run_index.sqlite"
+
+SLI_COLUMNS = ("decision_latency_p95_ms", "evidence_lag_p95_min", "ce_open_count", "verify_fail_rate")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT,
+    tag TEXT,
+    cohort_id TEXT,
+    status TEXT,
+    artifacts TEXT,
+    decision_latency_p95_ms REAL,
+    evidence_lag_p95_min REAL,
+    ce_open_count INTEGER,
+    verify_fail_rate REAL
+);
+CREATE INDEX IF NOT EXISTS runs_status ON runs(status);
+CREATE INDEX IF NOT EXISTS runs_tag ON runs(tag);
+CREATE INDEX IF NOT EXISTS runs_cohort ON runs(cohort_id);
+CREATE INDEX IF NOT EXISTS runs_created ON runs(created_at);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def index_path(run_root: Path) -> Path:
+    return run_root / INDEX_FILENAME
+
+
+def connect(run_root: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(index_path(run_root)), timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _default_metrics_root(run_root: Path) -> Path:
+    return run_root.parent / "metrics"
+
+
+def _load_optional(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        return read_json(path)
+    except Exception:
+        return {}
+
+
+def _run_row(run_dir: Path, metrics_root: Path) -> Optional[Dict[str, Any]]:
+    manifest_path = run_dir / "run_manifest.json"
+    if not manifest_path.exists():
+        return None
+    man = read_json(manifest_path)
+    verify = _load_optional(run_dir / "verify_report.json")
+    metrics = _load_optional(metrics_root / f"runtime_sli_{man.get('run_id')}.json")
+    row = {
+        "run_id": man.get("run_id") or run_dir.name,
+        "created_at": man.get("created_at"),
+        "tag": man.get("tag"),
+        "cohort_id": man.get("cohort_id"),
+        "status": verify.get("overall_status", "UNKNOWN"),
+        "artifacts": json.dumps(man.get("artifacts", {})),
+    }
+    for col in SLI_COLUMNS:
+        row[col] = metrics.get(col)
+    return row
+
+
+def _upsert(conn: sqlite3.Connection, row: Dict[str, Any]) -> None:
+    cols = list(row)
+    conn.execute(
+        f"INSERT OR REPLACE INTO runs ({', '.join(cols)}) VALUES ({', '.join('?' for _ in cols)})",
+        [row[c] for c in cols],
+    )
+
+
+def upsert_run(run_root: Path, run_dir: Path, metrics_root: Optional[Path] = None) -> bool:
+    """Best-effort index update for one run; a broken index never fails a run or verify."""
+    try:
+        row = _run_row(run_dir, metrics_root or _default_metrics_root(run_root))
+        if row is None:
+            return False
+        conn = connect(run_root)
+        try:
+            with conn:
+                _upsert(conn, row)
+        finally:
+            conn.close()
+        return True
+    except (sqlite3.Error, OSError, ValueError):
+        return False
+
+
+def _root_stamp(run_root: Path) -> str:
+    return str(run_root.stat().st_mtime_ns)
+
+
+def _set_stamp(conn: sqlite3.Connection, stamp: str) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('root_mtime_ns', ?)", (stamp,))
+
+
+def reconcile_index(run_root: Path, metrics_root: Optional[Path] = None) -> None:
+    """Drop rows whose run dir is gone and index run dirs the index has never seen."""
+    metrics_root = metrics_root or _default_metrics_root(run_root)
+    # stamp first: a run dir added during the scan changes the mtime again and is
+    # picked up by the next pass
+    stamp = _root_stamp(run_root)
+    present = {d.name: d for d in run_root.iterdir() if d.is_dir() and (d / "run_manifest.json").exists()}
+    conn = connect(run_root)
+    try:
+        with conn:
+            indexed = {r[0] for r in conn.execute("SELECT run_id FROM runs")}
+            conn.executemany("DELETE FROM runs WHERE run_id = ?", [(run_id,) for run_id in indexed - present.keys()])
+            for name in present.keys() - indexed:
+                try:
+                    row = _run_row(present[name], metrics_root)
+                except Exception:
+                    row = None
+                if row is not None:
+                    _upsert(conn, row)
+            _set_stamp(conn, stamp)
+    finally:
+        conn.close()
+
+
+def _index_is_current(run_root: Path) -> bool:
+    conn = sqlite3.connect(f"file:{index_path(run_root)}?mode=ro", uri=True, timeout=30)
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'root_mtime_ns'").fetchone()
+    except sqlite3.OperationalError:
+        row = None  # index written before the meta table existed
+    finally:
+        conn.close()
+    return row is not None and row[0] == _root_stamp(run_root)
+
+
+def rebuild_index(run_root: Path, metrics_root: Optional[Path] = None) -> int:
+    metrics_root = metrics_root or _default_metrics_root(run_root)
+    count = 0
+    stamp = _root_stamp(run_root)
+    conn = connect(run_root)
+    try:
+        with conn:
+            conn.execute("DELETE FROM runs")
+            for run_dir in run_root.iterdir():
+                if not run_dir.is_dir():
+                    continue
+                try:
+                    row = _run_row(run_dir, metrics_root)
+                except Exception:
+                    row = None
+                if row is None:
+                    continue
+                _upsert(conn, row)
+                count += 1
+            _set_stamp(conn, stamp)
+    finally:
+        conn.close()
+    return count
+
+
+def query_runs(
+    run_root: Path,
+    limit: int = 50,
+    offset: int = 0,
+    status: Optional[str] = None,
+    tag: Optional[str] = None,
+    cohort_id: Optional[str] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """Runs newest-first (by run_id, like the directory listing), or None when no usable index exists.
+
+    The index is reconciled with the out dir first if run dirs were added or removed
+    since the last pass; if that fails (e.g. a read-only out dir) callers fall back to
+    scanning the directory.
+    """
+    if not index_path(run_root).exists():
+        return None
+    try:
+        if not _index_is_current(run_root):
+            reconcile_index(run_root)
+    except (sqlite3.Error, OSError):
+        return None
+    where = []
+    params: List[Any] = []
+    for col, value in (("status", status), ("tag", tag), ("cohort_id", cohort_id)):
+        if value is not None:
+            where.append(f"{col} = ?")
+            params.append(value)
+    sql = "SELECT * FROM runs"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY run_id DESC LIMIT ? OFFSET ?"
+    params.extend([limit, offset])
+    conn = sqlite3.connect(f"file:{index_path(run_root)}?mode=ro", uri=True, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+    items = []
+    for r in rows:
+        item = dict(r)
+        item["artifacts"] = json.loads(item["artifacts"] or "{}")
+        items.append(item)
+    return items
+
+
+def index_command(args) -> int:
+    run_root = Path(args.out_dir)
+    try:
+        if not run_root.exists():
+            raise FileNotFoundError(f"out dir not found: {run_root}")
+        count = rebuild_index(run_root, Path(args.metrics_root) if args.metrics_root else None)
+        print(json.dumps({"status": "SUCCESS", "index": str(index_path(run_root)), "indexed": count}))
+        return 0
+    except Exception as exc:
+        print(json.dumps({"status": "ERROR", "error": str(exc)}))
+        return 2
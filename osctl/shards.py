@@ -0,0 +1,88 @@
+"""Newline-aligned byte-range sharding for JSONL files."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MIN_SHARD_BYTES = 4 * 1024 * 1024
+
+
+def split_byte_ranges(
+    path: Path, shards: int, min_shard_bytes: int = MIN_SHARD_BYTES, start: int = 0
+) -> List[Tuple[int, int]]:
+    """Split ``path[start:]`` into at most ``shards`` [start, end) ranges that begin and end on line boundaries.
+
+    ``start`` must itself be a line boundary.
+    """
+    size = path.stat().st_size
+    if size <= start:
+        return []
+    shards = max(1, min(shards, (size - start) // max(1, min_shard_bytes)))
+    bounds = [start]
+    with path.open("rb") as fh:
+        for i in range(1, shards):
+            target = max(bounds[-1], start + (size - start) * i // shards)
+            fh.seek(target)
+            if target > 0:
+                fh.seek(target - 1)
+                fh.readline()  # advance to the start of the next line
+            pos = fh.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _iter_lines(path: Path, start: int, end: Optional[int]) -> Iterator[Tuple[int, int, str]]:
+    # (offset, offset just past the line, stripped line) for every non-blank line
+    with path.open("rb") as fh:
+        fh.seek(start)
+        pos = start
+        while end is None or pos < end:
+            raw = fh.readline()
+            if not raw:
+                break
+            offset = pos
+            pos += len(raw)
+            line = raw.decode("utf-8").strip()
+            if line:
+                yield offset, pos, line
+
+
+def count_rows(path: Path, start: int, end: int) -> int:
+    # counts the rows _iter_lines would yield without decoding ASCII lines
+    count = 0
+    with path.open("rb") as fh:
+        fh.seek(start)
+        pos = start
+        while pos < end:
+            raw = fh.readline()
+            if not raw:
+                break
+            pos += len(raw)
+            if raw.strip() and (raw.isascii() or raw.decode("utf-8").strip()):
+                count += 1
+    return count
+
+
+def iter_jsonl_offsets(path: Path, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (byte_offset, row) with the row semantics of utils.iter_jsonl, within [start, end)."""
+    for offset, _, row in iter_jsonl_spans(path, start, end):
+        yield offset, row
+
+
+def iter_jsonl_spans(path: Path, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """Like ``iter_jsonl_offsets`` but also yields the offset just past each row (resume points)."""
+    for offset, next_offset, line in _iter_lines(path, start, end):
+        try:
+            yield offset, next_offset, json.loads(line)
+        except json.JSONDecodeError:
+            yield offset, next_offset, {"raw": line}
+
+
+def iter_jsonl_range(path: Path, start: int, end: int) -> Iterator[Dict[str, Any]]:
+    for _, row in iter_jsonl_offsets(path, start, end):
+        yield row
@@ -0,0 +1,330 @@
+"""Mergeable quantile sketches for run SLIs (``sli_sketch.json``).
+
+``DDSketch`` maps each positive value ``x`` to bucket ``ceil(log_gamma(x))`` with
+``gamma = (1 + a) / (1 - a)``, so any quantile is returned within relative error ``a``
+(default 1%). Sketches with the same accuracy merge by adding bucket counts, which is
+how cohort / time-window percentiles are served without rescanning event logs. When a
+sketch exceeds ``max_buckets`` the lowest buckets are collapsed (the high quantiles
+SLOs care about keep their accuracy).
+
+``osctl run`` builds one sketch per SLI while deriving the run (``SketchAccumulator``)
+and writes them to ``<run_dir>/sli_sketch.json``.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .correlator import DEFAULT_ALLOWED_LATENESS_S, DEFAULT_MAX_OPEN_TRACES, DEFAULT_TRACE_TTL_S
+from .events import CHUNK_ROWS, EVIDENCE_EVENT, TRIGGER_EVENT, epoch_seconds
+from .expiry import KeyedExpiryStore, trace_key_of
+from .utils import write_json
+
+SKETCH_FILENAME = "sli_sketch.json"
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 2048
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+SKETCHED_SLIS = ("decision_latency_ms", "evidence_lag_min")
+
+
+class SketchError(Exception):
+    """Raised when sketches cannot be merged or decoded."""
+
+
+class DDSketch:
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, max_buckets: int = DEFAULT_MAX_BUCKETS):
+        if not 0 < relative_accuracy < 1:
+            raise SketchError(f"relative_accuracy must be in (0, 1): {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.add_many(np.asarray([value], dtype=np.float64))
+
+    def add_many(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += int(len(values))
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        positive = values[values > 0]
+        self.zero_count += int(len(values) - len(positive))  # latencies/lags are non-negative
+        if len(positive):
+            keys, counts = np.unique(np.ceil(np.log(positive) / self._log_gamma).astype(np.int64), return_counts=True)
+            for key, n in zip(keys.tolist(), counts.tolist()):
+                self.buckets[key] = self.buckets.get(key, 0) + n
+            self._collapse()
+
+    def _collapse(self) -> None:
+        if len(self.buckets) <= self.max_buckets:
+            return
+        keys = sorted(self.buckets)
+        excess = keys[: len(keys) - self.max_buckets + 1]
+        floor = keys[len(keys) - self.max_buckets]
+        self.buckets[floor] = self.buckets.get(floor, 0) + sum(self.buckets.pop(k) for k in excess if k != floor)
+
+    def merge(self, other: "DDSketch") -> None:
+        if abs(other.relative_accuracy - self.relative_accuracy) > 1e-12:
+            raise SketchError("cannot merge sketches with different relative accuracy")
+        for key, n in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        if not 0 <= q <= 1:
+            raise SketchError(f"quantile must be in [0, 1]: {q}")
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                value = 2 * self.gamma**key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"count": self.count}
+        for q in quantiles:
+            value = self.quantile(q)
+            out[f"p{round(q * 100):g}"] = None if value is None else round(value, 3)
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "zero_count": self.zero_count,
+            "buckets": {str(k): v for k, v in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DDSketch":
+        sketch = cls(data.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY), data.get("max_buckets", DEFAULT_MAX_BUCKETS))
+        sketch.buckets = {int(k): int(v) for k, v in (data.get("buckets") or {}).items()}
+        sketch.zero_count = int(data.get("zero_count", 0))
+        sketch.count = int(data.get("count", 0))
+        sketch.sum = float(data.get("sum", 0.0))
+        sketch.min = math.inf if data.get("min") is None else float(data["min"])
+        sketch.max = -math.inf if data.get("max") is None else float(data["max"])
+        return sketch
+
+
+class _LagTrace:
+    __slots__ = ("triggers", "evidence", "last_ts", "deadline")
+
+    def __init__(self) -> None:
+        self.triggers: List[float] = []
+        self.evidence: List[float] = []
+        self.last_ts = -math.inf
+        self.deadline = math.inf
+
+
+class SketchAccumulator:
+    """Folds an event log into the SLI sketches as it streams past, in bounded memory.
+
+    Latencies go straight into a sketch. Evidence lag is a per-trace join on the
+    correlator's keyed store (``expiry.KeyedExpiryStore``, same trace key): trigger and
+    evidence timestamps wait until the watermark passes the trace's last event plus
+    ``trace_ttl``, then the trace's lags are added to the lag sketch and its state
+    dropped. Rows are buffered and their timestamps parsed every ``CHUNK_ROWS`` events.
+
+    Shard workers pass ``defer_lags=True`` and only record their trigger/evidence events;
+    the parent ``merge``s shards in event order, so lags do not depend on ``--workers``.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        allowed_lateness: float = DEFAULT_ALLOWED_LATENESS_S,
+        trace_ttl: float = DEFAULT_TRACE_TTL_S,
+        max_open_traces: int = DEFAULT_MAX_OPEN_TRACES,
+        defer_lags: bool = False,
+    ):
+        self.allowed_lateness = allowed_lateness
+        self.trace_ttl = trace_ttl
+        self.max_open_traces = max_open_traces
+        self.defer_lags = defer_lags
+        self.events = 0
+        self.latency_sketch = DDSketch(relative_accuracy)
+        self.lag_sketch = DDSketch(relative_accuracy)
+        self._traces: KeyedExpiryStore[_LagTrace] = KeyedExpiryStore(self._expire, allowed_lateness, max_open_traces)
+        self._lag_buf: List[float] = []
+        # (trace key, is trigger, epoch seconds) recorded by a deferring shard worker
+        self._deferred: List[Tuple[str, bool, float]] = []
+        self._lat_buf: List[float] = []
+        self._buf: List[Tuple[str, bool, Any]] = []
+        self._buffered = 0
+
+    def add(self, event: Dict[str, Any]) -> None:
+        self.events += 1
+        value = event.get("observed_latency_ms")
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            self._lat_buf.append(value)
+        kind = event.get("event_type") or event.get("type")
+        if kind in (TRIGGER_EVENT, EVIDENCE_EVENT):
+            trace_key = trace_key_of(event)
+            if trace_key is not None:
+                self._buf.append((trace_key, kind == TRIGGER_EVENT, event.get("ts_utc") or event.get("timestamp")))
+        self._buffered += 1
+        if self._buffered >= CHUNK_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._lat_buf:
+            self.latency_sketch.add_many(np.asarray(self._lat_buf, dtype=np.float64))
+            self._lat_buf = []
+        if self._buf:
+            ts = epoch_seconds([t for _, _, t in self._buf])
+            for (trace_key, is_trigger, _), epoch in zip(self._buf, ts.tolist()):
+                if not math.isnan(epoch):
+                    self._add_lag_event(trace_key, is_trigger, epoch)
+            self._buf = []
+        self._flush_lags()
+        self._buffered = 0
+
+    def _add_lag_event(self, trace_key: str, is_trigger: bool, ts: float) -> None:
+        if self.defer_lags:
+            self._deferred.append((trace_key, is_trigger, ts))
+            return
+        trace = self._traces.get(trace_key) or self._traces.put(trace_key, _LagTrace())
+        (trace.triggers if is_trigger else trace.evidence).append(ts)
+        if ts > trace.last_ts:
+            trace.last_ts = ts
+            self._traces.schedule(trace_key, ts + self.allowed_lateness + self.trace_ttl)
+        self._traces.observe(ts)
+        self._traces.enforce_cap()
+
+    def _expire(self, trace: _LagTrace, evicted: bool) -> None:
+        self._close(trace)
+
+    def _close(self, trace: _LagTrace) -> None:
+        # per trigger: minutes to the first evidence at/after it, 0 if evidence was already in
+        if not trace.evidence:
+            return
+        evidence = sorted(trace.evidence)
+        for ts in trace.triggers:
+            i = bisect.bisect_left(evidence, ts)
+            self._lag_buf.append((evidence[i] - ts) / 60.0 if i < len(evidence) else 0.0)
+        if len(self._lag_buf) >= CHUNK_ROWS:
+            self._flush_lags()
+
+    def _flush_lags(self) -> None:
+        if self._lag_buf:
+            self.lag_sketch.add_many(np.asarray(self._lag_buf, dtype=np.float64))
+            self._lag_buf = []
+
+    def merge(self, other: "SketchAccumulator") -> None:
+        """Fold in an accumulator over the next part of the log (a shard, in event order)."""
+        other.flush()
+        self.events += other.events
+        self.latency_sketch.merge(other.latency_sketch)
+        self.lag_sketch.merge(other.lag_sketch)
+        for trace_key, is_trigger, ts in other._deferred:
+            self._add_lag_event(trace_key, is_trigger, ts)
+        self._flush_lags()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sketches, open traces and unflushed rows, as plain JSON (for run checkpoints)."""
+        return {
+            "allowed_lateness": self.allowed_lateness,
+            "trace_ttl": self.trace_ttl,
+            "max_open_traces": self.max_open_traces,
+            "events": self.events,
+            "latency_sketch": self.latency_sketch.to_dict(),
+            "lag_sketch": self.lag_sketch.to_dict(),
+            **self._traces.to_dict(),
+            "open": [[trace_key, t.triggers, t.evidence, t.last_ts] for trace_key, t in self._traces.open.items()],
+            # buffered rows go along as they are, so a resumed run flushes at the same rows
+            "lat_buf": self._lat_buf,
+            "buf": [list(row) for row in self._buf],
+            "lag_buf": self._lag_buf,
+            "buffered": self._buffered,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SketchAccumulator":
+        latency_sketch = DDSketch.from_dict(data["latency_sketch"])
+        acc = cls(latency_sketch.relative_accuracy, float(data["allowed_lateness"]), float(data["trace_ttl"]), int(data["max_open_traces"]))
+        acc.events = int(data["events"])
+        acc.latency_sketch = latency_sketch
+        acc.lag_sketch = DDSketch.from_dict(data["lag_sketch"])
+        acc._traces.restore(data)
+        for trace_key, triggers, evidence, last_ts in data.get("open") or []:
+            trace = acc._traces.open[trace_key] = _LagTrace()
+            trace.triggers, trace.evidence, trace.last_ts = triggers, evidence, float(last_ts)
+            trace.deadline = trace.last_ts + acc.allowed_lateness + acc.trace_ttl
+        acc._lat_buf = list(data.get("lat_buf") or [])
+        acc._buf = [(trace_key, bool(is_trigger), ts) for trace_key, is_trigger, ts in data.get("buf") or []]
+        acc._lag_buf = list(data.get("lag_buf") or [])
+        acc._buffered = int(data.get("buffered", 0))
+        return acc
+
+    def sketches(self) -> Dict[str, DDSketch]:
+        """Close every trace still open (end of log) and return the sketches."""
+        self.flush()
+        for trace in self._traces.drain():
+            self._close(trace)
+        self._flush_lags()
+        return {"decision_latency_ms": self.latency_sketch, "evidence_lag_min": self.lag_sketch}
+
+
+def write_sketches(path: Path, run_id: str, created_at: Optional[str], accumulator: SketchAccumulator) -> str:
+    sketches = accumulator.sketches()
+    return write_json(
+        path,
+        {
+            "schema_version": "1.0",
+            "run_id": run_id,
+            "created_at": created_at,
+            "events": accumulator.events,
+            **{name: sketch.to_dict() for name, sketch in sketches.items()},
+        },
+    )
+
+
+def merge_sketch_docs(docs: Iterable[Dict[str, Any]], quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+    """Merge ``sli_sketch.json`` documents; returns per-SLI quantile summaries."""
+    merged: Dict[str, DDSketch] = {}
+    runs: List[str] = []
+    for doc in docs:
+        runs.append(doc.get("run_id"))
+        for name in SKETCHED_SLIS:
+            if not doc.get(name):
+                continue
+            sketch = DDSketch.from_dict(doc[name])
+            if name in merged:
+                merged[name].merge(sketch)
+            else:
+                merged[name] = sketch
+    return {
+        "runs": len(runs),
+        **{name: (merged[name].summary(quantiles) if name in merged else {"count": 0}) for name in SKETCHED_SLIS},
+    }
@@ -0,0 +1,180 @@
+"""Runtime SLIs (docs/Runtime_SLI_SLO_Spec_v1.md) -> ``runtime_sli_<run_id>.json``.
+
+- ``decision_latency_p95_ms``: p95 of ``observed_latency_ms`` over events that carry it.
+- ``evidence_lag_p95_min``: for each ``TRIGGER_FIRED`` whose trace has an ``EVIDENCE_EMIT``,
+  minutes from the trigger to the first evidence at or after it (0 when the evidence was
+  already committed); p95 over those triggers.
+- ``verify_success_rate``: share of PASS verify reports over the last ``window`` runs (by
+  ``created_at``) up to and including this one; ``verify_fail_rate`` is its complement.
+- ``ce_open_count``: CE ledger entries with ``status != "MITIGATED"`` (entries tagged with a
+  different ``run_id`` are skipped).
+
+The event log is streamed through ``sketch.SketchAccumulator`` in bounded memory: p95s
+come from its quantile sketches (1% relative error) and evidence lag from its per-trace
+join, which drops a trace once the watermark is ``trace_ttl`` past its last event.
+"""
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .models import RunManifest
+from .run_index import upsert_run
+from .sketch import SketchAccumulator
+from .utils import ensure_dir, iter_jsonl, now_utc_iso, read_json, write_json
+
+DEFAULT_VERIFY_WINDOW = 20
+DEFAULT_CE_LEDGER = Path("ledger/pilots/TeamA/CE_Ledger_v1.jsonl")
+SLO_TARGETS = {
+    "decision_latency_p95_ms": ("<=", 500.0),
+    "evidence_lag_p95_min": ("<=", 60.0),
+    "verify_success_rate": (">=", 0.99),
+    "ce_open_count": ("<=", 3),
+}
+
+
+class SLIError(Exception):
+    """Raised when SLIs cannot be computed for a run."""
+
+
+def metrics_path_for(metrics_root: Path, run_id: str) -> Path:
+    return metrics_root / f"runtime_sli_{run_id}.json"
+
+
+def _p95(sketch: Any) -> Optional[float]:
+    value = sketch.quantile(0.95)
+    return None if value is None else round(value, 3)
+
+
+def event_slis(events_path: Path) -> Dict[str, Any]:
+    acc = SketchAccumulator()
+    for event in iter_jsonl(events_path):
+        acc.add(event)
+    sketches = acc.sketches()
+    lat, lags = sketches["decision_latency_ms"], sketches["evidence_lag_min"]
+    return {
+        "decision_latency_p95_ms": _p95(lat),
+        "evidence_lag_p95_min": _p95(lags),
+        "counts": {"events": acc.events, "latency_samples": lat.count, "evidence_linked_triggers": lags.count},
+    }
+
+
+def _verify_history(run_root: Path) -> List[Tuple[str, str, bool]]:
+    """(created_at, run_id, passed) for every verified run under ``run_root``, oldest first."""
+    history = []
+    for run_dir in run_root.iterdir() if run_root.exists() else []:
+        manifest_path = run_dir / "run_manifest.json"
+        report_path = run_dir / "verify_report.json"
+        if not manifest_path.exists() or not report_path.exists():
+            continue
+        try:
+            status = read_json(report_path).get("overall_status")
+            man = read_json(manifest_path)
+        except (OSError, ValueError):
+            continue
+        if status in ("PASS", "FAIL"):
+            history.append((man.get("created_at") or "", man.get("run_id") or run_dir.name, status == "PASS"))
+    return sorted(history)
+
+
+def verify_success_rate(history: List[Tuple[str, str, bool]], run_id: str, window: int = DEFAULT_VERIFY_WINDOW) -> Optional[float]:
+    ids = [r for _, r, _ in history]
+    end = ids.index(run_id) + 1 if run_id in ids else len(history)
+    recent = np.array([ok for _, _, ok in history[max(0, end - window) : end]], dtype=np.bool_)
+    return round(float(recent.mean()), 4) if len(recent) else None
+
+
+def ce_open_count(ce_ledger: Optional[Path], run_id: str) -> Optional[int]:
+    if ce_ledger is None or not ce_ledger.exists():
+        return None
+    count = 0
+    for entry in iter_jsonl(ce_ledger):
+        if entry.get("run_id") not in (None, run_id):
+            continue
+        if entry.get("status") != "MITIGATED":
+            count += 1
+    return count
+
+
+def slo_report(slis: Dict[str, Any]) -> Dict[str, Any]:
+    report = {}
+    for name, (op, target) in SLO_TARGETS.items():
+        value = slis.get(name)
+        ok = None if value is None else (value <= target if op == "<=" else value >= target)
+        report[name] = {"target": f"{op} {target}", "ok": ok}
+    return report
+
+
+def compute_run_slis(
+    run_dir: Path,
+    ce_ledger: Optional[Path] = None,
+    window: int = DEFAULT_VERIFY_WINDOW,
+    history: Optional[List[Tuple[str, str, bool]]] = None,
+) -> Dict[str, Any]:
+    manifest_path = run_dir / "run_manifest.json"
+    if not manifest_path.exists():
+        raise SLIError(f"run manifest not found: {manifest_path}")
+    manifest = RunManifest.from_dict(read_json(manifest_path))
+    events_path = Path(manifest.events["path"])
+    if not events_path.is_absolute():
+        events_path = run_dir / events_path
+    if not events_path.exists():
+        raise SLIError(f"event log not found: {events_path}")
+
+    slis: Dict[str, Any] = {"schema_version": "1.0", "run_id": manifest.run_id, "computed_at": now_utc_iso()}
+    events = event_slis(events_path)
+    counts = events.pop("counts")
+    slis.update(events)
+    history = history if history is not None else _verify_history(run_dir.parent)
+    rate = verify_success_rate(history, manifest.run_id, window)
+    slis["verify_success_rate"] = rate
+    slis["verify_fail_rate"] = None if rate is None else round(1.0 - rate, 4)
+    slis["ce_open_count"] = ce_open_count(ce_ledger, manifest.run_id)
+    counts["verify_window"] = min(window, len(history))
+    slis["counts"] = counts
+    slis["slo"] = slo_report(slis)
+    return slis
+
+
+def _sli_job(run_dir: str, run_root: str, metrics_root: str, ce_ledger: Optional[str], window: int, history: List[Tuple[str, str, bool]]) -> Dict[str, Any]:
+    try:
+        slis = compute_run_slis(Path(run_dir), Path(ce_ledger) if ce_ledger else None, window, history)
+        path = metrics_path_for(Path(metrics_root), slis["run_id"])
+        write_json(path, slis)
+        upsert_run(Path(run_root), Path(run_dir), Path(metrics_root))
+        return {"run_id": slis["run_id"], "status": "SUCCESS", "metrics": str(path)}
+    except Exception as exc:  # keep the rest of the batch going
+        return {"run_id": Path(run_dir).name, "status": "ERROR", "error": str(exc)}
+
+
+def sli_command(args) -> int:
+    run_root = Path(args.out_dir)
+    metrics_root = ensure_dir(Path(args.metrics_root) if args.metrics_root else run_root.parent / "metrics")
+    ce_ledger = args.ce_ledger or (str(DEFAULT_CE_LEDGER) if DEFAULT_CE_LEDGER.exists() else None)
+    if args.all:
+        run_dirs = sorted(str(p) for p in run_root.iterdir() if (p / "run_manifest.json").exists()) if run_root.exists() else []
+    elif args.run_id:
+        run_dirs = [str(run_root / r) for r in args.run_id]
+    else:
+        print(json.dumps({"status": "ERROR", "error": "--run-id or --all is required"}))
+        return 2
+    history = _verify_history(run_root)
+    jobs = [(d, str(run_root), str(metrics_root), ce_ledger, args.window, history) for d in run_dirs]
+    workers = args.workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        results = [_sli_job(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            results = list(pool.map(_sli_job, *zip(*jobs)))
+    failed = [r for r in results if r["status"] != "SUCCESS"]
+    if len(results) == 1:
+        print(json.dumps(results[0]))
+    else:
+        status = "SUCCESS" if not failed else ("PARTIAL" if len(failed) < len(results) else "ERROR")
+        print(json.dumps({"status": status, "runs": len(results), "failed": len(failed), "results": results}))
+    return 0 if not failed else 1
@@ -0,0 +1,83 @@
+"""Per-run SQLite index from decision_id / trace_id to event rows and byte offsets.
+
+Written by ``osctl run`` next to the event log copy so ``osctl replay --decision-id`` can
+seek straight to the events of one decision's trace.
+"""
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Tuple
+
+TRACE_INDEX_FILENAME = "trace_index.sqlite"
+_BATCH_ROWS = 10000
+
+TraceKey = Tuple[int, int, Optional[Any], Optional[Any]]  # (event row, byte offset, trace_id, decision_id)
+
+
+class TraceIndexWriter:
+    """Bulk loader; ``resume_rows`` keeps the first rows of an interrupted run's index."""
+
+    def __init__(self, path: Path, resume_rows: Optional[int] = None):
+        self.path = path
+        self._pending: List[TraceKey] = []
+        if resume_rows is not None:
+            try:
+                self._conn = sqlite3.connect(str(path))
+                self._conn.execute("DELETE FROM events WHERE row >= ?", (resume_rows,))
+                self._conn.commit()
+                return
+            except sqlite3.DatabaseError:
+                self._conn.close()
+                raise
+        if path.exists():
+            path.unlink()
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE events (row INTEGER PRIMARY KEY, offset INTEGER NOT NULL, trace_id TEXT, decision_id TEXT)"
+        )
+
+    def add(self, key: TraceKey) -> None:
+        self._pending.append(key)
+        if len(self._pending) >= _BATCH_ROWS:
+            self.flush()
+
+    def add_many(self, keys: Iterable[TraceKey]) -> None:
+        self._pending.extend(keys)
+        if len(self._pending) >= _BATCH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self._conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?)", self._pending)
+            self._pending = []
+
+    def checkpoint(self) -> None:
+        self.flush()
+        self._conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        # secondary indexes are built once after the bulk load
+        self._conn.execute("CREATE INDEX IF NOT EXISTS events_trace ON events(trace_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS events_decision ON events(decision_id)")
+        self._conn.commit()
+        self._conn.close()
+
+
+def decision_trace_events(path: Path, decision_id: str) -> List[Tuple[int, int]]:
+    """(row, offset) of every event in the trace(s) of ``decision_id``, in log order."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(
+            "SELECT row, offset FROM events"
+            " WHERE decision_id = ?"
+            " OR trace_id IN (SELECT trace_id FROM events WHERE decision_id = ? AND trace_id IS NOT NULL)"
+            " ORDER BY row",
+            (decision_id, decision_id),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [(r[0], r[1]) for r in rows]
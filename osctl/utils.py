@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
+import os
+import shutil
 import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import jsonschema
 
+from . import config as cfg
+from .line_index import LineIndexWriter
+
+try:  # optional compiled validation backend
+    import fastjsonschema
+except ImportError:  # pragma: no cover - optional dependency
+    fastjsonschema = None
+
 
 def ensure_dir(path: Path) -> Path:
     path.mkdir(parents=True, exist_ok=True)
@@ -18,9 +30,10 @@ def now_utc_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
-def sha256_file(path: Path) -> str:
-    import hashlib
+COPY_CHUNK_SIZE = 1024 * 1024
+
 
+def sha256_file(path: Path) -> str:
     h = hashlib.sha256()
     with path.open("rb") as fh:
         for chunk in iter(lambda: fh.read(8192), b""):
@@ -28,28 +41,132 @@ def sha256_file(path: Path) -> str:
     return f"sha256:{h.hexdigest()}"
 
 
-def write_json(path: Path, data: Dict[str, Any]) -> None:
-    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+def sha256_bytes(data: bytes) -> str:
+    return f"sha256:{hashlib.sha256(data).hexdigest()}"
+
+
+def copy_and_hash(src: Path, dst: Path) -> str:
+    """Copy ``src`` to ``dst`` (with metadata, like shutil.copy2) hashing the bytes in the same pass."""
+    h = hashlib.sha256()
+    with src.open("rb") as fin, dst.open("wb") as fout:
+        for chunk in iter(lambda: fin.read(COPY_CHUNK_SIZE), b""):
+            h.update(chunk)
+            fout.write(chunk)
+    shutil.copystat(src, dst)
+    return f"sha256:{h.hexdigest()}"
+
+
+class HashingWriter:
+    """UTF-8 text sink that hashes every byte it writes (buffered)."""
+
+    BUFFER_CHARS = 1024 * 1024
+
+    def __init__(self, path: Path, line_index: Optional[LineIndexWriter] = None):
+        self.path = path
+        self.line_index = line_index
+        self._fh = path.open("wb")
+        self._hash = hashlib.sha256()
+        self._buf: List[str] = []
+        self._buf_chars = 0
+        self.bytes_written = 0
+
+    @classmethod
+    def resume(cls, path: Path, size: int, line_index: Optional[LineIndexWriter] = None) -> "HashingWriter":
+        """Reopen ``path`` for appending after its first ``size`` bytes (anything later is dropped).
+
+        hashlib state cannot be persisted, so the kept prefix is hashed again (one sequential read).
+        """
+        writer = cls.__new__(cls)
+        writer.path = path
+        writer.line_index = line_index
+        writer._fh = path.open("r+b")
+        writer._fh.truncate(size)
+        writer._hash = hashlib.sha256()
+        for chunk in iter(lambda: writer._fh.read(COPY_CHUNK_SIZE), b""):
+            writer._hash.update(chunk)
+        writer._buf = []
+        writer._buf_chars = 0
+        writer.bytes_written = size
+        return writer
+
+    def sync(self) -> None:
+        """Flush buffered rows and fsync, so ``bytes_written`` bytes are durable."""
+        self.flush()
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def write(self, text: str) -> None:
+        if self.line_index is not None:
+            self.line_index.add_text(text)
+        self._buf.append(text)
+        self._buf_chars += len(text)
+        if self._buf_chars >= self.BUFFER_CHARS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buf:
+            return
+        data = "".join(self._buf).encode("utf-8")
+        self._buf = []
+        self._buf_chars = 0
+        self._hash.update(data)
+        self._fh.write(data)
+        self.bytes_written += len(data)
+
+    def digest(self) -> str:
+        self.flush()
+        return f"sha256:{self._hash.hexdigest()}"
+
+    def close(self) -> None:
+        self.flush()
+        self._fh.close()
+        if self.line_index is not None:
+            self.line_index.close()
+
+    def __enter__(self) -> "HashingWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_json(path: Path, data: Dict[str, Any]) -> str:
+    payload = json.dumps(data, indent=2).encode("utf-8")
+    path.write_bytes(payload)
+    return sha256_bytes(payload)
+
+
+def write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    """Write ``data`` so readers (and crash recovery) see either the old file or the new one."""
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
 
 
 def read_json(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def read_jsonl(path: Path) -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
+def iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
     with path.open("r", encoding="utf-8") as fh:
         for line in fh:
             line = line.strip()
             if not line:
                 continue
             try:
-                items.append(json.loads(line))
+                yield json.loads(line)
             except json.JSONDecodeError:
-                items.append({"raw": line})
-    return items
+                yield {"raw": line}
+
+
+def read_jsonl(path: Path) -> List[Dict[str, Any]]:
+    return list(iter_jsonl(path))
 
 
+@functools.lru_cache(maxsize=None)
 def get_git_commit() -> Optional[str]:
     try:
         return (
@@ -66,20 +183,76 @@ def generate_run_id(prefix: str = "RUN_OSCTL") -> str:
     return f"{prefix}_{ts}"
 
 
-def load_schema(schema_path: Path) -> Optional[Dict[str, Any]]:
-    if not schema_path.exists():
-        return None
+class CompiledSchema:
+    """A schema compiled once per process.
+
+    Valid instances take the fast path (fastjsonschema when available); invalid ones are
+    re-checked with jsonschema so error messages are identical across backends.
+    """
+
+    def __init__(self, schema: Dict[str, Any], backend: str = "auto"):
+        self.schema = schema
+        self.validator = jsonschema.Draft7Validator(schema)
+        self._fast: Optional[Callable[[Any], Any]] = None
+        if backend != "jsonschema" and fastjsonschema is not None:
+            try:
+                self._fast = fastjsonschema.compile(schema)
+            except Exception:
+                self._fast = None
+
+    def is_valid(self, instance: Any) -> bool:
+        if self._fast is not None:
+            try:
+                self._fast(instance)
+                return True
+            except fastjsonschema.JsonSchemaException:
+                return False
+        return self.validator.is_valid(instance)
+
+    def iter_errors(self, instance: Any) -> Iterator[str]:
+        if self.is_valid(instance):
+            return
+        for e in self.validator.iter_errors(instance):
+            yield f"{e.message} at {list(e.path)}"
+
+
+# schema registry: resolved path -> ((mtime_ns, size), schema, compiled)
+_SCHEMA_REGISTRY: Dict[str, Tuple[Tuple[int, int], Optional[Dict[str, Any]], Optional[CompiledSchema]]] = {}
+
+
+def _registry_entry(schema_path: Path) -> Tuple[Optional[Dict[str, Any]], Optional[CompiledSchema]]:
+    try:
+        st = schema_path.stat()
+    except OSError:
+        return None, None
+    key = str(schema_path.resolve())
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _SCHEMA_REGISTRY.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1], cached[2]
     try:
-        return json.loads(schema_path.read_text(encoding="utf-8"))
+        schema = json.loads(schema_path.read_text(encoding="utf-8"))
     except Exception:
-        return None
+        schema = None
+    compiled = CompiledSchema(schema, cfg.SCHEMA_BACKEND) if schema else None
+    _SCHEMA_REGISTRY[key] = (stamp, schema, compiled)
+    return schema, compiled
+
+
+def load_schema(schema_path: Path) -> Optional[Dict[str, Any]]:
+    return _registry_entry(schema_path)[0]
+
+
+def get_validator(schema_path: Path) -> Optional[CompiledSchema]:
+    return _registry_entry(schema_path)[1]
+
+
+def clear_schema_registry() -> None:
+    _SCHEMA_REGISTRY.clear()
 
 
 def validate_json(instance: Dict[str, Any], schema_path: Path) -> List[str]:
-    schema = load_schema(schema_path)
-    if not schema:
+    validator = get_validator(schema_path)
+    if not validator:
         return []
-    validator = jsonschema.Draft7Validator(schema)
-    errors = [f"{e.message} at {list(e.path)}" for e in validator.iter_errors(instance)]
-    return errors
-
+    return list(validator.iter_errors(instance))
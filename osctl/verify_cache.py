@@ -0,0 +1,125 @@
+"""Sidecar cache of artifact digests and schema results for incremental verify."""
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .merkle import format_root, root_of_lines
+from .utils import sha256_file
+
+CACHE_FILENAME = ".verify_cache.json"
+CACHE_VERSION = 1
+# files modified this close to the previous cache write may have changed again within
+# the same mtime tick; their entries are not trusted (same idea as git's racy-clean check)
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def _fingerprint(path: Path) -> Optional[List[int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+class VerifyCache:
+    """(path, size, mtime_ns, inode) -> sha256 / schema results, stored next to the run."""
+
+    def __init__(self, run_dir: Path, entries: Optional[Dict[str, Any]] = None, written_at_ns: int = 0, enabled: bool = True):
+        self.run_dir = run_dir
+        self.entries: Dict[str, Any] = entries or {}
+        self.written_at_ns = written_at_ns
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, run_dir: Path, paranoid: bool = False) -> "VerifyCache":
+        path = run_dir / CACHE_FILENAME
+        if paranoid or not path.exists():
+            return cls(run_dir)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return cls(run_dir)
+        if data.get("version") != CACHE_VERSION:
+            return cls(run_dir)
+        return cls(run_dir, data.get("files", {}), data.get("written_at_ns", 0))
+
+    def save(self) -> None:
+        data = {"version": CACHE_VERSION, "written_at_ns": time.time_ns(), "files": self.entries}
+        tmp = self.run_dir / f"{CACHE_FILENAME}.tmp"
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, self.run_dir / CACHE_FILENAME)
+
+    def _entry(self, rel: str, fingerprint: Optional[List[int]]) -> Optional[Dict[str, Any]]:
+        if fingerprint is None:
+            return None
+        entry = self.entries.get(rel)
+        if not entry or entry.get("stat") != fingerprint:
+            return None
+        if fingerprint[1] >= self.written_at_ns - RACY_WINDOW_NS:
+            return None
+        return entry
+
+    def _fresh_entry(self, rel: str, fingerprint: List[int]) -> Dict[str, Any]:
+        entry = self.entries.get(rel)
+        if not entry or entry.get("stat") != fingerprint:
+            entry = {"stat": fingerprint}
+            self.entries[rel] = entry
+        return entry
+
+    def sha256(self, rel: str) -> Optional[str]:
+        """Digest of ``run_dir/rel`` (None if missing), from the cache when the file is unchanged."""
+        path = self.run_dir / rel
+        fingerprint = _fingerprint(path)
+        if fingerprint is None:
+            return None
+        entry = self._entry(rel, fingerprint)
+        if entry and entry.get("sha256"):
+            self.hits += 1
+            return entry["sha256"]
+        self.misses += 1
+        digest = sha256_file(path)
+        self._fresh_entry(rel, fingerprint)["sha256"] = digest
+        return digest
+
+    def merkle_root(self, rel: str) -> Optional[str]:
+        """Merkle root of ``run_dir/rel``'s rows (None if missing), cached like ``sha256``."""
+        path = self.run_dir / rel
+        fingerprint = _fingerprint(path)
+        if fingerprint is None:
+            return None
+        entry = self._entry(rel, fingerprint)
+        if entry and entry.get("merkle_root"):
+            self.hits += 1
+            return entry["merkle_root"]
+        self.misses += 1
+        with path.open("rb") as fh:
+            root = format_root(root_of_lines(fh)[0])
+        self._fresh_entry(rel, fingerprint)["merkle_root"] = root
+        return root
+
+    def schema_passed(self, rel: str, schema_path: Path) -> bool:
+        entry = self._entry(rel, _fingerprint(self.run_dir / rel))
+        if entry and _schema_key(schema_path) in entry.get("schema_pass", []):
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def record_schema_pass(self, rel: str, schema_path: Path) -> None:
+        fingerprint = _fingerprint(self.run_dir / rel)
+        if fingerprint is None:
+            return
+        entry = self._fresh_entry(rel, fingerprint)
+        key = _schema_key(schema_path)
+        if key not in entry.setdefault("schema_pass", []):
+            entry["schema_pass"].append(key)
+
+
+def _schema_key(schema_path: Path) -> str:
+    return sha256_file(schema_path)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import functools
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TOY = REPO_ROOT / "examples" / "os_v2_toy"
+VOLATILE = ("run_id", "timestamp")
+
+
+@pytest.fixture
+def toy_config() -> Path:
+    return TOY / "os_v2_config.yaml"
+
+
+@pytest.fixture
+def schemas_root() -> Path:
+    return TOY / "json_schemas"
+
+
+def _ts(base: datetime, seconds: float) -> str:
+    return (base + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def write_event_log(path: Path, traces: int = 400, seed: int = 7) -> Path:
+    """Deterministic event log: interleaved traces with evidence, decisions, triggers and
+    a little timestamp disorder, so every derived artifact has something to say."""
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 3, 13, 0, tzinfo=timezone.utc)
+    events: List[Dict[str, Any]] = []
+    for t in range(traces):
+        start = t * 20.0
+        trace = f"tr_{t:05d}"
+        dec = f"dec_{t:05d}"
+        events.append({"event_type": "REQUEST_RECEIVED", "trace_id": trace, "request_id": f"req_{t}", "_at": start})
+        if rng.random() < 0.8:
+            at = start + rng.uniform(0, 900)
+            evidence = {"event_type": "EVIDENCE_EMIT", "trace_id": trace, "decision_id": dec, "_at": at}
+            evidence["admissibility_window"] = {"open_at": _ts(base, start), "close_at": _ts(base, start + 600)}
+            if rng.random() < 0.9:
+                evidence["evidence_ref"] = [f"sha256:ev_{t}"]
+            events.append(evidence)
+        decision = {"event_type": "GOV_DECISION", "trace_id": trace, "decision_id": dec, "_at": start + 2}
+        decision.update(sla_ms=200, observed_latency_ms=rng.randint(20, 260), override_owner="role:runtime_guard")
+        if rng.random() < 0.9:
+            decision["cost_estimate"] = {"type": "ms_overhead", "value": rng.randint(1, 30)}
+        events.append(decision)
+        for _ in range(rng.randint(0, 2)):
+            trigger = {"event_type": "TRIGGER_FIRED", "trace_id": trace, "_at": start + rng.uniform(0, 600)}
+            if rng.random() < 0.2:
+                trigger["pass_mapping"] = {"expected_effect": "FAIL", "indicator": "T"}
+            events.append(trigger)
+        if rng.random() < 0.7:
+            events.append({"event_type": "RESPONSE_SENT", "trace_id": trace, "_at": start + 5})
+    events.sort(key=lambda e: e["_at"] + rng.uniform(0, 60))
+    with path.open("w", encoding="utf-8") as fh:
+        for i, event in enumerate(events):
+            at = event.pop("_at")
+            fh.write(json.dumps({"event_id": f"evt_{i:06d}", "ts_utc": _ts(base, at), **event}) + "\n")
+    return path
+
+
+@pytest.fixture
+def event_log(tmp_path: Path) -> Path:
+    return write_event_log(tmp_path / "events.jsonl")
+
+
+@pytest.fixture
+def small_shards(monkeypatch):
+    """Split even a small test log into many shards, so ``--workers`` really merges."""
+    import osctl.engine_run as engine_run
+    from osctl.shards import split_byte_ranges
+
+    monkeypatch.setattr(engine_run, "split_byte_ranges", functools.partial(split_byte_ranges, min_shard_bytes=4096))
+
+
+def normalized_rows(path: Path) -> List[Dict[str, Any]]:
+    """JSONL rows without the fields that differ between otherwise identical runs."""
+    rows = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        row = json.loads(line)
+        for key in VOLATILE:
+            row.pop(key, None)
+        rows.append(row)
+    return rows
+
+
+def sketch_doc(run_dir: Path) -> Dict[str, Any]:
+    doc = json.loads((run_dir / "sli_sketch.json").read_text(encoding="utf-8"))
+    doc.pop("run_id")
+    doc.pop("created_at")
+    return doc
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+import stat
+import tempfile
+
+import pytest
+
+from osctl.blob_store import BlobStore, referenced_digests
+from osctl.utils import sha256_file
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore.for_run_root(tmp_path / "runs")
+
+
+def _no_copies(monkeypatch):
+    def refuse(*args, **kwargs):
+        raise AssertionError("ingest copied a blob that was already stored")
+
+    monkeypatch.setattr(tempfile, "mkstemp", refuse)
+
+
+def test_ingest_stores_read_only_blobs_by_digest(tmp_path, store):
+    src = tmp_path / "events.jsonl"
+    src.write_bytes(b'{"event_id": "e1"}\n' * 1000)
+    digest = store.ingest(src)
+    blob = store.path_for(digest)
+    assert digest == sha256_file(src)
+    assert blob.read_bytes() == src.read_bytes()
+    assert not blob.stat().st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+    assert list((store.root / "tmp").iterdir()) == []
+
+
+def test_stored_bytes_are_hashed_but_not_copied_again(tmp_path, store, monkeypatch):
+    first = tmp_path / "a.jsonl"
+    first.write_bytes(b"same bytes\n")
+    digest = store.ingest(first)
+    second = tmp_path / "b.jsonl"
+    second.write_bytes(b"same bytes\n")
+    _no_copies(monkeypatch)
+    assert store.ingest(second) == digest
+
+
+def test_known_digest_of_a_linked_blob_skips_reading_the_source(tmp_path, store, monkeypatch):
+    src = tmp_path / "a.jsonl"
+    src.write_bytes(b"recorded input\n")
+    digest = store.ingest(src)
+    linked = tmp_path / "run" / "event_log.jsonl"
+    linked.parent.mkdir()
+    store.materialize(digest, linked)
+    dst = tmp_path / "replay" / "event_log.jsonl"
+    dst.parent.mkdir()
+    _no_copies(monkeypatch)
+    monkeypatch.setattr(BlobStore, "_hash", staticmethod(lambda path: pytest.fail(f"{path} was read")))
+    assert store.store_into(linked, dst, known_digest=digest) == digest
+    assert os.path.samefile(dst, store.path_for(digest))
+
+
+def test_known_digest_is_not_trusted_after_a_same_size_edit(tmp_path, store):
+    src = tmp_path / "a.jsonl"
+    src.write_bytes(b"recorded input\n")
+    digest = store.ingest(src)
+    src.write_bytes(b"tampered input\n")
+    assert store.ingest(src, known_digest=digest) == sha256_file(src) != digest
+
+
+def test_known_digest_with_a_different_size_is_not_trusted(tmp_path, store):
+    old = tmp_path / "a.jsonl"
+    old.write_bytes(b"v1\n")
+    digest = store.ingest(old)
+    old.write_bytes(b"version 2\n")
+    assert store.ingest(old, known_digest=digest) == sha256_file(old) != digest
+
+
+def test_gc_keeps_referenced_and_fresh_blobs(tmp_path, store):
+    src = tmp_path / "a.jsonl"
+    src.write_bytes(b"x\n")
+    digest = store.ingest(src)
+    assert store.gc(set(), dry_run=True)["removed"] == []
+    result = store.gc(set(), grace_seconds=-1)
+    assert result["removed"] == [digest]
+    assert referenced_digests(tmp_path / "runs") == set()
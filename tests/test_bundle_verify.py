@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import zipfile
+
+import pytest
+
+from osctl.cli import main
+from osctl.engine_run import execute_run
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSIONS = [
+    "store",
+    "deflate:1",
+    "deflate:9",
+    "lzma:0",
+    "lzma:6",
+    "deflate:6,event_log.jsonl=store,decision_log.jsonl=lzma:9",
+    pytest.param("zstd:3", marks=pytest.mark.skipif(zstandard is None, reason="zstandard not installed")),
+]
+
+
+def _bundle(tmp_path, event_log, toy_config, schemas_root, compression):
+    _, run_dir = execute_run(
+        run_id="RUN_BUNDLE",
+        out_dir=tmp_path,
+        config_path=toy_config,
+        events_path=event_log,
+        schemas_root=schemas_root,
+        update_index=False,
+        bundle_compression=compression,
+    )
+    return run_dir / "bundle" / "osctl_bundle.zip"
+
+
+def _verify(bundle, schemas_root, capsys):
+    code = main(["verify", "--bundle", str(bundle), "--schemas-root", str(schemas_root)])
+    return code, json.loads(capsys.readouterr().out.splitlines()[-1])
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_verify_bundle_for_each_compression(tmp_path, event_log, toy_config, schemas_root, capsys, compression):
+    bundle = _bundle(tmp_path, event_log, toy_config, schemas_root, compression)
+    capsys.readouterr()
+    code, summary = _verify(bundle, schemas_root, capsys)
+    assert (code, summary["status"], summary["run_id"]) == (0, "PASS", "RUN_BUNDLE")
+    if not compression.startswith("zstd"):
+        # the standard library reads every member back (CRC and LZMA header included)
+        with zipfile.ZipFile(bundle) as zf:
+            assert zf.testzip() is None
+
+
+def test_verify_bundle_detects_a_corrupted_member(tmp_path, event_log, toy_config, schemas_root, capsys):
+    bundle = _bundle(tmp_path, event_log, toy_config, schemas_root, "store")
+    with zipfile.ZipFile(bundle) as zf:
+        info = zf.getinfo("decision_log.jsonl")
+    data = bytearray(bundle.read_bytes())
+    # a stored member's bytes follow its local header (30 bytes + name + extra)
+    with bundle.open("rb") as fh:
+        fh.seek(info.header_offset + 26)
+        name_len, extra_len = int.from_bytes(fh.read(2), "little"), int.from_bytes(fh.read(2), "little")
+    pos = info.header_offset + 30 + name_len + extra_len + 100
+    data[pos] = ord("X") if data[pos] != ord("X") else ord("Y")
+    bundle.write_bytes(bytes(data))
+    capsys.readouterr()
+    code, summary = _verify(bundle, schemas_root, capsys)
+    assert code != 0 and summary["status"] != "PASS"
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from conftest import normalized_rows
+from osctl.columnar import (
+    TIMESTAMP_NULL,
+    ColumnarLog,
+    ColumnarWriter,
+    ColumnChunkBuilder,
+    build_columnar,
+    columns_path_for,
+)
+from osctl.engine_run import execute_run
+
+
+def _row(event_id, decision="PASS", failed_axis=None, exists=True, timestamp="2026-01-03T13:00:00+00:00"):
+    return {"event_id": event_id, "decision": decision, "timestamp": timestamp, "witness_path": {"exists": exists, "failed_axis": failed_axis}}
+
+
+def _write_log(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    return path
+
+
+def _decoded(log, col):
+    values = log.dictionary(col)
+    return [values[code] if code >= 0 else None for code in log.codes(col)]
+
+
+def test_rows_round_trip_through_the_sidecar(tmp_path, monkeypatch):
+    monkeypatch.setattr("osctl.columnar.CHUNK_ROWS", 3)  # several chunks, each with its own dictionary
+    rows = [
+        _row("e1"),
+        _row(2, "ACT", failed_axis="AETC", exists=False),
+        _row(None, timestamp=None),
+        _row("e1", "ACT", failed_axis="AETC", timestamp="2026-01-03T13:00:01Z"),
+        _row(3.5, exists=False),
+        {"decision": "PASS"},
+        _row("e7", timestamp="not a time"),
+    ]
+    log_path = _write_log(tmp_path / "decision_log.jsonl", rows)
+    log = build_columnar(log_path)
+    assert len(log) == len(rows)
+    assert _decoded(log, "event_id") == ["e1", "2", None, "e1", "3.5", None, "e7"]
+    assert _decoded(log, "decision") == ["PASS", "ACT", "PASS", "ACT", "PASS", "PASS", "PASS"]
+    assert _decoded(log, "failed_axis") == [None, "AETC", None, "AETC", None, None, None]
+    assert log.witness_exists().tolist() == [True, False, True, True, False, False, True]
+    ts = log.timestamps()
+    assert ts[1] == ts[0] and ts[3] == ts[0] + 1_000_000
+    assert [i for i, v in enumerate(ts) if v == TIMESTAMP_NULL] == [2, 5, 6]
+    assert log.value_counts("failed_axis") == {"AETC": 2, None: 5}
+    assert log.mask("event_id", "e1").tolist() == [True, False, False, True, False, False, False]
+    assert log.time_range() == (int(ts[0]), int(ts[3]))
+
+
+def test_chunks_with_local_dictionaries_are_remapped(tmp_path):
+    first, second = ColumnChunkBuilder(), ColumnChunkBuilder()
+    for row in (_row("a", "PASS"), _row("b", "ACT", failed_axis="X")):
+        first.add(row)
+    for row in (_row("b", "ACT"), _row(None, "FAIL"), _row("c", "PASS", failed_axis="X")):
+        second.add(row)
+    writer = ColumnarWriter(tmp_path / "decision_log.columns")
+    writer.add(_row("z", "FAIL"))
+    writer.add_chunk(first.build())
+    writer.add_chunk(second.build())
+    writer.close()
+    log = ColumnarLog(tmp_path / "decision_log.columns", {"rows": writer.rows})
+    assert _decoded(log, "event_id") == ["z", "a", "b", "b", None, "c"]
+    assert _decoded(log, "decision") == ["FAIL", "PASS", "ACT", "ACT", "FAIL", "PASS"]
+    assert _decoded(log, "failed_axis") == [None, None, "X", None, None, "X"]
+    assert log.dictionary("event_id") == ["z", "a", "b", "c"]
+
+
+def test_a_rewritten_log_makes_the_sidecar_stale(tmp_path):
+    log_path = _write_log(tmp_path / "decision_log.jsonl", [_row("e1"), _row("e2")])
+    build_columnar(log_path)
+    assert ColumnarLog.open(log_path) is not None
+    with log_path.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(_row("e3")) + "\n")
+    assert ColumnarLog.open(log_path) is None
+    assert len(build_columnar(log_path)) == 3
+    assert ColumnarLog.open(tmp_path / "absent.jsonl") is None
+
+
+@pytest.mark.parametrize("options", [{}, {"stream": True}, {"workers": 3}], ids=["batch", "stream", "sharded"])
+def test_runs_with_integer_event_ids(tmp_path, toy_config, schemas_root, small_shards, options):
+    events = tmp_path / "events.jsonl"
+    rows = [{"id": i, "event_type": "GOV_DECISION", "ts_utc": "2026-01-03T13:00:00Z", "pad": "x" * 40} for i in range(300)]
+    _write_log(events, rows)
+    _, run_dir = execute_run(
+        run_id="RUN_COLUMNS",
+        out_dir=tmp_path / "runs",
+        config_path=toy_config,
+        events_path=events,
+        schemas_root=schemas_root,
+        no_bundle=True,
+        update_index=False,
+        columnar=True,
+        **options,
+    )
+    decision_log = run_dir / "decision_log.jsonl"
+    log = ColumnarLog.open(decision_log)
+    assert log is not None
+    expected = normalized_rows(decision_log)
+    assert _decoded(log, "event_id") == [str(row["event_id"]) for row in expected]
+    assert _decoded(log, "decision") == [row["decision"] for row in expected]
+    manifest = json.loads((run_dir / "run_manifest.json").read_text())
+    assert manifest["artifacts"]["decision_log_columns"] == columns_path_for(decision_log).name
+    assert np.array_equal(log.witness_exists(), [row["witness_path"]["exists"] for row in expected])
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+import os
+
+from console.app import ArtifactCache, create_app
+from osctl.cli import main
+from osctl.engine_run import execute_run
+
+
+def _doc(path, payload, mtime_ns):
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def test_least_recently_used_entries_are_evicted_by_size(tmp_path):
+    docs = [_doc(tmp_path / f"{name}.json", {"name": name, "pad": "x" * 80}, 10**9) for name in "abc"]
+    size = docs[0].stat().st_size
+    cache = ArtifactCache(max_bytes=2 * size)
+    cache.load_json(docs[0])
+    cache.load_json(docs[1])
+    cache.load_json(docs[0])  # a is now the most recent
+    cache.load_json(docs[2])  # evicts b
+    assert cache.stats() == {"entries": 2, "bytes": 2 * size, "max_bytes": 2 * size, "hits": 1, "misses": 3, "evictions": 1}
+    cache.load_json(docs[0])
+    cache.load_json(docs[1])
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_rewritten_files_are_reloaded_and_oversized_ones_not_cached(tmp_path):
+    path = _doc(tmp_path / "verify_report.json", {"overall_status": "PENDING"}, 10**9)
+    cache = ArtifactCache(max_bytes=1024)
+    assert cache.load_json(path)["overall_status"] == "PENDING"
+    _doc(path, {"overall_status": "PASS"}, 2 * 10**9)
+    assert cache.load_json(path)["overall_status"] == "PASS"
+    assert (cache.hits, cache.misses, cache.stats()["entries"]) == (0, 2, 1)
+    big = _doc(tmp_path / "big.json", {"pad": "x" * 2048}, 10**9)
+    cache.load_json(big)
+    cache.load_json(big)
+    assert (cache.misses, cache.stats()["entries"]) == (4, 1)
+
+
+def test_console_sees_a_verify_report_rewritten_by_osctl_verify(tmp_path, event_log, toy_config, schemas_root, capsys):
+    _, run_dir = execute_run(
+        run_id="RUN_CACHE",
+        out_dir=tmp_path / "runs",
+        config_path=toy_config,
+        events_path=event_log,
+        schemas_root=schemas_root,
+        no_bundle=True,
+    )
+    client = create_app(tmp_path / "runs", tmp_path / "ce_ledger.jsonl", tmp_path / "metrics").test_client()
+    assert client.get("/api/v1/runs/RUN_CACHE/verify").get_json()["items"][0]["overall_status"] == "PENDING"
+    report = run_dir / "verify_report.json"
+    before = report.stat().st_mtime_ns
+    argv = ["verify", "--run-id", "RUN_CACHE", "--run-dir", str(run_dir), "--out-dir", str(tmp_path / "runs"), "--schemas-root", str(schemas_root)]
+    assert main(argv) == 0
+    os.utime(report, ns=(before + 10**9, before + 10**9))  # a distinct stamp even on coarse clocks
+    assert client.get("/api/v1/runs/RUN_CACHE/verify").get_json()["items"][0]["overall_status"] == "PASS"
+    stats = client.get("/api/v1/cache/stats").get_json()
+    assert stats["misses"] >= 2
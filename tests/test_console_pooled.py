@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from console.app import PooledWSGIServer, create_app
+from osctl.engine_run import execute_run
+
+
+@pytest.fixture
+def server(tmp_path, event_log, toy_config, schemas_root):
+    _, run_dir = execute_run(
+        run_id="RUN_POOL",
+        out_dir=tmp_path / "runs",
+        config_path=toy_config,
+        events_path=event_log,
+        schemas_root=schemas_root,
+        no_bundle=True,
+        update_index=False,
+    )
+    app = create_app(tmp_path / "runs", tmp_path / "ce_ledger.jsonl", tmp_path / "metrics")
+    srv = PooledWSGIServer("127.0.0.1", 0, app, threads=16)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield srv, run_dir
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+
+def _get(srv, path):
+    with urllib.request.urlopen(f"http://127.0.0.1:{srv.port}{path}", timeout=30) as resp:
+        return resp.status, json.loads(resp.read())
+
+
+def test_concurrent_decision_pages_while_the_index_is_built(server):
+    srv, run_dir = server
+    log = run_dir / "decision_log.jsonl"
+    expected = [json.loads(line) for line in log.read_text().splitlines()]
+    # every request races to build the missing row index
+    (run_dir / "decision_log.jsonl.idx").unlink()
+    cursors = [i * 37 % len(expected) for i in range(48)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        pages = list(pool.map(lambda c: _get(srv, f"/api/v1/runs/RUN_POOL/decisions?cursor={c}&limit=5"), cursors))
+    for cursor, (status, page) in zip(cursors, pages):
+        assert status == 200
+        assert page["total"] == len(expected)
+        assert page["items"] == expected[cursor : cursor + 5]
+    assert sorted(p.name for p in run_dir.iterdir() if p.name.startswith("decision_log")) == [
+        "decision_log.jsonl",
+        "decision_log.jsonl.idx",
+    ]
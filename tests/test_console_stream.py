@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import zlib
+
+import pytest
+
+from console.app import create_app
+from osctl.engine_run import execute_run
+
+
+@pytest.fixture
+def console(tmp_path, event_log, toy_config, schemas_root):
+    _, run_dir = execute_run(
+        run_id="RUN_NDJSON",
+        out_dir=tmp_path / "runs",
+        config_path=toy_config,
+        events_path=event_log,
+        schemas_root=schemas_root,
+        no_bundle=True,
+    )
+    ledger = tmp_path / "ce_ledger.jsonl"
+    ledger.write_text('{"ce_id": "CE-1"}\n{"ce_id": "CE-2"}\n', encoding="utf-8")
+    app = create_app(tmp_path / "runs", ledger, tmp_path / "metrics")
+    return app.test_client(), run_dir, ledger
+
+
+def _digest(run_dir, name):
+    proof = json.loads((run_dir / "proof_manifest.json").read_text())
+    return next(a["sha256"] for a in proof["artifacts"] if a["path"] == name).split(":", 1)[1]
+
+
+@pytest.mark.parametrize(
+    "encoding, decode",
+    [(None, lambda body: body), ("gzip", gzip.decompress), ("deflate", zlib.decompress)],
+)
+def test_stream_negotiates_encoding_under_the_proof_etag(console, encoding, decode):
+    client, run_dir, _ = console
+    headers = {"Accept-Encoding": encoding} if encoding else {"Accept-Encoding": "identity"}
+    resp = client.get("/api/v1/runs/RUN_NDJSON/decisions/stream", headers=headers)
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    assert resp.headers.get("Content-Encoding") == encoding
+    assert decode(resp.get_data()) == (run_dir / "decision_log.jsonl").read_bytes()
+    digest = _digest(run_dir, "decision_log.jsonl")
+    assert resp.headers["ETag"] == (f'"{digest}-{encoding}"' if encoding else f'"{digest}"')
+
+
+def test_conditional_requests_return_304(console):
+    client, _, _ = console
+    url = "/api/v1/runs/RUN_NDJSON/triggers/stream"
+    first = client.get(url, headers={"Accept-Encoding": "gzip"})
+    etag = first.headers["ETag"]
+    again = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert (again.status_code, again.get_data()) == (304, b"")
+    # the identity representation has its own tag
+    assert client.get(url, headers={"Accept-Encoding": "identity", "If-None-Match": etag}).status_code == 200
+    since = client.get(url, headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert since.status_code == 304
+
+
+def test_artifacts_newer_than_the_proof_get_a_weak_etag(console):
+    client, run_dir, ledger = console
+    log = run_dir / "decision_log.jsonl"
+    later = (run_dir / "proof_manifest.json").stat().st_mtime_ns + 5_000_000_000
+    os.utime(log, ns=(later, later))
+    resp = client.get("/api/v1/runs/RUN_NDJSON/decisions/stream", headers={"Accept-Encoding": "identity"})
+    assert resp.headers["ETag"].startswith('W/"')
+    ce = client.get("/api/v1/ce-ledger/stream", headers={"Accept-Encoding": "identity"})
+    assert ce.headers["ETag"].startswith('W/"') and ce.get_data() == ledger.read_bytes()
+    assert client.get("/api/v1/runs/NOPE/decisions/stream").status_code == 404
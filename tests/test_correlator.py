@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from osctl.correlator import TraceCorrelator, correlation_record
+from osctl.utils import iter_jsonl
+
+BASE = datetime(2026, 1, 3, 13, 0, tzinfo=timezone.utc)
+
+
+def _at(seconds: float) -> str:
+    return (BASE + timedelta(seconds=seconds)).isoformat().replace("+00:00", "Z")
+
+
+def _evt(event_type, trace, seconds, **fields):
+    return {"event_type": event_type, "trace_id": trace, "ts_utc": _at(seconds), **fields}
+
+
+def _correlate(events, **options):
+    findings = []
+    correlator = TraceCorrelator(findings.append, **options)
+    for row, evt in enumerate(events):
+        correlator.add(correlation_record(row, {"event_id": f"e{row}", **evt}))
+    return findings, correlator.close()
+
+
+def test_late_missing_and_expired_traces_are_reported():
+    events = [
+        _evt("REQUEST_RECEIVED", "A", 0),
+        _evt("GOV_DECISION", "A", 5, decision_id="dec_a"),
+        _evt("EVIDENCE_EMIT", "A", 10, decision_id="dec_a", admissibility_window={"close_at": _at(100)}),
+        _evt("GOV_DECISION", "B", 20, decision_id="dec_b"),
+        _evt("RESPONSE_SENT", "B", 21),
+        _evt("RESPONSE_SENT", "A", 22),
+        _evt("REQUEST_RECEIVED", "C", 30),  # never completes
+        _evt("EVIDENCE_EMIT", "D", 40, admissibility_window={"close_at": _at(35)}),
+        _evt("RESPONSE_SENT", "D", 41),
+        _evt("REQUEST_RECEIVED", "E", 1000),  # moves the watermark to 940
+        _evt("REQUEST_RECEIVED", "F", 900),
+    ]
+    findings, summary = _correlate(events, allowed_lateness=60, trace_ttl=600)
+    got = sorted((f["row"], f["kind"], f["trace_key"], f.get("reason")) for f in findings)
+    assert got == [
+        (2, "late_evidence", "A", "after_decision"),
+        (3, "missing_evidence", "B", None),
+        (6, "trace_expired", "C", None),
+        (7, "late_evidence", "D", "after_window_close"),
+        (10, "late_event", "F", None),
+    ]
+    assert summary["findings"] == {"late_evidence": 2, "missing_evidence": 1, "late_event": 1, "trace_expired": 1}
+    assert summary["traces_closed"] == 6
+
+
+def test_traces_close_behind_the_watermark():
+    # one short completed trace every 10s: only the last few stay open
+    events = []
+    for t in range(200):
+        events += [_evt("REQUEST_RECEIVED", f"T{t}", t * 10), _evt("EVIDENCE_EMIT", f"T{t}", t * 10 + 1), _evt("RESPONSE_SENT", f"T{t}", t * 10 + 2)]
+    findings, summary = _correlate(events, allowed_lateness=30, trace_ttl=600)
+    assert findings == []
+    assert summary["traces_closed"] == 200
+    assert summary["peak_open_traces"] <= 5
+
+
+def test_max_open_traces_evicts_the_earliest_deadline():
+    events = [_evt("REQUEST_RECEIVED", f"T{t}", t) for t in range(4)]
+    findings, summary = _correlate(events, max_open_traces=2)
+    evicted = [(f["trace_key"], f["evicted"]) for f in findings if f["kind"] == "trace_expired"]
+    assert evicted == [("T0", True), ("T1", True)]
+    assert summary["peak_open_traces"] == 3
+
+
+def test_state_round_trips_through_json_mid_stream(event_log):
+    records = [correlation_record(row, evt) for row, evt in enumerate(iter_jsonl(event_log))]
+    records = [rec for rec in records if rec is not None]
+    whole = []
+    correlator = TraceCorrelator(whole.append, allowed_lateness=60, trace_ttl=600)
+    correlator.add_many(records)
+    expected = correlator.close()
+
+    resumed = []
+    first = TraceCorrelator(resumed.append, allowed_lateness=60, trace_ttl=600)
+    first.add_many(records[: len(records) // 2])
+    state = json.loads(json.dumps(first.to_dict()))
+    assert state["open"]
+    second = TraceCorrelator.from_dict(state, resumed.append)
+    second.add_many(records[len(records) // 2 :])
+    assert second.close() == expected
+    assert resumed == whole
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from osctl.engine_run import RunError
+from osctl.follow import FollowRun
+from osctl.rules import plan_for_config
+
+EVENT = {"event_type": "REQUEST_RECEIVED", "ts_utc": "2026-01-03T13:10:00Z", "trace_id": "tr_1"}
+
+
+def _follow(tmp_path, events, toy_config):
+    return FollowRun(
+        run_id="RUN_FOLLOW",
+        out_dir=tmp_path / "runs",
+        config_path=toy_config,
+        events_path=events,
+        plan=plan_for_config(toy_config),
+        update_index=False,
+    )
+
+
+def _decisions(run):
+    return [json.loads(line) for line in (run.run_dir / "decision_log.jsonl").read_text(encoding="utf-8").splitlines()]
+
+
+def test_poll_consumes_complete_lines_only(tmp_path, toy_config):
+    events = tmp_path / "events.jsonl"
+    events.write_text(json.dumps({**EVENT, "event_id": "e1"}) + "\n" + '{"event_id": "e2"')
+    run = _follow(tmp_path, events, toy_config)
+    try:
+        assert run.poll() == 1
+        assert run.poll() == 0  # the partial line waits for its newline
+        with events.open("a") as fh:
+            fh.write(', "event_type": "RESPONSE_SENT"}\n')
+        assert run.poll() == 1
+    finally:
+        run.close()
+    assert [row["event_id"] for row in _decisions(run)] == ["e1", "e2"]
+
+
+def test_invalid_utf8_does_not_stop_the_follower(tmp_path, toy_config):
+    events = tmp_path / "events.jsonl"
+    events.write_bytes(
+        json.dumps({**EVENT, "event_id": "e1"}).encode() + b"\n"
+        + b'{"event_id": "bad\xff\xfe", "event_type": "RESPONSE_SENT"}\n'
+        + b"\xc3(\n"
+        + json.dumps({**EVENT, "event_id": "e4"}).encode() + b"\n"
+    )
+    run = _follow(tmp_path, events, toy_config)
+    try:
+        assert run.poll() == 4
+    finally:
+        run.close()
+    rows = _decisions(run)
+    assert [row["event_id"] for row in rows][:2] == ["e1", "bad\ufffd\ufffd"]
+    assert rows[3]["event_id"] == "e4"
+
+
+def test_truncated_source_is_refused(tmp_path, toy_config):
+    events = tmp_path / "events.jsonl"
+    events.write_text(json.dumps({**EVENT, "event_id": "e1"}) + "\n" + json.dumps({**EVENT, "event_id": "e2"}) + "\n")
+    run = _follow(tmp_path, events, toy_config)
+    try:
+        run.poll()
+        with events.open("r+") as fh:
+            fh.truncate(10)
+        with pytest.raises(RunError, match="truncated or replaced"):
+            run.poll()
+    finally:
+        run.close()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+import osctl.utils as utils
+from osctl.engine_run import execute_run
+from osctl.utils import HashingWriter, copy_and_hash, sha256_file, write_json
+
+
+@pytest.mark.parametrize("size", [0, 1, 4095, 4096, 4097, 3 * 4096])
+def test_copy_and_hash_matches_a_separate_read(tmp_path, monkeypatch, size):
+    monkeypatch.setattr(utils, "COPY_CHUNK_SIZE", 4096)
+    src = tmp_path / "src.bin"
+    src.write_bytes(os.urandom(size))
+    dst = tmp_path / "dst.bin"
+    digest = copy_and_hash(src, dst)
+    assert digest == sha256_file(src) == sha256_file(dst)
+    assert dst.stat().st_mtime_ns == src.stat().st_mtime_ns
+
+
+def test_writers_return_the_digest_of_what_they_wrote(tmp_path):
+    with HashingWriter(tmp_path / "rows.jsonl") as writer:
+        for i in range(100):
+            writer.write(json.dumps({"i": i, "note": "é"}, ensure_ascii=False) + "\n")
+    assert writer.digest() == sha256_file(tmp_path / "rows.jsonl")
+    assert write_json(tmp_path / "doc.json", {"a": [1, 2]}) == sha256_file(tmp_path / "doc.json")
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_proof_manifest_digests_match_the_files(tmp_path, event_log, toy_config, schemas_root, stream):
+    _, run_dir = execute_run(
+        run_id="RUN_HASH",
+        out_dir=tmp_path / "runs",
+        config_path=toy_config,
+        events_path=event_log,
+        schemas_root=schemas_root,
+        stream=stream,
+    )
+    proof = json.loads((run_dir / "proof_manifest.json").read_text())
+    assert len(proof["artifacts"]) >= 6
+    for artifact in proof["artifacts"]:
+        assert artifact["sha256"] == sha256_file(run_dir / artifact["path"]), artifact["path"]
+    sources = json.loads((run_dir / "run_manifest.json").read_text())["meta"]["sources"]
+    assert sources["events"]["sha256"] == sha256_file(event_log)
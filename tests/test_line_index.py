@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+
+from osctl.line_index import LineIndex, LineIndexWriter, build_line_index, index_path_for, read_page
+
+
+def _write(path, n):
+    rows = [{"i": i, "kind": "odd" if i % 2 else "even", "note": "é" * (i % 3)} for i in range(n)]
+    path.write_text("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows), encoding="utf-8")
+    return rows
+
+
+def test_build_is_atomic_and_matches_the_writer(tmp_path):
+    log = tmp_path / "rows.jsonl"
+    _write(log, 50)
+    index = build_line_index(log)
+    assert len(index) == 50
+    assert {p.name for p in tmp_path.iterdir()} == {"rows.jsonl", "rows.jsonl.idx"}  # no tmp left behind
+
+    written = tmp_path / "written.idx"
+    writer = LineIndexWriter(written)
+    writer.add_text(log.read_text(encoding="utf-8"))
+    writer.close()
+    assert written.read_bytes() == index_path_for(log).read_bytes()
+
+
+def test_offsets_are_read_on_demand(tmp_path):
+    log = tmp_path / "rows.jsonl"
+    rows = _write(log, 20)
+    build_line_index(log)
+    index = LineIndex.open(log)
+    with log.open("rb") as fh:
+        fh.seek(index.offset(13))
+        assert json.loads(fh.readline()) == rows[13]
+    assert [json.loads(line)["i"] for _, line in index.iter_rows(18)] == [18, 19]
+
+
+def test_torn_or_stale_index_is_ignored(tmp_path):
+    log = tmp_path / "rows.jsonl"
+    _write(log, 10)
+    build_line_index(log)
+    idx = index_path_for(log)
+    idx.write_bytes(idx.read_bytes() + b"\x01\x02")
+    assert LineIndex.open(log) is None
+    build_line_index(log)
+    _write(log, 3)  # artifact rewritten shorter behind the index
+    assert LineIndex.open(log) is None
+
+
+def test_read_page_cursors(tmp_path):
+    log = tmp_path / "rows.jsonl"
+    _write(log, 25)
+    page = read_page(log, cursor=0, limit=10)
+    assert (page["total"], page["next_cursor"], page["items"][-1]["i"]) == (25, 10, 9)
+    assert index_path_for(log).exists()
+    page = read_page(log, cursor=20, limit=10)
+    assert ([row["i"] for row in page["items"]], page["next_cursor"]) == ([20, 21, 22, 23, 24], None)
+
+    odd = read_page(log, cursor=0, limit=4, predicate=lambda row: row["kind"] == "odd")
+    assert ([row["i"] for row in odd["items"]], odd["next_cursor"]) == ([1, 3, 5, 7], 8)
+    unindexed = tmp_path / "plain.jsonl"
+    _write(unindexed, 5)
+    page = read_page(unindexed, cursor=3, build_missing=False)
+    assert (page["total"], [row["i"] for row in page["items"]]) == (None, [3, 4])
+
+
+def test_filtered_scan_stops_at_its_budget_with_a_cursor(tmp_path):
+    log = tmp_path / "rows.jsonl"
+    _write(log, 25)
+
+    def only_last(row):
+        return row["i"] == 24
+
+    page = read_page(log, cursor=0, limit=10, predicate=only_last, scan_limit=10)
+    assert (page["items"], page["next_cursor"]) == ([], 10)
+    page = read_page(log, cursor=page["next_cursor"], limit=10, predicate=only_last, scan_limit=10)
+    assert (page["items"], page["next_cursor"]) == ([], 20)
+    page = read_page(log, cursor=page["next_cursor"], limit=10, predicate=only_last, scan_limit=10)
+    assert ([row["i"] for row in page["items"]], page["next_cursor"]) == ([24], None)
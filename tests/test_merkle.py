@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from osctl.engine_run import execute_run
+from osctl.engine_verify import verify_row_range
+from osctl.merkle import (
+    EMPTY_ROOT,
+    MerkleError,
+    MerkleTree,
+    build_merkle,
+    format_root,
+    leaf_hash,
+    node_hash,
+    prove_rows,
+    root_of_lines,
+    verify_rows,
+)
+
+# odd counts exercise the promoted last node on one or more levels
+LEAF_COUNTS = (1, 2, 3, 5, 6, 7, 9, 11, 13, 17)
+
+
+def _write_rows(path: Path, n: int) -> Path:
+    path.write_text("".join(json.dumps({"row": i, "event_id": f"e{i}"}) + "\n" for i in range(n)), encoding="utf-8")
+    return path
+
+
+def _reference_root(rows):
+    level = [leaf_hash(row) for row in rows]
+    while len(level) > 1:
+        level = [node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)]
+    return level[0]
+
+
+@pytest.mark.parametrize("n", LEAF_COUNTS)
+def test_sidecar_root_matches_streaming_and_reference_roots(tmp_path, n):
+    path = _write_rows(tmp_path / f"rows_{n}.jsonl", n)
+    root, leaves = build_merkle(path)
+    rows = path.read_bytes().splitlines(keepends=True)
+    assert leaves == n
+    assert root == _reference_root(rows)
+    assert root_of_lines(rows) == (root, n)
+    with MerkleTree.open(path) as tree:
+        assert tree.root == root and tree.leaves == n
+
+
+@pytest.mark.parametrize("n", LEAF_COUNTS)
+def test_every_range_proof_verifies(tmp_path, n):
+    path = _write_rows(tmp_path / f"rows_{n}.jsonl", n)
+    expected = format_root(build_merkle(path)[0])
+    for lo in range(n):
+        for hi in range(lo + 1, n + 1):
+            proof = prove_rows(path, lo, hi)
+            assert proof["rows"] == path.read_bytes().splitlines(keepends=True)[lo:hi]
+            assert verify_rows(proof["rows"], lo, n, proof["proof"], expected), (lo, hi)
+
+
+@pytest.mark.parametrize("n", (3, 7, 11))
+def test_tampered_rows_and_proofs_are_rejected(tmp_path, n):
+    path = _write_rows(tmp_path / f"rows_{n}.jsonl", n)
+    expected = format_root(build_merkle(path)[0])
+    lo, hi = n - 2, n  # ends on the promoted last node
+    proof = prove_rows(path, lo, hi)
+    tampered = [proof["rows"][0].replace(b'"e', b'"x'), proof["rows"][1]]
+    assert not verify_rows(tampered, lo, n, proof["proof"], expected)
+    with pytest.raises(MerkleError):
+        verify_rows(proof["rows"], lo, n, proof["proof"] + [EMPTY_ROOT], expected)
+    if proof["proof"]:
+        with pytest.raises(MerkleError):
+            verify_rows(proof["rows"], lo, n, proof["proof"][:-1], expected)
+
+
+def test_out_of_range_requests_fail(tmp_path):
+    path = _write_rows(tmp_path / "rows.jsonl", 5)
+    build_merkle(path)
+    with MerkleTree.open(path) as tree:
+        for lo, hi in ((0, 0), (3, 2), (4, 6), (-1, 2)):
+            with pytest.raises(MerkleError):
+                tree.range_proof(lo, hi)
+
+
+def test_verify_row_range_against_a_run_manifest(tmp_path, event_log, toy_config, schemas_root):
+    _, run_dir = execute_run(
+        run_id="RUN_MERKLE",
+        out_dir=tmp_path,
+        config_path=toy_config,
+        events_path=event_log,
+        schemas_root=schemas_root,
+        no_bundle=True,
+        update_index=False,
+        merkle=True,
+    )
+    log = run_dir / "decision_log.jsonl"
+    lines = log.read_bytes().splitlines(keepends=True)
+    leaves = len(lines)
+    for lo, hi in ((0, 1), (leaves - 1, leaves), (leaves // 3, leaves // 3 + 7)):
+        assert verify_row_range(run_dir, "decision_log.jsonl", lo, hi)["status"] == "PASS"
+    # same-length edit, so the row index still lines up
+    row = next(i for i, line in enumerate(lines) if b'"PASS"' in line)
+    lines[row] = lines[row].replace(b'"PASS"', b'"FAIL"')
+    log.write_bytes(b"".join(lines))
+    assert verify_row_range(run_dir, "decision_log.jsonl", row, row + 1)["status"] == "FAIL"
+    assert verify_row_range(run_dir, "decision_log.jsonl", row + 1, row + 2)["status"] == "PASS"
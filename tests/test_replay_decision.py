@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from osctl.cli import main
+from osctl.engine_run import execute_run
+from osctl.trace_index import TRACE_INDEX_FILENAME
+from osctl.utils import iter_jsonl
+
+DECISION = "dec_00042"
+
+
+@pytest.fixture(params=[{}, {"workers": 3}], ids=["batch", "sharded"])
+def run(request, tmp_path, event_log, toy_config, schemas_root, small_shards):
+    execute_run(
+        run_id="RUN_REPLAY",
+        out_dir=tmp_path / "runs",
+        config_path=toy_config,
+        events_path=event_log,
+        schemas_root=schemas_root,
+        no_bundle=True,
+        **request.param,
+    )
+    return tmp_path / "runs"
+
+
+def _replay(out_dir, capsys, decision_id=DECISION):
+    code = main(["replay", "--run-id", "RUN_REPLAY", "--decision-id", decision_id, "--out-dir", str(out_dir)])
+    return code, json.loads(capsys.readouterr().out.splitlines()[-1])
+
+
+def _trace_rows(run_dir):
+    return [i for i, evt in enumerate(iter_jsonl(run_dir / "event_log.jsonl")) if evt.get("trace_id") == "tr_00042"]
+
+
+def test_decision_replay_seeks_to_its_trace(run, capsys):
+    run_dir = run / "RUN_REPLAY"
+    assert (run_dir / TRACE_INDEX_FILENAME).exists()
+    code, summary = _replay(run, capsys)
+    assert (code, summary["status"], summary["indexed"]) == (0, "OK", True)
+    assert summary["rows"] == _trace_rows(run_dir)
+    assert json.loads((run_dir / "replay" / f"decision_{DECISION}.json").read_text())["rows"] == summary["rows"]
+
+    # runs from before the trace index fall back to a scan and find the same rows
+    (run_dir / TRACE_INDEX_FILENAME).unlink()
+    code, scanned = _replay(run, capsys)
+    assert (code, scanned["indexed"], scanned["rows"]) == (0, False, summary["rows"])
+
+
+def test_decision_replay_reports_a_changed_row(run, capsys):
+    run_dir = run / "RUN_REPLAY"
+    target = _trace_rows(run_dir)[-1]
+    log = run_dir / "decision_log.jsonl"
+    lines = log.read_text(encoding="utf-8").splitlines(keepends=True)
+    row = json.loads(lines[target])
+    row["decision"] = "X" * len(row["decision"])  # same length: row offsets stay valid
+    lines[target] = json.dumps(row) + "\n"
+    log.write_text("".join(lines), encoding="utf-8")
+    code, summary = _replay(run, capsys)
+    assert (code, summary["status"]) == (1, "REPLAY_MISMATCH")
+    assert summary["mismatches"] == [{"row": target, "event_id": row["event_id"], "fields": ["decision"]}]
+
+
+def test_unknown_decision_is_an_error(run, capsys):
+    code, summary = _replay(run, capsys, "dec_missing")
+    assert (code, summary["status"]) == (2, "ERROR")
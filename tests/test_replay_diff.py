@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+
+from osctl.replay_diff import diff_jsonl
+
+
+def _write(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    return path
+
+
+def test_identical_streams_match_ignoring_volatile_fields(tmp_path):
+    rows = [{"event_id": f"e{i}", "decision": "PASS", "run_id": "A", "timestamp": "t1"} for i in range(5)]
+    replay = [{**row, "run_id": "B", "timestamp": "t2"} for row in rows]
+    result = diff_jsonl(_write(tmp_path / "o.jsonl", rows), _write(tmp_path / "r.jsonl", replay))
+    assert (result["matched"], result["changed"], result["divergences"]) == (5, 0, [])
+
+
+def test_out_of_step_rows_pair_up_by_event_id(tmp_path):
+    rows = [{"event_id": f"e{i}", "decision": "PASS"} for i in range(6)]
+    replay = rows[3:] + rows[:3]
+    replay[0] = {**replay[0], "decision": "FAIL"}
+    result = diff_jsonl(_write(tmp_path / "o.jsonl", rows), _write(tmp_path / "r.jsonl", replay))
+    assert (result["matched"], result["changed"]) == (5, 1)
+    assert result["divergences"] == [{"kind": "changed", "event_id": "e3", "row_original": 3, "row_replay": 0, "fields": ["decision"]}]
+
+
+def test_rows_without_event_id_pair_by_ordinal(tmp_path):
+    original = [{"a": 1}, {"a": 2}, {"event_id": "e", "a": 3}, {"a": 4}]
+    replay = [{"a": 1}, {"a": 5}, {"event_id": "e", "a": 3}, {"a": 4}, {"a": 9}]
+    result = diff_jsonl(_write(tmp_path / "o.jsonl", original), _write(tmp_path / "r.jsonl", replay))
+    assert (result["matched"], result["changed"], result["missing_in_replay"], result["extra_in_replay"]) == (3, 1, 0, 1)
+    assert result["divergences"] == [
+        {"kind": "changed", "keyed_by": "row", "row_original": 1, "row_replay": 1, "fields": ["a"]},
+        {"kind": "extra_in_replay", "keyed_by": "row", "row_replay": 4},
+    ]
+
+
+def test_missing_rows_are_reported_once_evicted(tmp_path):
+    rows = [{"event_id": f"e{i}"} for i in range(10)]
+    result = diff_jsonl(_write(tmp_path / "o.jsonl", rows), _write(tmp_path / "r.jsonl", rows[:4] + rows[5:]), max_pending=2)
+    assert (result["matched"], result["missing_in_replay"], result["extra_in_replay"]) == (9, 1, 0)
+    assert result["divergences"] == [{"kind": "missing_in_replay", "event_id": "e4", "row_original": 4}]
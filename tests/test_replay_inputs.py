@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from osctl.cli import main
+
+
+@pytest.mark.parametrize("blob_store", [False, True], ids=["copied", "blob-store"])
+def test_replay_detects_a_same_size_edit_of_the_recorded_events(tmp_path, event_log, toy_config, schemas_root, capsys, blob_store):
+    out = tmp_path / "runs"
+    common = ["--out-dir", str(out), "--schemas-root", str(schemas_root)]
+    argv = ["run", "--run-id", "RUN_INPUTS", "--config", str(toy_config), "--events", str(event_log), "--no-bundle", *common]
+    assert main(argv + (["--blob-store"] if blob_store else [])) == 0
+    assert main(["replay", "--run-id", "RUN_INPUTS", "--no-bundle", *common]) == 0
+    assert json.loads(capsys.readouterr().out.splitlines()[-1])["mismatches"] == []
+
+    recorded = out / "RUN_INPUTS" / "event_log.jsonl"
+    data = recorded.read_bytes()
+    recorded.chmod(0o644)
+    recorded.write_bytes(data.replace(b"GOV_DECISION", b"GOV_DECISIOX", 1))  # in place: a linked blob changes too
+    assert main(["replay", "--run-id", "RUN_INPUTS", "--no-bundle", *common]) == 1
+    summary = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert summary["status"] == "REPLAY_MISMATCH"
+    assert "events_sha_mismatch" in summary["mismatches"]
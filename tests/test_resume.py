@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import osctl.engine_run as engine_run
+import osctl.sketch as sketch
+from conftest import normalized_rows, sketch_doc
+from osctl.checkpoint import CHECKPOINT_FILENAME
+from osctl.columnar import DICT_COLUMNS, columns_path_for
+from osctl.engine_run import RunError, execute_run
+from osctl.merkle import format_root, root_of_lines
+
+real_write_checkpoint = engine_run.write_checkpoint
+ROW_ARTIFACTS = ("decision_log.jsonl", "trigger_events.jsonl", "trace_findings.jsonl")
+
+
+class Killed(BaseException):
+    """Stands in for SIGKILL: nothing after the checkpoint write runs normally."""
+
+
+def _run(out_dir: Path, event_log: Path, toy_config: Path, schemas_root: Path, **options):
+    return execute_run(
+        run_id="RUN_RESUME",
+        out_dir=out_dir,
+        config_path=toy_config,
+        events_path=event_log,
+        schemas_root=schemas_root,
+        no_bundle=True,
+        update_index=False,
+        **options,
+    )[1]
+
+
+def _manifest(run_dir: Path):
+    return json.loads((run_dir / "run_manifest.json").read_text())
+
+
+def _roots(run_dir: Path):
+    """Merkle refs in the proof manifest, checked against the files (rows carry wall-clock timestamps)."""
+    proof = json.loads((run_dir / "proof_manifest.json").read_text())
+    refs = {}
+    for ref in proof["artifacts"]:
+        merkle = ref.get("merkle")
+        if merkle:
+            root, leaves = root_of_lines((run_dir / ref["path"]).read_bytes().splitlines(keepends=True))
+            assert (merkle["root"], merkle["leaves"]) == (format_root(root), leaves)
+            merkle = {k: v for k, v in merkle.items() if k != "root"}
+        refs[ref["path"]] = merkle
+    return refs
+
+
+def _columns(run_dir: Path, name: str) -> bytes:
+    return (columns_path_for(run_dir / "decision_log.jsonl") / name).read_bytes()
+
+
+def _kill_after(monkeypatch, checkpoints: int) -> None:
+    calls = []
+
+    def write_then_die(*args, **kwargs):
+        real_write_checkpoint(*args, **kwargs)
+        calls.append(1)
+        if len(calls) == checkpoints:
+            raise Killed()
+
+    monkeypatch.setattr(engine_run, "write_checkpoint", write_then_die)
+
+
+@pytest.mark.parametrize(
+    "options, checkpoints",
+    [
+        ({"stream": True}, 400),
+        ({"workers": 3}, 5),
+        ({"stream": True, "columnar": True, "merkle": True}, 400),
+        ({"workers": 3, "columnar": True, "merkle": True}, 5),
+    ],
+)
+def test_resume_after_kill_matches_an_uninterrupted_run(
+    tmp_path, monkeypatch, small_shards, event_log, toy_config, schemas_root, options, checkpoints
+):
+    # small SLI chunks so the checkpoint carries open lag traces, not just buffered rows
+    monkeypatch.setattr(sketch, "CHUNK_ROWS", 64)
+    expected = _run(tmp_path / "full", event_log, toy_config, schemas_root, **options)
+
+    _kill_after(monkeypatch, checkpoints)
+    with pytest.raises(Killed):
+        _run(tmp_path / "cut", event_log, toy_config, schemas_root, checkpoint_interval=1e-9, **options)
+    run_dir = tmp_path / "cut" / "RUN_RESUME"
+    checkpoint = json.loads((run_dir / CHECKPOINT_FILENAME).read_text())
+    assert 0 < checkpoint["progress"]["row"]
+    assert set(checkpoint["state"]) == {"slis", "verdict", "correlator"}
+    assert checkpoint["state"]["slis"]["open"] and checkpoint["state"]["correlator"]["open"]
+    # a torn write past the checkpoint is discarded on resume
+    with (run_dir / "decision_log.jsonl").open("a") as fh:
+        fh.write('{"torn": ')
+
+    monkeypatch.setattr(engine_run, "write_checkpoint", real_write_checkpoint)
+    resumed = _run(tmp_path / "cut", event_log, toy_config, schemas_root, resume=True, **options)
+    assert not (resumed / CHECKPOINT_FILENAME).exists()
+    for artifact in ROW_ARTIFACTS:
+        assert normalized_rows(resumed / artifact) == normalized_rows(expected / artifact)
+    assert sketch_doc(resumed) == sketch_doc(expected)
+    assert json.loads((resumed / "govdec.json").read_text())["decisions"] == json.loads((expected / "govdec.json").read_text())["decisions"]
+    assert _manifest(resumed)["artifacts"] == _manifest(expected)["artifacts"]
+    assert _roots(resumed) == _roots(expected)
+    if options.get("columnar"):
+        for col in DICT_COLUMNS:
+            for name in (f"{col}.codes.npy", f"{col}.dict.npy"):
+                assert _columns(resumed, name) == _columns(expected, name)
+
+
+def test_resume_rejects_a_checkpoint_from_another_version(tmp_path, monkeypatch, event_log, toy_config, schemas_root):
+    _kill_after(monkeypatch, 1)
+    with pytest.raises(Killed):
+        _run(tmp_path, event_log, toy_config, schemas_root, stream=True, checkpoint_interval=1e-9)
+    monkeypatch.setattr(engine_run, "write_checkpoint", real_write_checkpoint)
+    path = tmp_path / "RUN_RESUME" / CHECKPOINT_FILENAME
+    checkpoint = json.loads(path.read_text())
+    checkpoint["schema_version"] = "1.0"
+    path.write_text(json.dumps(checkpoint))
+    with pytest.raises(RunError, match="another osctl version"):
+        _run(tmp_path, event_log, toy_config, schemas_root, stream=True, resume=True)
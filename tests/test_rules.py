@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import pytest
+
+from osctl.rules import (
+    EVIDENCE_EVENT_TYPES,
+    WHOLE_PATH_AXIS,
+    RuleError,
+    compile_checks,
+    load_checks,
+    plan_for_config,
+)
+
+ALL_ON = {"allow_missing_evidence_refs": False, "boundary_checks_enabled": True, "transfer_awareness_enabled": True}
+WINDOW = {"open_at": "2026-01-03T13:10:00Z", "close_at": "2026-01-03T13:20:00Z"}
+
+
+def _pass_v2(**options):
+    return compile_checks([{"id": "R", "type": "pass_v2", "config": options}])
+
+
+def _decision(**fields):
+    return {"event_type": "GOV_DECISION", "override_owner": "role:x", "cost_estimate": {"value": 1}, "sla_ms": 200, "observed_latency_ms": 10, **fields}
+
+
+def test_defaults_only_honour_gates_and_triggers():
+    plan = _pass_v2()
+    assert set(plan.dispatch) == {"GOV_GATE_EVAL", "TRIGGER_FIRED"}
+    assert plan.check_ids == ("R",)
+    assert plan.evaluate({"event_type": "GOV_DECISION"}) == (None, None)
+    assert plan.evaluate({"event_type": "EVIDENCE_EMIT"}) == (None, None)
+
+
+@pytest.mark.parametrize(
+    "option, event_types",
+    [
+        ("allow_missing_evidence_refs", set(EVIDENCE_EVENT_TYPES)),
+        ("boundary_checks_enabled", set(EVIDENCE_EVENT_TYPES) | {"GOV_DECISION"}),
+        ("transfer_awareness_enabled", {"GOV_DECISION"}),
+    ],
+)
+def test_each_option_compiles_predicates_for_its_event_types(option, event_types):
+    value = option != "allow_missing_evidence_refs"
+    plan = _pass_v2(**{option: value})
+    assert set(plan.dispatch) == {"GOV_GATE_EVAL", "TRIGGER_FIRED"} | event_types
+
+
+@pytest.mark.parametrize(
+    "event, expected",
+    [
+        (_decision(), None),
+        (_decision(observed_latency_ms=250), "T"),
+        (_decision(override_owner=None), "A"),
+        (_decision(cost_estimate="unknown"), "C"),
+        # non-compensatory: the first failing predicate (T before A) decides
+        (_decision(observed_latency_ms=250, override_owner=None), "T"),
+        ({"event_type": "EVIDENCE_EMIT", "evidence_ref": ["x"], "ts_utc": "2026-01-03T13:15:00Z", "admissibility_window": WINDOW}, None),
+        ({"event_type": "EVIDENCE_EMIT", "ts_utc": "2026-01-03T13:15:00Z", "admissibility_window": WINDOW}, "E"),
+        ({"event_type": "EVIDENCE_EMIT", "evidence_ref": ["x"], "ts_utc": "2026-01-03T13:25:00Z", "admissibility_window": WINDOW}, "E"),
+        ({"type": "EVIDENCE_SUBMITTED", "evidence_refs": ["x"], "admissibility_window": {"open_at": "2026-01-03T13:20:00Z", "close_at": "2026-01-03T13:10:00Z"}}, "E"),
+        ({"event_type": "GOV_GATE_EVAL", "indicator_state": {"A": "OPEN", "T": "BLOCKED"}}, "T"),
+        ({"event_type": "GOV_GATE_EVAL", "witness_path_exists": False}, WHOLE_PATH_AXIS),
+        ({"event_type": "TRIGGER_FIRED", "pass_mapping": {"expected_effect": "FAIL", "indicator": "C"}}, "C"),
+        ({"event_type": "RESPONSE_SENT"}, None),
+    ],
+)
+def test_all_options_on(event, expected):
+    axis, check_id = _pass_v2(**ALL_ON).evaluate(event)
+    assert axis == expected
+    assert check_id == (None if expected is None else "R")
+
+
+def test_checks_keep_their_order_and_ids():
+    plan = compile_checks(
+        [
+            {"id": "FIRST", "type": "pass_v2", "config": {"transfer_awareness_enabled": True}},
+            {"type": "pass_v2", "config": {"boundary_checks_enabled": True}},
+        ]
+    )
+    assert plan.check_ids == ("FIRST", "pass_v2#1")
+    assert plan.evaluate(_decision(override_owner=None)) == ("A", "FIRST")
+    assert plan.evaluate(_decision(observed_latency_ms=999)) == ("T", "pass_v2#1")
+
+
+@pytest.mark.parametrize(
+    "checks, message",
+    [
+        (["pass_v2"], "must be a mapping"),
+        ([{"type": "pass_v3"}], "unknown check type"),
+        ([{"id": "X", "type": "pass_v2", "config": ["boundary_checks_enabled"]}], "config must be a mapping"),
+    ],
+)
+def test_invalid_checks_are_rejected(checks, message):
+    with pytest.raises(RuleError, match=message):
+        compile_checks(checks)
+
+
+def test_config_files_compile_once_per_content(tmp_path, toy_config):
+    assert plan_for_config(toy_config) is plan_for_config(toy_config)
+    assert plan_for_config(toy_config).check_ids == ("OSV2_TOY_RULES",)
+
+    config = tmp_path / "runtime.yaml"
+    config.write_text("workload: w\n")
+    assert load_checks(config) == []
+    assert plan_for_config(config).dispatch == {}
+    config.write_text("checks: {type: pass_v2}\n")
+    with pytest.raises(RuleError, match="checks must be a list"):
+        load_checks(config)
+    config.write_text("checks: [\n")
+    with pytest.raises(RuleError, match="cannot parse"):
+        load_checks(config)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from osctl.cli import main
+from osctl.engine_batch import BatchError, load_batch_manifest
+
+
+def _manifest(tmp_path, jobs):
+    path = tmp_path / "jobs.jsonl"
+    path.write_text("".join(json.dumps(job) + "\n" for job in jobs), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_a_failing_job_is_reported_without_stopping_the_batch(tmp_path, event_log, toy_config, schemas_root, capsys, workers):
+    jobs = [
+        {"run_id": "OK_1", "config": str(toy_config), "events": str(event_log)},
+        {"run_id": "BROKEN", "config": str(toy_config), "events": str(tmp_path / "missing.jsonl")},
+        {"run_id": "OK_2", "config": str(toy_config), "events": str(event_log)},
+    ]
+    argv = ["run-batch", "--manifest", str(_manifest(tmp_path, jobs)), "--workers", workers, "--no-bundle"]
+    argv += ["--out-dir", str(tmp_path / "runs"), "--schemas-root", str(schemas_root)]
+    assert main(argv) == 1
+    summary = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert (summary["status"], summary["succeeded"], summary["failed"]) == ("PARTIAL", 2, 1)
+    by_id = {run["run_id"]: run for run in summary["runs"]}
+    assert by_id["BROKEN"]["status"] == "ERROR"
+    assert "events not found" in by_id["BROKEN"]["error"]
+    for run_id in ("OK_1", "OK_2"):
+        assert by_id[run_id]["status"] == "SUCCESS"
+        assert (tmp_path / "runs" / run_id / "run_manifest.json").exists()
+
+
+def test_invalid_manifests_are_rejected(tmp_path):
+    with pytest.raises(BatchError, match="required"):
+        load_batch_manifest(_manifest(tmp_path, [{"config": "c.yaml"}]))
+    with pytest.raises(BatchError, match="duplicate run_id"):
+        load_batch_manifest(_manifest(tmp_path, [{"run_id": "A", "config": "c", "events": "e"}] * 2))
+    with pytest.raises(BatchError, match="unknown keys"):
+        load_batch_manifest(_manifest(tmp_path, [{"config": "c", "events": "e", "worker": 3}]))
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import shutil
+
+from conftest import TOY
+from osctl.cli import main
+from osctl.engine_run import execute_run
+from osctl.run_index import index_path, query_runs
+
+
+def _run(out_dir, run_id, toy_config, schemas_root, update_index=True):
+    return execute_run(
+        run_id=run_id,
+        out_dir=out_dir,
+        config_path=toy_config,
+        events_path=TOY / "event_log_sample.jsonl",
+        schemas_root=schemas_root,
+        no_bundle=True,
+        update_index=update_index,
+    )[1]
+
+
+def _ids(out_dir):
+    return [row["run_id"] for row in query_runs(out_dir)]
+
+
+def test_index_follows_runs_added_and_removed_behind_its_back(tmp_path, toy_config, schemas_root):
+    out = tmp_path / "runs"
+    _run(out, "R1", toy_config, schemas_root)
+    _run(out, "R2", toy_config, schemas_root)
+    assert _ids(out) == ["R2", "R1"]
+
+    _run(out, "R3", toy_config, schemas_root, update_index=False)
+    shutil.rmtree(out / "R1")
+    assert _ids(out) == ["R3", "R2"]
+    # reconciled rows are persisted, not recomputed per query
+    assert _ids(out) == ["R3", "R2"]
+
+
+def test_query_without_an_index_falls_back(tmp_path, toy_config, schemas_root):
+    out = tmp_path / "runs"
+    _run(out, "R1", toy_config, schemas_root, update_index=False)
+    assert not index_path(out).exists()
+    assert query_runs(out) is None
+
+
+def test_verify_of_a_foreign_run_dir_creates_no_index(tmp_path, toy_config, schemas_root, capsys):
+    elsewhere = tmp_path / "scratch"
+    run_dir = _run(elsewhere, "R9", toy_config, schemas_root, update_index=False)
+    out = tmp_path / "runs"
+    out.mkdir()
+    assert main(["verify", "--run-dir", str(run_dir), "--out-dir", str(out), "--schemas-root", str(schemas_root)]) == 0
+    assert not index_path(elsewhere).exists()
+    assert not index_path(out).exists()
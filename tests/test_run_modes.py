@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from conftest import normalized_rows, sketch_doc
+from osctl.cli import main
+from osctl.engine_run import execute_run
+from osctl.shards import split_byte_ranges
+
+ROW_ARTIFACTS = ("decision_log.jsonl", "trigger_events.jsonl", "trace_findings.jsonl")
+MODES = {"batch": {}, "stream": {"stream": True}, "sharded": {"workers": 3}}
+
+
+@pytest.fixture
+def runs(tmp_path: Path, event_log: Path, toy_config: Path, schemas_root: Path, small_shards):
+    out = {}
+    for mode, options in MODES.items():
+        _, run_dir = execute_run(
+            run_id="RUN_MODES",
+            out_dir=tmp_path / mode,
+            config_path=toy_config,
+            events_path=event_log,
+            schemas_root=schemas_root,
+            no_bundle=True,
+            **options,
+        )
+        out[mode] = run_dir
+    return out
+
+
+@pytest.mark.parametrize("artifact", ROW_ARTIFACTS)
+def test_modes_derive_the_same_rows(runs, artifact):
+    batch = normalized_rows(runs["batch"] / artifact)
+    assert batch
+    for mode in MODES:
+        assert normalized_rows(runs[mode] / artifact) == batch
+
+
+def test_modes_agree_on_the_verdict(runs):
+    verdicts = []
+    for run_dir in runs.values():
+        govdec = json.loads((run_dir / "govdec.json").read_text())
+        verdicts.append((govdec["verdict"], govdec["witness_path"]))
+    assert verdicts.count(verdicts[0]) == len(verdicts)
+
+
+def test_every_mode_verifies(runs, schemas_root, capsys):
+    for run_dir in runs.values():
+        argv = ["verify", "--run-id", "RUN_MODES", "--run-dir", str(run_dir), "--out-dir", str(run_dir.parent), "--schemas-root", str(schemas_root)]
+        assert main(argv) == 0
+        assert json.loads(capsys.readouterr().out.splitlines()[-1])["status"] == "PASS"
+
+
+def test_shards_cover_the_log_on_line_boundaries(event_log):
+    ranges = split_byte_ranges(event_log, 7, min_shard_bytes=4096)
+    assert len(ranges) == 7
+    assert ranges[0][0] == 0 and ranges[-1][1] == event_log.stat().st_size
+    data = event_log.read_bytes()
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start and data[start - 1 : start] == b"\n"
+
+
+def test_modes_agree_on_the_trace_summary(runs):
+    summaries = [json.loads((run_dir / "run_manifest.json").read_text())["meta"]["trace_correlation"] for run_dir in runs.values()]
+    assert sum(summaries[0]["findings"].values()) > 0
+    assert summaries.count(summaries[0]) == len(summaries)
+
+
+def test_modes_agree_on_the_sli_sketches(runs):
+    batch = sketch_doc(runs["batch"])
+    assert batch["evidence_lag_min"]["count"] > 0
+    for mode in MODES:
+        assert sketch_doc(runs[mode]) == batch
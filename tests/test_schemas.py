@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from osctl.utils import CompiledSchema, clear_schema_registry, fastjsonschema, get_validator, validate_json
+
+SCHEMA = {
+    "type": "object",
+    "required": ["run_id", "decision"],
+    "properties": {
+        "run_id": {"type": "string"},
+        "decision": {"enum": ["PASS", "FAIL"]},
+        "witness_path": {"type": "object", "properties": {"exists": {"type": "boolean"}}},
+    },
+}
+INVALID = [
+    {"decision": "PASS"},
+    {"run_id": 7, "decision": "MAYBE"},
+    {"run_id": "r", "decision": "PASS", "witness_path": {"exists": "yes"}},
+    [],
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    clear_schema_registry()
+    yield
+    clear_schema_registry()
+
+
+def _write(path, schema, mtime_ns=None):
+    path.write_text(json.dumps(schema), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def test_validators_are_compiled_once_and_reloaded_on_change(tmp_path):
+    path = _write(tmp_path / "row.schema.json", SCHEMA, mtime_ns=1_000_000_000)
+    first = get_validator(path)
+    assert get_validator(path) is first
+    assert validate_json({"run_id": "r", "decision": "PASS"}, path) == []
+
+    loose = dict(SCHEMA, required=["run_id"])
+    _write(path, loose, mtime_ns=2_000_000_000)
+    second = get_validator(path)
+    assert second is not first
+    assert second.schema == loose
+    assert validate_json({"run_id": "r"}, path) == []
+
+
+def test_missing_schema_validates_nothing(tmp_path):
+    assert get_validator(tmp_path / "absent.json") is None
+    assert validate_json({"anything": 1}, tmp_path / "absent.json") == []
+
+
+@pytest.mark.skipif(fastjsonschema is None, reason="fastjsonschema not installed")
+@pytest.mark.parametrize("instance", INVALID)
+def test_error_text_is_the_same_with_either_backend(instance):
+    fast = CompiledSchema(SCHEMA)
+    slow = CompiledSchema(SCHEMA, "jsonschema")
+    assert fast._fast is not None and slow._fast is None
+    assert not fast.is_valid(instance) and not slow.is_valid(instance)
+    errors = list(fast.iter_errors(instance))
+    assert errors and errors == list(slow.iter_errors(instance))
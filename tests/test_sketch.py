@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import bisect
+import json
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from osctl.expiry import trace_key_of
+from osctl.sketch import DDSketch, SketchAccumulator, merge_sketch_docs
+from osctl.utils import iter_jsonl
+
+
+def _exact_lags(path):
+    """Reference join over the whole log: minutes from each trigger to the first evidence
+    at/after it in its trace (0 if the trace's evidence all came earlier)."""
+    triggers, evidence = defaultdict(list), defaultdict(list)
+    for event in iter_jsonl(path):
+        kind = event.get("event_type")
+        if kind in ("TRIGGER_FIRED", "EVIDENCE_EMIT"):
+            ts = datetime.fromisoformat(event["ts_utc"].replace("Z", "+00:00")).timestamp()
+            (triggers if kind == "TRIGGER_FIRED" else evidence)[trace_key_of(event)].append(ts)
+    lags = []
+    for trace, ts_list in triggers.items():
+        found = sorted(evidence.get(trace, []))
+        if not found:
+            continue
+        for ts in ts_list:
+            i = bisect.bisect_left(found, ts)
+            lags.append((found[i] - ts) / 60.0 if i < len(found) else 0.0)
+    return np.array(lags)
+
+
+def _assert_close(sketch, values, rel=0.011):
+    assert sketch.count == len(values)
+    for q in (0.5, 0.95, 0.99):
+        exact = float(np.quantile(values, q, method="lower"))
+        assert sketch.quantile(q) == pytest.approx(exact, rel=rel, abs=1e-9)
+
+
+def test_quantiles_within_relative_accuracy():
+    rng = np.random.default_rng(3)
+    values = np.concatenate([rng.lognormal(4, 1, 20000), np.zeros(50)])
+    sketch = DDSketch()
+    sketch.add_many(values)
+    _assert_close(sketch, values)
+    assert DDSketch.from_dict(json.loads(json.dumps(sketch.to_dict()))).to_dict() == sketch.to_dict()
+
+
+def test_merged_sketches_equal_one_sketch_over_everything():
+    rng = np.random.default_rng(5)
+    parts = [rng.exponential(100, 5000) for _ in range(4)]
+    whole = DDSketch()
+    whole.add_many(np.concatenate(parts))
+    docs = []
+    for i, part in enumerate(parts):
+        sketch = DDSketch()
+        sketch.add_many(part)
+        docs.append({"run_id": f"R{i}", "decision_latency_ms": sketch.to_dict()})
+    merged = merge_sketch_docs(docs)
+    assert merged["runs"] == 4
+    assert merged["decision_latency_ms"] == whole.summary()
+    assert merged["evidence_lag_min"] == {"count": 0}
+
+
+def test_streamed_evidence_lag_matches_the_exact_join(event_log, monkeypatch):
+    monkeypatch.setattr("osctl.sketch.CHUNK_ROWS", 97)
+    acc = SketchAccumulator()
+    for event in iter_jsonl(event_log):
+        acc.add(event)
+    lags = acc.sketches()["evidence_lag_min"]
+    exact = _exact_lags(event_log)
+    assert len(exact) > 100
+    _assert_close(lags, exact)
+
+
+def test_open_trace_state_is_bounded_by_the_ttl(event_log, monkeypatch):
+    # traces start every 20s and last ~15 min; a 30 min TTL keeps only the recent ones
+    monkeypatch.setattr("osctl.sketch.CHUNK_ROWS", 50)
+    acc = SketchAccumulator(allowed_lateness=60, trace_ttl=1800)
+    peak = 0
+    for event in iter_jsonl(event_log):
+        acc.add(event)
+        peak = max(peak, len(acc._traces))
+    assert 0 < peak < 200
+    assert acc.sketches()["evidence_lag_min"].count == len(_exact_lags(event_log))
+    assert acc._traces.open == {} and acc._traces.deadlines == []
+
+
+def test_max_open_traces_caps_the_store(event_log):
+    acc = SketchAccumulator(max_open_traces=5)
+    for event in iter_jsonl(event_log):
+        acc.add(event)
+        acc.flush()
+        assert len(acc._traces) <= 5
+    assert acc.sketches()["evidence_lag_min"].count > 0
+
+
+def test_deferred_shards_merge_into_the_same_lags(event_log):
+    events = list(iter_jsonl(event_log))
+    whole = SketchAccumulator()
+    for event in events:
+        whole.add(event)
+    merged = SketchAccumulator()
+    step = len(events) // 5 + 1
+    for start in range(0, len(events), step):
+        shard = SketchAccumulator(defer_lags=True)
+        for event in events[start : start + step]:
+            shard.add(event)
+        merged.merge(shard)
+    assert merged.events == whole.events
+    a, b = merged.sketches(), whole.sketches()
+    assert {k: v.to_dict() for k, v in a.items()} == {k: v.to_dict() for k, v in b.items()}
+
+
+def test_checkpoint_round_trip_continues_identically(event_log, monkeypatch):
+    monkeypatch.setattr("osctl.sketch.CHUNK_ROWS", 64)
+    events = list(iter_jsonl(event_log))
+    whole = SketchAccumulator()
+    for event in events:
+        whole.add(event)
+    first = SketchAccumulator()
+    for event in events[: len(events) // 2]:
+        first.add(event)
+    state = json.loads(json.dumps(first.to_dict()))
+    assert state["open"]
+    resumed = SketchAccumulator.from_dict(state)
+    for event in events[len(events) // 2 :]:
+        resumed.add(event)
+    a, b = resumed.sketches(), whole.sketches()
+    assert {k: v.to_dict() for k, v in a.items()} == {k: v.to_dict() for k, v in b.items()}
+
+
+def test_lag_join_uses_the_correlator_trace_key():
+    # events without a trace_id join on request_id, then decision_id, as in the correlator
+    events = [
+        {"event_type": "TRIGGER_FIRED", "request_id": "req_1", "ts_utc": "2026-01-03T13:00:00Z"},
+        {"event_type": "EVIDENCE_EMIT", "request_id": "req_1", "ts_utc": "2026-01-03T13:06:00Z"},
+        {"event_type": "TRIGGER_FIRED", "decision_id": "dec_2", "ts_utc": "2026-01-03T13:01:00Z"},
+        {"event_type": "EVIDENCE_EMIT", "decision_id": "dec_2", "ts_utc": "2026-01-03T13:04:00Z"},
+    ]
+    acc = SketchAccumulator()
+    for event in events:
+        acc.add(event)
+    lags = acc.sketches()["evidence_lag_min"]
+    assert lags.count == 2
+    assert lags.quantile(0) == pytest.approx(3.0, rel=0.011)
+    assert lags.quantile(1) == pytest.approx(6.0, rel=0.011)
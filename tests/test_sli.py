@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from osctl.cli import main
+from osctl.engine_run import execute_run
+from osctl.sli import event_slis, slo_report, verify_success_rate
+from osctl.utils import iter_jsonl
+
+
+def test_event_slis_come_from_the_sketches(event_log):
+    slis = event_slis(event_log)
+    latencies = np.array([e["observed_latency_ms"] for e in iter_jsonl(event_log) if "observed_latency_ms" in e])
+    assert slis["counts"]["latency_samples"] == len(latencies)
+    assert slis["decision_latency_p95_ms"] == pytest.approx(np.quantile(latencies, 0.95, method="lower"), rel=0.011)
+    assert slis["counts"]["evidence_linked_triggers"] > 0
+    assert slis["evidence_lag_p95_min"] is not None
+
+
+def test_event_slis_of_a_log_without_samples(tmp_path):
+    log = tmp_path / "events.jsonl"
+    log.write_text('{"event_type": "REQUEST_RECEIVED"}\n\n{"broken"\n')
+    slis = event_slis(log)
+    assert (slis["decision_latency_p95_ms"], slis["evidence_lag_p95_min"]) == (None, None)
+    assert slis["counts"] == {"events": 2, "latency_samples": 0, "evidence_linked_triggers": 0}
+
+
+def test_sli_command_matches_the_run_sketch(tmp_path, event_log, toy_config, schemas_root, capsys):
+    _, run_dir = execute_run(
+        run_id="RUN_SLI",
+        out_dir=tmp_path / "runs",
+        config_path=toy_config,
+        events_path=event_log,
+        schemas_root=schemas_root,
+        no_bundle=True,
+        update_index=False,
+    )
+    metrics = tmp_path / "metrics"
+    assert main(["sli", "--run-id", "RUN_SLI", "--out-dir", str(tmp_path / "runs"), "--metrics-root", str(metrics)]) == 0
+    slis = json.loads((metrics / "runtime_sli_RUN_SLI.json").read_text())
+    sketch = json.loads((run_dir / "sli_sketch.json").read_text())
+    assert slis["counts"]["latency_samples"] == sketch["decision_latency_ms"]["count"]
+    assert slis["counts"]["evidence_linked_triggers"] == sketch["evidence_lag_min"]["count"]
+    assert set(slis["slo"]) == {"decision_latency_p95_ms", "evidence_lag_p95_min", "verify_success_rate", "ce_open_count"}
+
+
+def test_verify_success_rate_window_and_slo_report():
+    history = [(f"2026-01-0{i}", f"R{i}", i != 2) for i in range(1, 6)]
+    assert verify_success_rate(history, "R3", window=2) == 0.5
+    assert verify_success_rate(history, "R5", window=3) == 1.0
+    report = slo_report({"decision_latency_p95_ms": 501.0, "verify_success_rate": 0.995})
+    assert report["decision_latency_p95_ms"]["ok"] is False
+    assert report["verify_success_rate"]["ok"] is True
+    assert report["ce_open_count"]["ok"] is None
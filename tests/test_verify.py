@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+import shutil
+
+import pytest
+
+from osctl.cli import main
+from osctl.engine_run import execute_run
+from osctl.engine_verify import hash_artifacts, validate_jsonl_lines
+from osctl.utils import sha256_file
+
+
+@pytest.fixture
+def run_dir(tmp_path, toy_config, schemas_root, event_log):
+    return execute_run(
+        run_id="RUN_VERIFY",
+        out_dir=tmp_path / "runs",
+        config_path=toy_config,
+        events_path=event_log,
+        schemas_root=schemas_root,
+        no_bundle=True,
+    )[1]
+
+
+def _verify(run_dir, schemas_root, *extra):
+    code = main(["verify", "--run-dir", str(run_dir), "--schemas-root", str(schemas_root), *extra])
+    return code, json.loads((run_dir / "verify_report.json").read_text())
+
+
+def test_threaded_hashing_matches_serial_and_keeps_input_order(run_dir):
+    files = sorted(p for p in run_dir.iterdir() if p.is_file())
+    expected = [(p, sha256_file(p)) for p in files]
+    assert hash_artifacts(files, sha256_file, workers=1) == expected
+    assert hash_artifacts(files, sha256_file, workers=4) == expected
+
+    halted = hash_artifacts(files, sha256_file, workers=4, stop=lambda item, _: item == files[1])
+    assert halted == expected[:2]
+
+
+def test_parallel_validation_reports_the_same_errors(run_dir, schemas_root):
+    lines = (run_dir / "decision_log.jsonl").read_text().splitlines(keepends=True)
+    lines[3] = '{"not": "a decision row"}\n'
+    lines[-2] = '{"still": "not one"}\n'
+    schema = schemas_root / "decision_log.schema.json"
+    serial = validate_jsonl_lines(lines, schema, workers=1, chunk_rows=16)
+    assert serial
+    assert validate_jsonl_lines(lines, schema, workers=4, chunk_rows=16) == serial
+
+
+def test_best_effort_failures_do_not_change_the_verdict_under_fail_fast(run_dir, schemas_root, tmp_path):
+    strict = tmp_path / "schemas"
+    shutil.copytree(schemas_root, strict)
+    manifest_schema = strict / "run_manifest.schema.json"
+    doc = json.loads(manifest_schema.read_text())
+    doc.setdefault("required", []).append("no_such_field")
+    manifest_schema.write_text(json.dumps(doc))
+
+    code, report = _verify(run_dir, strict)
+    fast_code, fast_report = _verify(run_dir, strict, "--fail-fast")
+    assert (code, report["overall_status"]) == (fast_code, fast_report["overall_status"]) == (0, "PASS")
+    assert {c["name"]: c["status"] for c in fast_report["checks"]}["run_manifest_schema"] == "FAIL"
+
+
+def test_fail_fast_stops_at_the_first_failure_with_the_same_verdict(run_dir, schemas_root):
+    triggers = run_dir / "trigger_events.jsonl"
+    data = bytearray(triggers.read_bytes())
+    data[data.index(b"evt_") + 4] ^= 0x01  # same size, different digest
+    triggers.write_bytes(bytes(data))
+
+    code, report = _verify(run_dir, schemas_root)
+    fast_code, fast_report = _verify(run_dir, schemas_root, "--fail-fast")
+    assert (code, report["overall_status"]) == (fast_code, fast_report["overall_status"]) == (1, "FAIL")
+    assert fast_report["fail_fast"] is True
+    assert len(fast_report["checks"]) < len(report["checks"])
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+
+from osctl.cli import main
+from osctl.engine_run import execute_run
+from osctl.utils import sha256_file
+from osctl.verify_cache import CACHE_FILENAME, RACY_WINDOW_NS, VerifyCache
+
+
+def _age(path, seconds: float) -> int:
+    mtime_ns = time.time_ns() - int(seconds * 1e9)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return mtime_ns
+
+
+def test_settled_files_are_served_from_the_cache(tmp_path):
+    artifact = tmp_path / "a.jsonl"
+    artifact.write_text('{"row": 1}\n')
+    _age(artifact, 10)
+    cache = VerifyCache.load(tmp_path)
+    digest = cache.sha256("a.jsonl")
+    cache.save()
+
+    cache = VerifyCache.load(tmp_path)
+    assert cache.sha256("a.jsonl") == digest
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_edit_in_the_racy_window_is_not_masked_by_an_identical_stat(tmp_path):
+    artifact = tmp_path / "a.jsonl"
+    artifact.write_text('{"row": 1}\n')
+    cache = VerifyCache.load(tmp_path)
+    cache.sha256("a.jsonl")
+    cache.save()  # written in the same instant the file was last modified
+    mtime_ns = artifact.stat().st_mtime_ns
+    assert mtime_ns >= VerifyCache.load(tmp_path).written_at_ns - RACY_WINDOW_NS
+
+    # same size, same mtime tick, same inode: only the bytes differ
+    with artifact.open("r+") as fh:
+        fh.write('{"row": 2}\n')
+    os.utime(artifact, ns=(mtime_ns, mtime_ns))
+
+    cache = VerifyCache.load(tmp_path)
+    assert cache.sha256("a.jsonl") == sha256_file(artifact)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_stat_changes_invalidate_entries(tmp_path):
+    artifact = tmp_path / "a.jsonl"
+    artifact.write_text('{"row": 1}\n')
+    _age(artifact, 20)
+    cache = VerifyCache.load(tmp_path)
+    cache.sha256("a.jsonl")
+    cache.save()
+
+    artifact.write_text('{"row": 22}\n')
+    _age(artifact, 10)
+    cache = VerifyCache.load(tmp_path)
+    assert cache.sha256("a.jsonl") == sha256_file(artifact)
+    assert cache.misses == 1
+    assert VerifyCache.load(tmp_path, paranoid=True).entries == {}
+
+
+def test_verify_catches_a_racy_edit_of_a_run_artifact(tmp_path, event_log, toy_config, schemas_root, capsys):
+    _, run_dir = execute_run(
+        run_id="RUN_CACHE",
+        out_dir=tmp_path,
+        config_path=toy_config,
+        events_path=event_log,
+        schemas_root=schemas_root,
+        no_bundle=True,
+    )
+    argv = ["verify", "--run-id", "RUN_CACHE", "--run-dir", str(run_dir), "--out-dir", str(tmp_path), "--schemas-root", str(schemas_root)]
+    assert main(argv) == 0
+    assert (run_dir / CACHE_FILENAME).exists()
+
+    log = run_dir / "trigger_events.jsonl"
+    st = log.stat()
+    data = log.read_bytes()
+    log.write_bytes(data.replace(b'"ACT"', b'"XXX"', 1))
+    os.utime(log, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert log.stat().st_size == st.st_size
+    capsys.readouterr()
+    assert main(argv) == 1
+    assert json.loads(capsys.readouterr().out.splitlines()[-1])["status"] == "FAIL"